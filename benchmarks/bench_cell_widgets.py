@@ -0,0 +1,52 @@
+"""
+Memory and setText cost of the cell widgets.
+
+Creates `count` cells of each kind in a scene, each kind in its own process,
+and reports the resident memory per cell and the time of a setText.
+
+usage: python benchmarks/bench_cell_widgets.py [count]
+"""
+import sys
+import resource
+import timeit
+import multiprocessing
+
+from qtpy.QtWidgets import QApplication, QGraphicsScene, QGraphicsRectItem
+
+
+def measure(kind:str, count:int, results):
+    from qdagview.widgets import CellWidget, StaticTextCellWidget
+    app = QApplication.instance() or QApplication(sys.argv)
+    widget_type = {"CellWidget": CellWidget, "StaticTextCellWidget": StaticTextCellWidget}[kind]
+
+    scene = QGraphicsScene()
+    parents = [QGraphicsRectItem() for _ in range(count // 3)]
+    for parent in parents:
+        scene.addItem(parent)
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cells = []
+    for i in range(count):
+        cell = widget_type(parents[i % len(parents)])
+        cell.setText(f"attribute {i}")
+        cell.boundingRect()
+        cells.append(cell)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    texts = iter(range(10**9))
+    seconds = min(timeit.repeat(lambda: cells[0].setText(f"value {next(texts)}"), number=1000, repeat=3)) / 1000
+    results[kind] = ( (after - before) * 1024 / count, seconds )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    manager = multiprocessing.Manager()
+    results = manager.dict()
+    for kind in ["CellWidget", "StaticTextCellWidget"]:
+        process = multiprocessing.Process(target=measure, args=(kind, count, results))
+        process.start()
+        process.join()
+
+    print(f"{count} cells")
+    for kind, (bytes_per_cell, seconds) in results.items():
+        print(f"{kind:<22} memory: {bytes_per_cell/1024:6.2f}KB/cell  setText: {seconds*1e6:7.2f}us")
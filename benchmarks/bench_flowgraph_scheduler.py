@@ -0,0 +1,55 @@
+"""
+Serial versus parallel evaluation of a wide FlowGraph.
+
+Builds `width` independent branches of NumPy matrix products, summed by a
+single operator, and times FlowGraph.evaluate against FlowGraphScheduler.
+NumPy releases the GIL, so the speedup is bound by the number of cores.
+
+usage: python benchmarks/bench_flowgraph_scheduler.py [width] [workers]
+"""
+import sys
+import os
+import time
+
+import numpy as np
+
+from qdagview.examples.flowgraph import FlowGraph, ExpressionOperator
+from qdagview.examples.flowgraph_scheduler import FlowGraphScheduler
+
+
+class NumpyOperator(ExpressionOperator):
+    def evaluate(self, **inputs):
+        return eval(self.expression(), {"np": np}, inputs)
+
+
+def build(width:int, size:int=400):
+    graph = FlowGraph()
+    branches = []
+    for i in range(width):
+        op = NumpyOperator(f"np.linalg.matrix_power(np.full(({size}, {size}), {1/size}), 16).sum()", f"b{i}")
+        graph.appendOperator(op)
+        branches.append(op)
+    total = NumpyOperator("+".join(f"v{i}" for i in range(width)), "total")
+    graph.appendOperator(total)
+    for branch, inlet in zip(branches, total.inlets()):
+        graph.insertLink(0, branch.outlets()[0], inlet)
+    return graph, branches, total
+
+
+def timed(evaluate, graph, branches, total) -> float:
+    graph.evaluator().clear() # drop the cached results
+    start = time.perf_counter()
+    evaluate(total)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    graph, branches, total = build(width)
+    serial = min(timed(graph.evaluate, graph, branches, total) for _ in range(3))
+    with FlowGraphScheduler(graph.evaluator(), max_workers=workers) as scheduler:
+        parallel = min(timed(scheduler.evaluate, graph, branches, total) for _ in range(3))
+    print(f"{width} branches, {workers} workers")
+    print(f"  serial   {serial*1000:8.1f}ms")
+    print(f"  parallel {parallel*1000:8.1f}ms  x{serial/parallel:.2f}")
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the widget index managers.
+
+Times insertWidget, getWidget and getIndex (called from every paint) for
+a graph of nodes with a few inlets each.
+
+usage: python benchmarks/bench_widget_managers.py [node_count]
+"""
+import sys
+import timeit
+
+from qtpy.QtWidgets import QApplication, QGraphicsRectItem
+from qtpy.QtGui import QStandardItemModel, QStandardItem
+
+from qdagview.managers import (
+    PersistentWidgetIndexManager,
+    TreeWidgetIndexManager,
+    ItemDataWidgetIndexManager
+)
+from qdagview.core import GraphDataRole, GraphItemType
+
+
+def make_model(node_count:int, inlet_count:int=3) -> QStandardItemModel:
+    model = QStandardItemModel()
+    for n in range(node_count):
+        node = QStandardItem(f"node{n}")
+        node.setData(GraphItemType.NODE, GraphDataRole.TypeRole)
+        for i in range(inlet_count):
+            inlet = QStandardItem(f"in{i}")
+            inlet.setData(GraphItemType.INLET, GraphDataRole.TypeRole)
+            node.appendRow(inlet)
+        model.appendRow(node)
+    return model
+
+def all_indexes(model:QStandardItemModel):
+    for row in range(model.rowCount()):
+        node_index = model.index(row, 0)
+        yield node_index
+        for child_row in range(model.rowCount(node_index)):
+            yield model.index(child_row, 0, node_index)
+
+def bench(manager_type, model:QStandardItemModel, repeat:int=3):
+    indexes = list(all_indexes(model))
+    widgets = [QGraphicsRectItem() for _ in indexes]
+
+    def insert():
+        manager.clear()
+        for index, widget in zip(indexes, widgets):
+            manager.insertWidget(index, widget)
+
+    def get_widget():
+        for index in indexes:
+            manager.getWidget(index)
+
+    def get_index():
+        for widget in widgets:
+            manager.getIndex(widget)
+
+    manager = manager_type()
+    results = {}
+    for name, func in [("insertWidget", insert), ("getWidget", get_widget), ("getIndex", get_index)]:
+        results[name] = min(timeit.repeat(func, number=1, repeat=repeat)) / len(indexes)
+    return results
+
+
+if __name__ == "__main__":
+    app = QApplication.instance() or QApplication(sys.argv)
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    model = make_model(node_count)
+
+    print(f"{node_count} nodes, {node_count*4} widgets, time per call")
+    for manager_type in [PersistentWidgetIndexManager, TreeWidgetIndexManager, ItemDataWidgetIndexManager]:
+        results = bench(manager_type, model)
+        timings = "  ".join(f"{name}: {seconds*1e6:8.2f}us" for name, seconds in results.items())
+        print(f"{manager_type.__name__:<30} {timings}")
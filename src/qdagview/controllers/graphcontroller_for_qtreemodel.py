@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from contextlib import contextmanager
 from itertools import groupby
 from operator import attrgetter
 
@@ -18,6 +19,30 @@ from ..core import GraphDataRole, GraphItemType
 from ..managers import LinkingManager
 
 
+def sequence_to_ranges(rows: Iterable[int]) -> List[Tuple[int, int]]:
+    """Convert list of row numbers into (start, count) ranges for consecutive rows.
+    
+    Example: [1, 2, 3, 7, 8, 10] → [(1, 3), (7, 2), (10, 1)]
+    """
+    rows = sorted(rows)
+    ranges = []
+    for _, group_items in groupby(enumerate(rows), lambda x: x[1] - x[0]):
+        group = list(group_items)
+        start = group[0][1]
+        count = len(group)
+        ranges.append((start, count))
+    return ranges
+
+def index_depth(index: QModelIndex|QPersistentModelIndex) -> int:
+    """Calculate the depth of an index in the tree (root = 0)"""
+    depth = 0
+    current = index
+    while current.isValid():
+        depth += 1
+        current = current.parent()
+    return depth
+
+
 class GraphController_for_QTreeModel(QObject):
     """
     Controller for a graph backed by a QAbstractItemModel.
@@ -51,15 +76,32 @@ class GraphController_for_QTreeModel(QObject):
         super().__init__(parent)
         self._source_model: QAbstractItemModel | None = None
         self._source_model_connections: list[tuple[Signal, Slot]] = []
-        self._link_manager = LinkingManager[QPersistentModelIndex, QPersistentModelIndex, QPersistentModelIndex]()
+        self._link_manager = LinkingManager[Hashable, Hashable, Hashable]()
+
+        # item types by key, filled as rows are inserted or queried
+        self._item_type_cache: Dict[Hashable, GraphItemType | None] = {}
+        self._item_type_cache_enabled = True
+
+        # Stable IDs: the link registry is keyed by the GraphDataRole.IdRole of the items instead of
+        # QPersistentModelIndex, and items are located through an ID -> (parent ID, row) table
+        self._stable_ids = False
+        self._id_locations: Dict[Hashable, Tuple[Hashable|None, int]] = {}
+
+        # links already announced by linksAboutToBeRemoved while their rows are being removed
+        self._announced_links: Set[QPersistentModelIndex] = set()
+
+        # signals buffered during a batch edit, see beginBatch()
+        self._batch_depth = 0
+        self._pending_inserted: Dict[str, Dict[QPersistentModelIndex, None]] = {
+            'nodesInserted': {}, 'inletsInserted': {}, 'outletsInserted': {}, 'linksInserted': {}
+        }
+        self._pending_data_changed: Dict[QPersistentModelIndex, Set[int] | None] = {}
+
+    def setSourceModel(self, source_model:QAbstractItemModel|None):
+        for signal, slot in self._source_model_connections:
+            signal.disconnect(slot)
+        self._source_model_connections = []
 
-    def setSourceModel(self, source_model:QAbstractItemModel):
-        self._source_model = source_model
-    
-        if self._source_model:
-            for signal, slot in self._source_model_connections:
-                signal.disconnect(slot)
-        
         if source_model:
             assert isinstance(source_model, QAbstractItemModel), "Model must be a subclass of QAbstractItemModel"
 
@@ -75,6 +117,11 @@ class GraphController_for_QTreeModel(QObject):
 
         self._source_model = source_model
         self._link_manager.clear()
+        self._item_type_cache.clear()
+        self._id_locations.clear()
+        for pending in self._pending_inserted.values():
+            pending.clear()
+        self._pending_data_changed.clear()
 
         if self._source_model:
             self.handleRowsInserted(QModelIndex(), 0, self._source_model.rowCount() - 1)
@@ -82,15 +129,205 @@ class GraphController_for_QTreeModel(QObject):
     def sourceModel(self) -> QAbstractItemModel | None:
         return self._source_model
 
+    ## Stable IDs
+    def setStableIdsEnabled(self, enabled:bool):
+        """
+        Key the link registry and the link SourceRole payload by the GraphDataRole.IdRole
+        of the items instead of QPersistentModelIndex.
+        Qt has to update every persistent index on each row insertion and removal,
+        IDs are resolved to indexes on demand instead.
+        Item types are not cached in this mode, reading an ID costs as much as reading the type.
+
+        The model must provide a unique, hashable IdRole for every node, port and link
+        as soon as its row is inserted, never reused for another item.
+        Signals and queries still return QPersistentModelIndex, for the receivers to use right away.
+        See QItemModel_GraphView.setStableIdsEnabled for views keeping their widgets by ID too.
+        """
+        self._stable_ids = enabled
+        self._link_manager.clear()
+        self._item_type_cache.clear()
+        self._id_locations.clear()
+        if not self._source_model:
+            return
+
+        if enabled and (row_count := self._source_model.rowCount()):
+            self._indexIds(QModelIndex(), 0, row_count - 1)
+        for node in self.nodes():
+            for inlet in self.inlets(node):
+                self._registerExistingLinks(inlet)
+
+    def hasStableIds(self) -> bool:
+        return self._stable_ids
+
+    def itemId(self, index:QModelIndex|QPersistentModelIndex) -> Hashable|None:
+        if not index.isValid():
+            return None
+        return self._source_model.data(QModelIndex(index).siblingAtColumn(0), GraphDataRole.IdRole)
+
+    def indexFromId(self, item_id:Hashable) -> QModelIndex:
+        """Find the index of an item by its ID. Returns an invalid index if not found."""
+        location = self._id_locations.get(item_id, None)
+        if location is None:
+            return QModelIndex()
+        parent_id, row = location
+        parent = self.indexFromId(parent_id) if parent_id is not None else QModelIndex()
+        if parent_id is not None and not parent.isValid():
+            return QModelIndex()
+
+        index = self._source_model.index(row, 0, parent)
+        if index.isValid() and index.data(GraphDataRole.IdRole) == item_id:
+            return index
+
+        # rows were shifted by insertions or removals, relocate the siblings
+        if row_count := self._source_model.rowCount(parent):
+            self._indexIds(parent, 0, row_count - 1, recursive=False)
+        location = self._id_locations.get(item_id, None)
+        if location is None or location[0] != parent_id:
+            return QModelIndex()
+        return self._source_model.index(location[1], 0, parent)
+
+    def _indexIds(self, parent:QModelIndex, start:int, end:int, recursive:bool=True):
+        """Record the location of the rows, and their descendants when recursive."""
+        stack = [(QModelIndex(parent), self.itemId(parent), start, end)]
+        while stack:
+            parent, parent_id, start, end = stack.pop()
+            for row in range(start, end + 1):
+                index = self._source_model.index(row, 0, parent)
+                item_id = index.data(GraphDataRole.IdRole)
+                if item_id is None:
+                    continue
+                self._id_locations[item_id] = (parent_id, row)
+                if recursive and (child_count := self._source_model.rowCount(index)):
+                    stack.append( (index, item_id, 0, child_count - 1) )
+
+    def _key(self, index:QModelIndex|QPersistentModelIndex) -> Hashable:
+        """Registry key of an item: its ID with stable IDs, a QPersistentModelIndex otherwise."""
+        if self._stable_ids:
+            return self.itemId(index)
+        return QPersistentModelIndex(index)
+
+    def _indexesFromKeys(self, keys:Iterable[Hashable]) -> List[QPersistentModelIndex]:
+        if self._stable_ids:
+            return [QPersistentModelIndex(self.indexFromId(key)) for key in keys]
+        return list(keys)
+
+    def _sourcePayload(self, outlet:QModelIndex|QPersistentModelIndex) -> Any:
+        """The value stored in the SourceRole of links."""
+        if self._stable_ids:
+            return self.itemId(outlet)
+        return outlet if isinstance(outlet, QPersistentModelIndex) else QPersistentModelIndex(outlet)
+
+    ## Batch editing
+    def beginBatch(self):
+        """Start buffering the graph signals until the matching endBatch().
+
+        Inserted items and attribute changes are merged and emitted once at the end.
+        Items inserted and removed within the same batch are not emitted at all.
+        Removal of items that existed before the batch is still emitted immediately,
+        as their indexes are only valid until the rows are removed.
+        Batches can be nested.
+        """
+        self._batch_depth += 1
+
+    def endBatch(self):
+        assert self._batch_depth > 0, "endBatch() called without beginBatch()"
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flushBatch()
+
+    def isBatching(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextmanager
+    def batch(self):
+        """Context manager for beginBatch()/endBatch()."""
+        self.beginBatch()
+        try:
+            yield self
+        finally:
+            self.endBatch()
+
+    def _flushBatch(self):
+        # ports of the inserted nodes are reported along with their node
+        inserted_nodes = set(self._pending_inserted.get('nodesInserted', ()))
+        for signal_name, pending in self._pending_inserted.items():
+            items = [item for item in pending if item.isValid()]
+            if inserted_nodes and signal_name in ('inletsInserted', 'outletsInserted'):
+                items = [item for item in items if QPersistentModelIndex(item.parent()) not in inserted_nodes]
+            pending.clear()
+            if items:
+                getattr(self, signal_name).emit(items)
+
+        # group the changed attributes by their roles
+        attributes_by_roles: Dict[Tuple[int, ...], List[QPersistentModelIndex]] = defaultdict(list)
+        for attribute, roles in self._pending_data_changed.items():
+            if attribute.isValid():
+                attributes_by_roles[tuple(sorted(roles)) if roles is not None else ()].append(attribute)
+        self._pending_data_changed.clear()
+        for roles, attributes in attributes_by_roles.items():
+            self.attributesDataChanged.emit(attributes, list(roles))
+
+    def _emitInserted(self, signal_name:str, items:List[QPersistentModelIndex]):
+        if not items:
+            return
+        if self._batch_depth:
+            self._pending_inserted[signal_name].update(dict.fromkeys(items))
+        else:
+            getattr(self, signal_name).emit(items)
+
+    def _emitAboutToBeRemoved(self, signal_name:str, items:List[QPersistentModelIndex]):
+        if self._batch_depth:
+            # items inserted during the batch were never emitted, just forget them
+            pending = self._pending_inserted[signal_name.replace('AboutToBeRemoved', 'Inserted')]
+            existing = []
+            for item in items:
+                if item in pending:
+                    del pending[item]
+                    self._pending_data_changed.pop(item, None)
+                else:
+                    existing.append(item)
+            items = existing
+            if items:
+                # receivers must know about everything inserted so far before the removal
+                self._flushBatch()
+        if items:
+            getattr(self, signal_name).emit(items)
+
+    def _emitAttributesDataChanged(self, attributes:List[QPersistentModelIndex], roles:List[int]):
+        if not attributes:
+            return
+        if self._batch_depth:
+            for attribute in attributes:
+                if attribute in self._pending_data_changed:
+                    merged = self._pending_data_changed[attribute]
+                    self._pending_data_changed[attribute] = merged | set(roles) if merged is not None and roles else None
+                else:
+                    self._pending_data_changed[attribute] = set(roles) if roles else None
+        else:
+            self.attributesDataChanged.emit(attributes, roles)
+
     ## Transformations
     def handleRowsInserted(self, parent:QModelIndex, start:int, end:int):
         assert self._source_model, "Model must be set before handling rows inserted!"
+        if self._stable_ids:
+            self._indexIds(parent, start, end)
+        if self._item_type_cache_enabled and not self._stable_ids:
+            for row in range(start, end + 1):
+                self.itemType(self._source_model.index(row, 0, parent))
 
         match self.itemType(parent):
             case GraphItemType.SUBGRAPH | None:
                 node_refs = [QPersistentModelIndex(self._source_model.index(row, 0, parent)) for row in range(start, end + 1)]
                 if node_refs:
-                    self.nodesInserted.emit(node_refs)
+                    self._emitInserted('nodesInserted', node_refs)
+
+                # register the links already present on the inserted nodes
+                existing_links = []
+                for node in node_refs:
+                    for inlet in self.inlets(node):
+                        existing_links.extend(self._registerExistingLinks(inlet))
+                if existing_links:
+                    self._emitInserted('linksInserted', existing_links)
                 
             case GraphItemType.NODE:
                 inlet_refs = []
@@ -106,26 +343,46 @@ class GraphController_for_QTreeModel(QObject):
                             raise ValueError(f"Invalid item type for child of NODE: {self.itemType(inlet_index)}")
 
                 if inlet_refs:
-                    self.inletsInserted.emit(inlet_refs)
+                    self._emitInserted('inletsInserted', inlet_refs)
                 if outlet_refs:
-                    self.outletsInserted.emit(outlet_refs)
+                    self._emitInserted('outletsInserted', outlet_refs)
+
+                existing_links = []
+                for inlet in inlet_refs:
+                    existing_links.extend(self._registerExistingLinks(inlet))
+                if existing_links:
+                    self._emitInserted('linksInserted', existing_links)
 
             case GraphItemType.INLET:
                 added_links: list[QPersistentModelIndex] = []
 
                 for row in range(start, end + 1):
                     link_index = self._source_model.index(row, 0, parent)
-                    persistent_link_index = QPersistentModelIndex(link_index)
-                    link_source_index = self.linkSource(link_index)
-                    source_key = QPersistentModelIndex(link_source_index) if link_source_index else None
-                    target_key = QPersistentModelIndex(self.linkTarget(link_index)) if self.linkTarget(link_index) else None
-
-                    added_links.append((persistent_link_index, source_key, target_key))
+                    self._registerLink(link_index, self.linkSource(link_index), self.linkTarget(link_index))
+                    added_links.append(QPersistentModelIndex(link_index))
                 
                 if added_links:
-                    for link_index, source_index, target_index in added_links:
-                        self._link_manager.link(link_index, source_index, target_index)
-                    self.linksInserted.emit([link_index for link_index, _, _ in added_links])
+                    self._emitInserted('linksInserted', added_links)
+
+    def _registerLink(self, link:QModelIndex|QPersistentModelIndex, source:QModelIndex|QPersistentModelIndex|None, target:QModelIndex|QPersistentModelIndex|None):
+        """Add the link to the link registry, along with the nodes of its ports."""
+        source_key, source_node = (self._key(source), self._key(source.parent())) if source is not None and source.isValid() else (None, None)
+        target_key, target_node = (self._key(target), self._key(target.parent())) if target is not None and target.isValid() else (None, None)
+        self._link_manager.link(self._key(link), source_key, target_key, source_node, target_node)
+
+    def _registerExistingLinks(self, inlet:QPersistentModelIndex) -> List[QPersistentModelIndex]:
+        """Register the links already present under an inserted inlet."""
+        added_links = []
+        inlet = QModelIndex(inlet)
+        for row in range(self._source_model.rowCount(inlet)):
+            link_index = self._source_model.index(row, 0, inlet)
+            if self.itemType(link_index) != GraphItemType.LINK:
+                continue
+            if self._key(link_index) in self._link_manager:
+                continue
+            self._registerLink(link_index, self.linkSource(link_index), inlet)
+            added_links.append(QPersistentModelIndex(link_index))
+        return added_links
 
     def handleRowsAboutToBeRemoved(self, parent:QModelIndex, start:int, end:int):
         """Map QAbstractItemModel.rowsAboutToBeRemoved to graph signals.
@@ -142,19 +399,15 @@ class GraphController_for_QTreeModel(QObject):
                 # clean up connected links first
                 all_connected_links = []
                 for node in removed_nodes:
-                    for inlet in self.inlets(node):
-                        all_connected_links.extend(self._link_manager.getInletLinks(inlet))
-                    for outlet in self.outlets(node):
-                        all_connected_links.extend(self._link_manager.getOutletLinks(outlet))
+                    node_key = self._key(node)
+                    all_connected_links.extend(self._indexesFromKeys(self._link_manager.getNodeInLinks(node_key)))
+                    all_connected_links.extend(self._indexesFromKeys(self._link_manager.getNodeOutLinks(node_key)))
 
-                if all_connected_links:
-                    for link in all_connected_links:
-                        if link.isValid():
-                            self._source_model.removeRows(link.row(), 1, link.parent())
+                self._removeLinkRows(all_connected_links)
 
                 # emit signals for nodes about to be removed
                 if removed_nodes:
-                    self.nodesAboutToBeRemoved.emit(removed_nodes)
+                    self._emitAboutToBeRemoved('nodesAboutToBeRemoved', removed_nodes)
                 
             case GraphItemType.NODE:
                 # collect inlets and outlets to be removed
@@ -173,21 +426,17 @@ class GraphController_for_QTreeModel(QObject):
                 # clean up connected links first
                 all_connected_links = []
                 for inlet in removed_inlets:
-                    all_connected_links.extend(self._link_manager.getInletLinks(inlet))
+                    all_connected_links.extend(self._indexesFromKeys(self._link_manager.getInletLinks(self._key(inlet))))
                 for outlet in removed_outlets:
-                    all_connected_links.extend(self._link_manager.getOutletLinks(outlet))
+                    all_connected_links.extend(self._indexesFromKeys(self._link_manager.getOutletLinks(self._key(outlet))))
                 
-                if all_connected_links:
-                    self.linksAboutToBeRemoved.emit(all_connected_links)
-                    for link in all_connected_links:
-                        if link.isValid():
-                            self._source_model.removeRows(link.row(), 1, link.parent())
+                self._removeLinkRows(all_connected_links)
 
                 # emit signals for nodes about to be removed
                 if removed_inlets:
-                    self.inletsAboutToBeRemoved.emit(removed_inlets)
+                    self._emitAboutToBeRemoved('inletsAboutToBeRemoved', removed_inlets)
                 if removed_outlets:
-                    self.outletsAboutToBeRemoved.emit(removed_outlets)
+                    self._emitAboutToBeRemoved('outletsAboutToBeRemoved', removed_outlets)
 
             case GraphItemType.INLET:
                 # collect links to be removed
@@ -197,11 +446,60 @@ class GraphController_for_QTreeModel(QObject):
                     persistent_link_index = QPersistentModelIndex(link_index)
                     removed_links.append(persistent_link_index)
             
-                # emit signals for links about to be removed 
-                if removed_links:
-                    self.linksAboutToBeRemoved.emit(removed_links)
-                    for link in removed_links:
-                        self._link_manager.unlink(link)
+                # emit signals for links about to be removed,
+                # unless already announced by _removeLinkRows
+                if unannounced_links := [link for link in removed_links if link not in self._announced_links]:
+                    self._emitAboutToBeRemoved('linksAboutToBeRemoved', unannounced_links)
+                for link in removed_links:
+                    self._link_manager.unlink(self._key(link))
+
+        self._forgetRows(parent, start, end)
+
+    def _removeLinkRows(self, links:List[QPersistentModelIndex]):
+        """Remove the links connected to removed nodes or ports.
+
+        Links are announced with a single linksAboutToBeRemoved,
+        then removed in contiguous row ranges per inlet.
+        """
+        links = [link for link in dict.fromkeys(links) if link.isValid()]
+        if not links:
+            return
+        self._emitAboutToBeRemoved('linksAboutToBeRemoved', links)
+
+        rows_by_inlet: Dict[QPersistentModelIndex, List[int]] = defaultdict(list)
+        for link in links:
+            rows_by_inlet[QPersistentModelIndex(link.parent())].append(link.row())
+
+        announced_links = self._announced_links
+        self._announced_links = announced_links | set(links)
+        try:
+            for inlet, rows in rows_by_inlet.items():
+                inlet = QModelIndex(inlet)
+                # remove in reverse order to avoid index shifting issues
+                for start_row, count in reversed(sequence_to_ranges(rows)):
+                    if not self._source_model.removeRows(start_row, count, inlet):
+                        logger.warning(f"Failed to remove links {start_row}-{start_row + count - 1} from inlet {inlet}")
+        finally:
+            self._announced_links = announced_links
+
+    def _forgetRows(self, parent:QModelIndex, start:int, end:int):
+        """Drop the cached item types and the ID locations of the rows and all their descendants."""
+        if not self._item_type_cache and not self._id_locations:
+            return
+        stack = [(parent, start, end)]
+        while stack:
+            parent, start, end = stack.pop()
+            column_count = self._source_model.columnCount(parent)
+            for row in range(start, end + 1):
+                if self._item_type_cache:
+                    for column in range(column_count):
+                        index = self._source_model.index(row, column, parent)
+                        self._item_type_cache.pop(self._cacheKey(index), None)
+                child_parent = self._source_model.index(row, 0, parent)
+                if self._stable_ids:
+                    self._id_locations.pop(child_parent.data(GraphDataRole.IdRole), None)
+                if child_count := self._source_model.rowCount(child_parent):
+                    stack.append( (child_parent, 0, child_count - 1) )
 
     def handleRowsRemoved(self, parent:QModelIndex, start:int, end:int):
         assert self._source_model, "Model must be set before handling rows removed!"
@@ -217,9 +515,16 @@ class GraphController_for_QTreeModel(QObject):
         assert self._source_model, "Model must be set before handling data changed!"
 
         if GraphDataRole.TypeRole in roles or roles == []:
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                for column in range(top_left.column(), bottom_right.column() + 1):
+                    index = self._source_model.index(row, column, top_left.parent())
+                    self._item_type_cache.pop(self._cacheKey(index), None)
             # if an inlet or outlet type is changed, we need to update the widget
                 raise NotImplementedError("Changing item type is not supported yet.")
 
+        if self._stable_ids and GraphDataRole.IdRole in roles:
+            self._indexIds(top_left.parent(), top_left.row(), bottom_right.row())
+
         # collect attribute columns
         parent_index = top_left.parent().siblingAtColumn(0)
         parent_type = self.itemType(parent_index)
@@ -233,7 +538,7 @@ class GraphController_for_QTreeModel(QObject):
                         changed_node_attributes.append(attribute_index)
 
                     if changed_node_attributes:
-                        self.attributesDataChanged.emit([QPersistentModelIndex(attr) for attr in changed_node_attributes], roles)
+                        self._emitAttributesDataChanged([QPersistentModelIndex(attr) for attr in changed_node_attributes], roles)
 
             case GraphItemType.NODE:
                 # port attributes changed
@@ -248,7 +553,7 @@ class GraphController_for_QTreeModel(QObject):
                                     attribute_index = self._source_model.index(outlet_row, column, top_left.parent())
                                     changed_attributes.append(QPersistentModelIndex(attribute_index))
                                 if changed_attributes:
-                                    self.attributesDataChanged.emit(changed_attributes, roles)
+                                    self._emitAttributesDataChanged(changed_attributes, roles)
 
                         case GraphItemType.INLET | None:
                             for inlet_row in range(top_left.row(), bottom_right.row() + 1):
@@ -257,7 +562,7 @@ class GraphController_for_QTreeModel(QObject):
                                     attribute_index = self._source_model.index(inlet_row, column, top_left.parent())
                                     changed_attributes.append(QPersistentModelIndex(attribute_index))
                                 if changed_attributes:
-                                    self.attributesDataChanged.emit(changed_attributes, roles)
+                                    self._emitAttributesDataChanged(changed_attributes, roles)
 
                         case _:
                             raise ValueError(f"Invalid item type for child of NODE: {self.itemType(port_index)}") 
@@ -266,25 +571,21 @@ class GraphController_for_QTreeModel(QObject):
                 # link attributes changed
                 if GraphDataRole.SourceRole in roles or roles == []:
                     # If the source role is changed, we need to update the link widget
-                    removed_links:List[Tuple[QPersistentModelIndex, QPersistentModelIndex, QPersistentModelIndex]] = []
-                    added_links:List[Tuple[QPersistentModelIndex, QPersistentModelIndex, QPersistentModelIndex]] = []
+                    removed_links:List[QPersistentModelIndex] = []
+                    added_links:List[QPersistentModelIndex] = []
                     for node_row in range(top_left.row(), bottom_right.row() + 1):
                         link_index = self._source_model.index(node_row, top_left.column(), top_left.parent())
-                        link_key = QPersistentModelIndex(link_index)
+                        link_ref = QPersistentModelIndex(link_index)
 
-                        old_source_key = self._link_manager.getLinkSource(link_key)
-                        old_target_key = self._link_manager.getLinkTarget(link_key)
-                        self._link_manager.unlink(link_key)
-                        removed_links.append((link_key, old_source_key, old_target_key))
+                        self._link_manager.unlink(self._key(link_index))
+                        removed_links.append(link_ref)
                         # self.linksRemoved.emit(link_key, old_source_key, old_target_key)
 
-                        new_source_key = QPersistentModelIndex(self._source_model.data(link_index, GraphDataRole.SourceRole))
-                        new_target_key = QPersistentModelIndex(link_index.parent())
-                        self._link_manager.link(link_key, new_source_key, new_target_key)
-                        added_links.append((link_key, new_source_key, new_target_key))
+                        self._registerLink(link_index, self.linkSource(link_index), link_index.parent())
+                        added_links.append(link_ref)
                     
-                    self.linksAboutToBeRemoved.emit([link_index for link_index, _, _ in removed_links])
-                    self.linksInserted.emit([link_index for link_index, _, _ in added_links])
+                    self._emitAboutToBeRemoved('linksAboutToBeRemoved', removed_links)
+                    self._emitInserted('linksInserted', added_links)
                 else:
                     for link_row in range(top_left.row(), bottom_right.row() + 1):
                         changed_link_attributes = []
@@ -293,15 +594,42 @@ class GraphController_for_QTreeModel(QObject):
                             changed_link_attributes.append(attribute_index)
 
                         if changed_link_attributes:
-                            self.attributesDataChanged.emit([QPersistentModelIndex(attr) for attr in changed_link_attributes], roles)
+                            self._emitAttributesDataChanged([QPersistentModelIndex(attr) for attr in changed_link_attributes], roles)
 
     ## QUERY MODEL
     def itemType(self, index:QModelIndex|QPersistentModelIndex)-> GraphItemType | None:
+        if self._item_type_cache_enabled and index.isValid() and (key := self._cacheKey(index)) is not None:
+            try:
+                return self._item_type_cache[key]
+            except KeyError:
+                row_kind = self._item_type_cache[key] = self._queryItemType(index)
+                return row_kind
+        return self._queryItemType(index)
+
+    def _cacheKey(self, index:QModelIndex|QPersistentModelIndex) -> Hashable|None:
+        """The item type cache key of the index, None when its type is not cached."""
+        if self._stable_ids:
+            return None # the ID lookup would cost a data() call, like the type itself
+        return QPersistentModelIndex(index)
+
+    def _queryItemType(self, index:QModelIndex|QPersistentModelIndex)-> GraphItemType | None:
         row_kind = index.data(GraphDataRole.TypeRole)
         if not row_kind:
             row_kind = self._defaultItemType(index)
         assert self._validateItemType(index, row_kind), f"Invalid row kind {row_kind} for index {index}!"
         return row_kind
+
+    def setItemTypeCacheEnabled(self, enabled:bool):
+        """
+        Cache the item types by index. The cache is kept in sync with rows insertion and removal,
+        and TypeRole changes announced by dataChanged. Not used with stable IDs.
+        Disable it for models whose item types change without emitting dataChanged.
+        """
+        self._item_type_cache_enabled = enabled
+        self._item_type_cache.clear()
+
+    def isItemTypeCacheEnabled(self) -> bool:
+        return self._item_type_cache_enabled
     
     def _defaultItemType(self, index:QModelIndex|QPersistentModelIndex) -> GraphItemType | None:
         """
@@ -356,13 +684,13 @@ class GraphController_for_QTreeModel(QObject):
 
     def linkCount(self, port:QModelIndex|QPersistentModelIndex=None) -> int:
         if port is None:
-            return len(self._link_manager._link_source)
+            return self._link_manager.linkCount()
         
         elif self.itemType(port) == GraphItemType.INLET:
-            return len(self._link_manager.getInletLinks(port))
+            return len(self._link_manager.getInletLinks(self._key(port)))
         
         elif self.itemType(port) == GraphItemType.OUTLET:
-            return len(self._link_manager.getOutletLinks(port))
+            return len(self._link_manager.getOutletLinks(self._key(port)))
         else:
             return 0
 
@@ -482,30 +810,25 @@ class GraphController_for_QTreeModel(QObject):
             return []
         
         if port is None:
-            links = []
-            for node in self.nodes():
-                for row in range(self._source_model.rowCount(node)):
-                    inlet_index = self._source_model.index(row, 0, node)
-                    if self.itemType(inlet_index) == GraphItemType.INLET:
-                        for link_row in range(self._source_model.rowCount(inlet_index)):
-                            link_index = self._source_model.index(link_row, 0, inlet_index)
-                            if self.itemType(link_index) == GraphItemType.LINK:
-                                links.append(link_index)
-            return [QPersistentModelIndex(link) for link in links]
+            return self._indexesFromKeys(self._link_manager.getLinks())
 
         elif self.itemType(port) == GraphItemType.INLET:
-            inlet = port
-            links = []
-            for row in range(self._source_model.rowCount(inlet)):
-                child_index = self._source_model.index(row, 0, inlet)
-                if self.itemType(child_index) == GraphItemType.LINK:
-                    links.append(child_index)
-            return [QPersistentModelIndex(link) for link in links]
+            # keep the row order of the model
+            inlet_links = self._indexesFromKeys(self._link_manager.getInletLinks(self._key(port)))
+            return sorted(inlet_links, key=lambda link: link.row())
+
         elif self.itemType(port) == GraphItemType.OUTLET:
-            # For outlets, use the link manager since links are stored as children of inlets, not outlets
-            outlet = port
-            return self._link_manager.getOutletLinks(QPersistentModelIndex(outlet))
-        return links
+            # links are stored as children of inlets, not outlets
+            return self._indexesFromKeys(self._link_manager.getOutletLinks(self._key(port)))
+        return []
+
+    def inLinks(self, node:QModelIndex|QPersistentModelIndex) -> List[QPersistentModelIndex]:
+        """Links targeting any inlet of the node."""
+        return self._indexesFromKeys(self._link_manager.getNodeInLinks(self._key(node)))
+
+    def outLinks(self, node:QModelIndex|QPersistentModelIndex) -> List[QPersistentModelIndex]:
+        """Links sourced from any outlet of the node."""
+        return self._indexesFromKeys(self._link_manager.getNodeOutLinks(self._key(node)))
 
     def inletNode(self, inlet:QModelIndex|QPersistentModelIndex) -> QPersistentModelIndex|None:
         assert self.itemType(inlet) == GraphItemType.INLET, "Inlet index must be of type INLET"
@@ -541,6 +864,9 @@ class GraphController_for_QTreeModel(QObject):
             if not stored.isValid():
                 return None
             return QPersistentModelIndex(stored)
+        if self._stable_ids:
+            source_index = self.indexFromId(stored)
+            return QPersistentModelIndex(source_index) if source_index.isValid() else None
         # Unexpected type – ignore gracefully
         logger.warning(f"Unexpected SourceRole payload type: {type(stored)}")
         return None
@@ -649,9 +975,9 @@ class GraphController_for_QTreeModel(QObject):
         if self._source_model.insertRows(position, 1, inlet):
             link_index = self._source_model.index(position, 0, inlet)
             new_link_name = f"{'Link'}#{position + 1}"
-            persistent_outlet = outlet if isinstance(outlet, QPersistentModelIndex) else QPersistentModelIndex(outlet)
-            if not self._source_model.setData(link_index, persistent_outlet, role=GraphDataRole.SourceRole):
-                logger.warning(f"Failed to set source for new link: {persistent_outlet}")
+            source_payload = self._sourcePayload(outlet)
+            if not self._source_model.setData(link_index, source_payload, role=GraphDataRole.SourceRole):
+                logger.warning(f"Failed to set source for new link: {source_payload}")
 
             if not self._source_model.setData(link_index, new_link_name, role=Qt.ItemDataRole.DisplayRole):
                 logger.warning(f"Failed to set data for new link: {new_link_name}")
@@ -660,6 +986,95 @@ class GraphController_for_QTreeModel(QObject):
             
         return None
 
+    def addNodes(self, count:int, subgraph:QModelIndex|QPersistentModelIndex=QModelIndex())->List[QPersistentModelIndex]:
+        """Add `count` nodes with a single insertRows call."""
+        if count <= 0:
+            return []
+        position = self._source_model.rowCount(subgraph)
+        if self._source_model.columnCount(subgraph) == 0:
+            # Make sure the parent has at least one column for children, otherwise the treeview won't show them
+            self._source_model.insertColumns(0, 1, subgraph)
+
+        with self.batch():
+            if not self._source_model.insertRows(position, count, subgraph):
+                return []
+            return [QPersistentModelIndex(self._source_model.index(row, 0, subgraph)) for row in range(position, position + count)]
+
+    def addInlets(self, node_ref:QPersistentModelIndex, count:int)->List[QPersistentModelIndex]:
+        """Add `count` inlets to the node with a single insertRows call."""
+        assert node_ref.isValid(), "Node index must be valid"
+        assert self.itemType(node_ref) == GraphItemType.NODE, "Node index must be of type NODE"
+        with self.batch():
+            # by default node children are inlets. dont need to set GraphItemType.INLET explicitly
+            return self._insertNamedRows(QModelIndex(node_ref), count, "in")
+
+    def addOutlets(self, node_ref:QPersistentModelIndex, count:int)->List[QPersistentModelIndex]:
+        """Add `count` outlets to the node with a single insertRows call."""
+        assert node_ref.isValid(), "Node index must be valid"
+        assert self.itemType(node_ref) == GraphItemType.NODE, "Node index must be of type NODE"
+        with self.batch():
+            outlets = self._insertNamedRows(QModelIndex(node_ref), count, "out")
+            for outlet in outlets:
+                success = self._source_model.setData(QModelIndex(outlet), GraphItemType.OUTLET, GraphDataRole.TypeRole)
+                assert success, "Failed to set data for the new child item"
+            return outlets
+
+    def _insertNamedRows(self, parent:QModelIndex, count:int, prefix:str)->List[QPersistentModelIndex]:
+        if count <= 0:
+            return []
+        if self._source_model.columnCount(parent) == 0:
+            # Make sure the parent has at least one column for children, otherwise the treeview won't show them
+            self._source_model.insertColumns(0, 1, parent)
+
+        position = self._source_model.rowCount(parent)
+        if not self._source_model.insertRows(position, count, parent):
+            return []
+        new_indexes = []
+        for row in range(position, position + count):
+            new_index = self._source_model.index(row, 0, parent)
+            assert new_index.isValid(), "Created index is not valid"
+            success = self._source_model.setData(new_index, f"{prefix}#{row + 1}", Qt.ItemDataRole.DisplayRole)
+            assert success, "Failed to set data for the new child item"
+            new_indexes.append(QPersistentModelIndex(new_index))
+        return new_indexes
+
+    def addLinks(self, links:Iterable[Tuple[QPersistentModelIndex, QPersistentModelIndex]])->List[QPersistentModelIndex|None]:
+        """Add links between (outlet, inlet) pairs.
+
+        The links of each inlet are inserted with a single insertRows call.
+        Returns the new links in the order of the pairs, None where the insertion failed.
+        """
+        assert self._source_model is not None, "Source model must be set before adding child items"
+        links = list(links)
+        outlets_by_inlet: Dict[QPersistentModelIndex, List[Tuple[int, QPersistentModelIndex]]] = defaultdict(list)
+        for i, (outlet, inlet) in enumerate(links):
+            assert outlet.isValid(), "Outlet must be a valid"
+            assert self.itemType(outlet) == GraphItemType.OUTLET, "Outlet index must be of type OUTLET"
+            assert inlet.isValid(), "Inlet must be a valid"
+            assert self.itemType(inlet) == GraphItemType.INLET, "Inlet index must be of type INLET"
+            outlets_by_inlet[QPersistentModelIndex(inlet)].append( (i, QPersistentModelIndex(outlet)) )
+
+        new_links: List[QPersistentModelIndex|None] = [None] * len(links)
+        with self.batch():
+            for inlet, outlets in outlets_by_inlet.items():
+                inlet = QModelIndex(inlet)
+                if self._source_model.columnCount(inlet) == 0:
+                    self._source_model.insertColumns(0, 1, inlet)
+                position = self._source_model.rowCount(inlet)
+                if not self._source_model.insertRows(position, len(outlets), inlet):
+                    continue
+
+                # keep persistent indexes, setting the source may reorder the links
+                link_indexes = [QPersistentModelIndex(self._source_model.index(row, 0, inlet)) for row in range(position, position + len(outlets))]
+                for link_index, (i, outlet) in zip(link_indexes, outlets):
+                    if not self._source_model.setData(QModelIndex(link_index), self._sourcePayload(outlet), role=GraphDataRole.SourceRole):
+                        logger.warning(f"Failed to set source for new link: {outlet}")
+                    new_link_name = f"{'Link'}#{link_index.row() + 1}"
+                    if not self._source_model.setData(QModelIndex(link_index), new_link_name, role=Qt.ItemDataRole.DisplayRole):
+                        logger.warning(f"Failed to set data for new link: {new_link_name}")
+                    new_links[i] = link_index
+        return new_links
+
     ## UPDATE
     def setLinkSource(self, link:QPersistentModelIndex, source:QPersistentModelIndex)->bool:
         """
@@ -669,8 +1084,7 @@ class GraphController_for_QTreeModel(QObject):
         assert self._source_model, "Source model must be set before setting a link source"
         assert link.isValid(), "Link index must be valid"
         assert source.isValid(), "Source index must be valid"
-        persistent_source = source if isinstance(source, QPersistentModelIndex) else QPersistentModelIndex(source)
-        return self._source_model.setData(link, persistent_source, role=GraphDataRole.SourceRole)
+        return self._source_model.setData(link, self._sourcePayload(source), role=GraphDataRole.SourceRole)
 
     ## DELETE
     def removeNode(self, node:QPersistentModelIndex)->bool:
@@ -749,37 +1163,11 @@ class GraphController_for_QTreeModel(QObject):
         for index in indexes:
             rows_by_parents[index.parent()].append(index.row())
 
-        # consolidate adjacent rows into ranges using groupby
-        def sequence_to_ranges(rows: List[int]) -> List[Tuple[int, int]]:
-            """Convert list of row numbers into (start, count) ranges for consecutive rows.
-            
-            Example: [1, 2, 3, 7, 8, 10] → [(1, 3), (7, 2), (10, 1)]
-            """
-            if not rows:
-                return []
-                
-            rows = sorted(rows)
-            ranges = []
-            for _, group_items in groupby(enumerate(rows), lambda x: x[1] - x[0]):
-                group = list(group_items)
-                start = group[0][1]
-                count = len(group)
-                ranges.append((start, count))
-            return ranges
-        
+        # consolidate adjacent rows into ranges
         ranges_by_parents = {parent: sequence_to_ranges(rows) for parent, rows in rows_by_parents.items()}
         
         # Sort parents by depth (deepest first) to ensure children are removed before parents
-        def get_depth(index: QModelIndex) -> int:
-            """Calculate the depth of an index in the tree (root = 0)"""
-            depth = 0
-            current = index
-            while current.isValid():
-                depth += 1
-                current = current.parent()
-            return depth
-        
-        sorted_parents = sorted(ranges_by_parents.keys(), key=get_depth, reverse=True)
+        sorted_parents = sorted(ranges_by_parents.keys(), key=index_depth, reverse=True)
         
         # Remove rows in reverse order to avoid index shifting issues
         success = True
@@ -6,6 +6,8 @@ class GraphDataRole(IntEnum):
     TypeRole= Qt.ItemDataRole.UserRole+1
     SourceRole= Qt.ItemDataRole.UserRole+2
     TargetRole= Qt.ItemDataRole.UserRole+3
+    IdRole= Qt.ItemDataRole.UserRole+4 # stable, hashable ID of the item
+    CostRole= Qt.ItemDataRole.UserRole+5 # relative cost of a node in 0..1, eg.: for the heatmap of GraphDelegate
 
 
 class GraphItemType(StrEnum):
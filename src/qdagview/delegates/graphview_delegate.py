@@ -7,6 +7,7 @@ from qdagview.controllers import GraphController_for_QTreeModel
 logger = logging.getLogger(__name__)
 
 from typing import *
+from enum import IntEnum
 
 from qtpy.QtGui import *
 from qtpy.QtCore import *
@@ -15,17 +16,77 @@ from qtpy.QtWidgets import *
 from ..core import GraphDataRole, GraphItemType
 from ..utils import makeArrowShape
 
+class DetailLevel(IntEnum):
+    """How much of the graph is drawn. Higher levels draw less."""
+    Full = 0     # everything, antialiased
+    NoCells = 1  # cells are skipped
+    NoPorts = 2  # cells and ports are skipped
+    Shapes = 3   # nodes as flat rectangles, links as hairlines, without antialiasing
+
+
 class GraphDelegate(QObject):
-    ## Painting
-    def paintNode(self, painter:QPainter, option:QStyleOptionViewItem, index: QModelIndex|QPersistentModelIndex):
-        # Access palette from the option (preferred)
+    def __init__(self, parent:QObject|None=None):
+        super().__init__(parent)
+        # the view draws at a level once its level of detail drops below the threshold
+        self._detail_thresholds: Dict[DetailLevel, float] = {
+            DetailLevel.NoCells: 0.5,
+            DetailLevel.NoPorts: 0.35,
+            DetailLevel.Shapes:  0.2,
+        }
+        self._cost_heatmap = False
+        self._heatmap_color = QColor(255, 64, 0)
+
+    ## Level of detail
+    def setDetailThreshold(self, level:DetailLevel, lod:float):
+        """Draw at the level below the given level of detail (QStyleOptionGraphicsItem.levelOfDetailFromTransform).
+        0 disables the level."""
+        assert level != DetailLevel.Full, "Full detail has no threshold"
+        assert lod >= 0, f"Invalid level of detail: {lod}"
+        self._detail_thresholds[DetailLevel(level)] = lod
+
+    def detailThreshold(self, level:DetailLevel) -> float:
+        return self._detail_thresholds.get(level, 0.0)
+
+    def detailLevel(self, lod:float) -> DetailLevel:
+        """The detail level to draw at for the level of detail of the view transform."""
+        for level in (DetailLevel.Shapes, DetailLevel.NoPorts, DetailLevel.NoCells):
+            if lod < self._detail_thresholds[level]:
+                return level
+        return DetailLevel.Full
+
+    ## Cost heatmap
+    def setCostHeatmap(self, enabled:bool, color:QColor|None=None):
+        """Tint the nodes by their GraphDataRole.CostRole, from the base color (0) towards the color (1)."""
+        self._cost_heatmap = enabled
+        if color is not None:
+            self._heatmap_color = QColor(color)
+
+    def isCostHeatmap(self) -> bool:
+        return self._cost_heatmap
+
+    def heatmapColor(self, base:QColor, cost:float) -> QColor:
+        t = min(max(float(cost), 0.0), 1.0)
+        heat = self._heatmap_color
+        return QColor.fromRgbF(
+            base.redF()   + (heat.redF()   - base.redF())   * t,
+            base.greenF() + (heat.greenF() - base.greenF()) * t,
+            base.blueF()  + (heat.blueF()  - base.blueF())  * t,
+        )
+
+    def _nodeBrush(self, option:QStyleOptionViewItem, index: QModelIndex|QPersistentModelIndex) -> QBrush:
         palette = option.palette
+        if option.state & QStyle.StateFlag.State_Selected:
+            return palette.highlight()
+        if self._cost_heatmap:
+            cost = index.data(GraphDataRole.CostRole)
+            if cost is not None:
+                return QBrush(self.heatmapColor(palette.alternateBase().color(), cost))
+        return palette.alternateBase()
 
-        # Pick base color depending on selection state
-        if option.state & QStyle.State_Selected:
-            bg_color = palette.highlight()
-        else:
-            bg_color = palette.alternateBase()
+    ## Painting
+    def paintNode(self, painter:QPainter, option:QStyleOptionViewItem, index: QModelIndex|QPersistentModelIndex):
+        # Pick base color depending on selection state, and cost when the heatmap is enabled
+        bg_color = self._nodeBrush(option, index)
         
         # Paint background
         painter.save()
@@ -62,6 +123,21 @@ class GraphDelegate(QObject):
         # or the view could have a special delegate for links only.
         # and only the cell painting is done here.
 
+        line = self._linkLine(option)
+        color = self._linkColor(option)
+
+        # Paint the arrow
+        painter.save()
+        painter.setBrush(color)
+        painter.setPen(Qt.PenStyle.NoPen)
+        
+        # Use the existing makeArrowShape utility
+        arrow_path = makeArrowShape(line, width=2.0)
+        painter.drawPath(arrow_path)
+        
+        painter.restore()
+
+    def _linkLine(self, option:QStyleOptionViewItem) -> QLineF:
         # adjust for padding
         rect = QRect(option.rect).adjusted(5,5,-5,-5)
 
@@ -70,34 +146,56 @@ class GraphDelegate(QObject):
 
         # Create line based on decoration alignment
         if alignment & Qt.AlignmentFlag.AlignBottom and alignment & Qt.AlignmentFlag.AlignRight:
-            line = QLineF(QPointF(rect.topLeft()), QPointF(rect.bottomRight()))
+            return QLineF(QPointF(rect.topLeft()), QPointF(rect.bottomRight()))
         elif alignment & Qt.AlignmentFlag.AlignBottom and alignment & Qt.AlignmentFlag.AlignLeft:
-            line = QLineF(QPointF(rect.topRight()), QPointF(rect.bottomLeft()))
+            return QLineF(QPointF(rect.topRight()), QPointF(rect.bottomLeft()))
         elif alignment & Qt.AlignmentFlag.AlignTop and alignment & Qt.AlignmentFlag.AlignRight:
-            line = QLineF(QPointF(rect.bottomLeft()), QPointF(rect.topRight()))
+            return QLineF(QPointF(rect.bottomLeft()), QPointF(rect.topRight()))
         elif alignment & Qt.AlignmentFlag.AlignTop and alignment & Qt.AlignmentFlag.AlignLeft:
-            line = QLineF(QPointF(rect.bottomRight()), QPointF(rect.topLeft()))
+            return QLineF(QPointF(rect.bottomRight()), QPointF(rect.topLeft()))
         else:
-            line = QLineF(QPointF(rect.topLeft()), QPointF(rect.bottomRight()))  # Default
-        
+            return QLineF(QPointF(rect.topLeft()), QPointF(rect.bottomRight()))  # Default
+
+    def _linkColor(self, option:QStyleOptionViewItem) -> QBrush:
         # Pick color based on state
         palette = option.palette
         if option.state & QStyle.StateFlag.State_Selected:
-            color = palette.highlight()
+            return palette.highlight()
         elif option.state & QStyle.StateFlag.State_MouseOver:
-            color = palette.brightText()
+            return palette.brightText()
         else:
-            color = palette.text()
-        
-        # Paint the arrow
+            return palette.text()
+
+    ## Simplified painting, below the DetailLevel.Shapes threshold
+    def paintNodeSimplified(self, painter:QPainter, option:QStyleOptionViewItem, index: QModelIndex|QPersistentModelIndex):
+        painter.fillRect(option.rect, self._nodeBrush(option, index))
+
+    def paintLinkSimplified(self, painter:QPainter, option:QStyleOptionViewItem, index: QModelIndex|QPersistentModelIndex):
+        pen = QPen(self._linkColor(option), 0) # cosmetic hairline
         painter.save()
-        painter.setBrush(color)
+        painter.setPen(pen)
+        painter.drawLine(self._linkLine(option))
+        painter.restore()
+
+    ## Batched painting, used by the link layer of the view
+    def paintLinkBatch(self, painter:QPainter, option:QStyleOptionViewItem, shafts:List[QLineF], heads:QPainterPath):
+        """Draw the arrows of several links sharing the state of the option,
+        given as the lines of their shafts and a path of their heads."""
+        color = self._linkColor(option)
+        pen = QPen(color, 2.0)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        painter.save()
+        painter.setPen(pen)
+        painter.drawLines(shafts)
         painter.setPen(Qt.PenStyle.NoPen)
-        
-        # Use the existing makeArrowShape utility
-        arrow_path = makeArrowShape(line, width=2.0)
-        painter.drawPath(arrow_path)
-        
+        painter.setBrush(color)
+        painter.drawPath(heads)
+        painter.restore()
+
+    def paintLinkBatchSimplified(self, painter:QPainter, option:QStyleOptionViewItem, lines:List[QLineF]):
+        painter.save()
+        painter.setPen(QPen(self._linkColor(option), 0)) # cosmetic hairlines
+        painter.drawLines(lines)
         painter.restore()
 
     def paintCell(self, painter:QPainter, option:QStyleOptionViewItem, controller:GraphController_for_QTreeModel, index: QModelIndex|QPersistentModelIndex):
@@ -7,6 +7,7 @@ from typing import List
 # from qdagview.models import FlowGraphModel, ExpressionOperator
 from qdagview.examples.flowgraphmodel import FlowGraphModel
 from qdagview.examples.flowgraph import ExpressionOperator
+from qdagview.examples.flowgraph_evaluation import EvaluationError, EvaluationCancelled
 from qdagview.views.graphview_with_QItemModel import QItemModel_GraphView
 from qdagview.controllers.graphcontroller_for_qtreemodel import GraphController_for_QTreeModel
 
@@ -66,6 +67,8 @@ class MainWindow(QWidget):
 
         self.selection.currentChanged.connect(lambda current, previous: onChange([current]))
         self.tree_model.dataChanged.connect(self.graphview.update)
+        self.tree_model.evaluationStarted.connect(lambda index: self.viewer.setText("evaluating…"))
+        self.tree_model.evaluationFinished.connect(self.showEvaluationResult)
 
     @Slot()
     def appendOperator(self):
@@ -84,8 +87,17 @@ class MainWindow(QWidget):
         index = self.selection.currentIndex()
         if not index.isValid():
             return
-        result = self.tree_model.evaluate(index)
-        self.viewer.setText(result)
+        self.tree_model.evaluateAsync(index) # supersedes the previous evaluation
+
+    @Slot(QModelIndex, object, object)
+    def showEvaluationResult(self, index:QModelIndex, result, error):
+        match error:
+            case None:
+                self.viewer.setText(repr(result))
+            case EvaluationCancelled():
+                pass # a newer evaluation is on its way
+            case EvaluationError():
+                self.viewer.setText(f"Error: {error}")
 
 if __name__ == "__main__":
     import sys
@@ -1,19 +1,32 @@
 from __future__ import annotations
-from typing import List, DefaultDict, Iterable
+from typing import Any, List, DefaultDict, Iterable, Tuple
+from types import CodeType
+import weakref
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import defaultdict
+from itertools import count
 
 from ..utils import bfs
 from ..utils.unique import make_unique_id
 
 from ..utils.code_analyzer import CodeAnalyzer
+from .flowgraph_evaluation import FlowGraphEvaluator
+
+_item_uids = count(1) # unlike id(), never reused once an item is garbage collected
+
+def itemUid(item:ExpressionOperator|Inlet|Outlet|Link) -> int:
+    """Unique number of an operator, port or link, assigned on creation."""
+    return item.uid() if isinstance(item, ExpressionOperator) else item.uid
 
 
 class ExpressionOperator:
     def __init__(self, expression: str = "Operator", name:str|None = None):
+        self._uid = next(_item_uids)
         self._expression = expression
         self._name = name if name else make_unique_id()
+        self._compiled: Tuple[str, CodeType]|None = None # expression and its code, on the first evaluation
+        self._graph: weakref.ref[FlowGraph] | None = None # the graph notified of expression changes
 
         self._inlets: List[Inlet] = [] 
         self._update_inlets()
@@ -27,6 +40,8 @@ class ExpressionOperator:
         """Set the expression of the operator."""
         self._expression = expression
         self._update_inlets()
+        if self._graph and (graph := self._graph()):
+            graph.evaluator().invalidate(self)
 
     def name(self) -> str:
         """Return the name of the operator."""
@@ -36,6 +51,10 @@ class ExpressionOperator:
         """Set the name of the operator."""
         self._name = name
 
+    def uid(self) -> int:
+        """Unique number of the operator, assigned on creation."""
+        return self._uid
+
     def __call__(self, *args, **kwds):
         ...
 
@@ -48,17 +67,23 @@ class ExpressionOperator:
           # Validate syntax
         variables = CodeAnalyzer(self._expression).get_unbound_nodes()
 
+        graph = self._graph() if self._graph else None
+
         # Add new inlets if needed
         if len(variables) > len(self._inlets):
             for var in variables:
                 if var not in [inlet.name for inlet in self._inlets]:
-                    self._inlets.append(Inlet(var, self))
+                    self._inlets.append(inlet := Inlet(var, self))
+                    if graph:
+                        graph._registerItems([inlet])
 
         # Remove any inlets that are no longer needed
         if len(variables) < len(self._inlets):
             for inlet in self._inlets[len(variables):]:
                 if inlet.name not in variables:
                     self._inlets.remove(inlet)
+                    if graph:
+                        graph._unregisterItems([inlet])
 
         # update inlet names
         for var, inlet in zip(variables, self._inlets):
@@ -74,15 +99,21 @@ class ExpressionOperator:
     def __repr__(self):
         return f"Operator({self._expression})"
     
-    def evaluate(self, *args, **kwargs) -> str:
-        """Evaluate the operator."""
-        return f"Evaluating {self._expression}"
+    def evaluate(self, **inputs) -> Any:
+        """Evaluate the expression, with the inlet values given by name."""
+        expression = self._expression
+        compiled = self._compiled
+        if compiled is None or compiled[0] != expression:
+            # keyed by the expression: a compile racing with setExpression never sticks
+            compiled = self._compiled = expression, compile(expression, f"<{self._name}>", "eval")
+        return eval(compiled[1], {}, inputs)
 
 
 @dataclass()
 class Inlet:
     name: str = "Inlet"
     operator: ExpressionOperator|None = None
+    uid: int = field(default_factory=lambda: next(_item_uids), init=False, repr=False, compare=False)
 
     def __str__(self):
         return f"{self.name}"
@@ -98,6 +129,7 @@ class Inlet:
 class Outlet:
     name: str = "Outlet"
     operator: ExpressionOperator|None = None
+    uid: int = field(default_factory=lambda: next(_item_uids), init=False, repr=False, compare=False)
 
     def __str__(self):
         return f"{self.name}"
@@ -112,6 +144,7 @@ class Outlet:
 class Link:
     source: Outlet
     target: Inlet
+    uid: int = field(default_factory=lambda: next(_item_uids), init=False, repr=False, compare=False)
 
     def __str__(self):
         return  f"Link({self.source} -> {self.target})"
@@ -123,6 +156,9 @@ class FlowGraph:
         self._operators: List[ExpressionOperator] = []
         self._in_links: DefaultDict[Inlet, List[Link]] = defaultdict(list)
         self._out_links: DefaultDict[Outlet, List[Link]] = defaultdict(list)
+        self._evaluator = FlowGraphEvaluator(self)
+        # operators, ports and links of the graph by their uid, registered on insertion
+        self._items_by_uid: weakref.WeakValueDictionary[int, ExpressionOperator|Inlet|Outlet|Link] = weakref.WeakValueDictionary()
 
     def __str__(self):
         return f"{self.name}"
@@ -134,7 +170,7 @@ class FlowGraph:
     def createOperator(self, expression: str, name: str) -> ExpressionOperator:
         """Create a new operator and add it to the graph."""
         operator = ExpressionOperator(expression, name)
-        self._operators.append(operator)
+        self.appendOperator(operator)
         return operator
 
     ## READ
@@ -157,6 +193,18 @@ class FlowGraph:
         assert isinstance(outlet, Outlet), "Outlet must be an instance of Outlet"
         return [link for link in self._out_links[outlet]]
 
+    def itemByUid(self, uid:int) -> ExpressionOperator|Inlet|Outlet|Link|None:
+        """The operator, port or link of the graph with the given uid."""
+        return self._items_by_uid.get(uid, None)
+
+    def _registerItems(self, items:Iterable[ExpressionOperator|Inlet|Outlet|Link]):
+        for item in items:
+            self._items_by_uid[itemUid(item)] = item
+
+    def _unregisterItems(self, items:Iterable[ExpressionOperator|Inlet|Outlet|Link]):
+        for item in items:
+            self._items_by_uid.pop(itemUid(item), None)
+
     def links(self):
         for links in self._in_links.values():
             for link in links:
@@ -191,16 +239,13 @@ class FlowGraph:
         for n in bfs(node, children=outputNodes):
             yield n
 
-    def evaluate(self, node: ExpressionOperator) -> str:
-        """Evaluate the graph starting from the given node."""
+    def evaluator(self) -> FlowGraphEvaluator:
+        return self._evaluator
+
+    def evaluate(self, node: ExpressionOperator) -> Any:
+        """The value of the node. Only the ancestors changed since the last evaluation are recomputed."""
         assert node in self._operators
-        print(f"Evaluating graph starting from node: {node}")
-        result = ""
-        ancestors = list(self.ancestors(node))
-        print(f"Evaluating item: {node}, ancestors: {ancestors}")
-        for op in ancestors:
-            result += f"{op.expression()}\n"
-        return result
+        return self._evaluator.evaluate(node)
     
     def buildScript(self, node: ExpressionOperator) -> str:
         """Build a script representing the graph starting from the given node."""
@@ -238,6 +283,8 @@ class FlowGraph:
     def insertOperator(self, pos:int, operator: ExpressionOperator) -> bool:
         """Add an operator to the graph at the specified index."""
         self._operators.insert(pos, operator)
+        operator._graph = weakref.ref(self)
+        self._registerItems([operator, *operator.inlets(), *operator.outlets()])
         return True
     
     def appendOperator(self, operator: ExpressionOperator) -> bool:
@@ -250,10 +297,12 @@ class FlowGraph:
         assert isinstance(target, Inlet), f"Target must be an instance of Inlet, got {target}"
 
         link = Link(source, target)
+        self._registerItems([link])
         if source is not None:
             self._out_links[source].append(link)
         if target is not None:
             self._in_links[target].insert(pos, link)
+            self._evaluator.invalidate(target.operator)
         return link
     
     ## DELETE
@@ -280,15 +329,20 @@ class FlowGraph:
             for outlet in operator.outlets():
                 self._out_links.pop(outlet, None)
 
+            operator._graph = None
+            self._unregisterItems([operator, *operator.inlets(), *operator.outlets()])
+            self._evaluator.forget(operator)
             return True
         return False
     
     def removeLink(self, link: Link) -> bool:
         """Remove a link from the graph."""
+        self._unregisterItems([link])
         if link.source is not None:
             self._out_links[link.source].remove(link)
         if link.target is not None:
             self._in_links[link.target].remove(link)
+            self._evaluator.invalidate(link.target.operator)
         return True
     
     def setLinkSource(self, link: Link, source: Outlet) -> bool:
@@ -298,6 +352,8 @@ class FlowGraph:
         link.source = source
         if source is not None:
             self._out_links[source].append(link)
+        if link.target is not None:
+            self._evaluator.invalidate(link.target.operator)
         return True
 
 
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from typing import *
+
+from collections import Counter
+from dataclasses import dataclass
+import threading
+import time
+import sys
+
+if TYPE_CHECKING:
+    from .flowgraph import FlowGraph, ExpressionOperator
+
+
+class EvaluationError(Exception):
+    """An operator failed to evaluate."""
+    def __init__(self, operator:ExpressionOperator, error:BaseException):
+        super().__init__(f"{operator}: {error!r}")
+        self.operator = operator
+        self.error = error
+
+
+class EvaluationCancelled(Exception):
+    """The graph was edited, or the evaluation cancelled, before it finished."""
+
+
+@dataclass
+class CachedResult:
+    key: Tuple # the expression and the input versions the value was computed from
+    value: Any
+    version: int
+
+
+@dataclass
+class OperatorProfile:
+    """Execution statistics of an operator, see FlowGraphEvaluator.profile."""
+    calls: int = 0          # evaluations
+    cache_hits: int = 0     # rechecks that reused the cached result
+    total_time: float = 0.0 # seconds spent evaluating
+    last_time: float = 0.0
+    output_size: int = 0    # bytes of the last value
+
+def _sizeOf(value:Any) -> int:
+    """The bytes of a value, the buffer size for arrays."""
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if isinstance(nbytes, (int, float)) else sys.getsizeof(value)
+
+
+class FlowGraphEvaluator:
+    """Evaluates the operators of a FlowGraph incrementally.
+
+    The last result of every operator is cached, keyed by its expression and
+    the versions of its inputs. Editing an operator or its links marks it and its
+    descendants dirty; evaluating an operator only recomputes its dirty ancestors.
+    The dirty set is closed under descendants, so marking stops at operators
+    that are dirty already.
+
+    Every edit bumps the generation, telling a running FlowGraphScheduler
+    its inputs are stale.
+    """
+    def __init__(self, graph:FlowGraph):
+        self._graph = graph
+        self._results: Dict[ExpressionOperator, CachedResult] = {}
+        self._dirty: Set[ExpressionOperator] = set()
+        self._stats = Counter() # eg.: {"computed": 3, "reused": 1}
+        self._generation = 0
+        self._lock = threading.RLock() # edits may happen while a scheduler evaluates on another thread
+        self._profiles: Dict[ExpressionOperator, OperatorProfile] = {}
+        self._max_total_time = 0.0
+
+    ## Invalidation
+    def invalidate(self, operator:ExpressionOperator):
+        """Mark the operator and its descendants dirty."""
+        with self._lock:
+            self._generation += 1
+            stack = [operator]
+            while stack:
+                op = stack.pop()
+                if op in self._dirty:
+                    continue # its descendants are dirty already
+                self._dirty.add(op)
+                stack.extend(self._outputOperators(op))
+
+    def forget(self, operator:ExpressionOperator):
+        """Drop the cached result of a removed operator."""
+        with self._lock:
+            self._generation += 1
+            self._results.pop(operator, None)
+            self._dirty.discard(operator)
+            profile = self._profiles.pop(operator, None)
+            if profile is not None and profile.total_time >= self._max_total_time:
+                # the slowest operator is gone, the costs of the others are relative to the next one
+                self._max_total_time = max((p.total_time for p in self._profiles.values()), default=0.0)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._results.clear()
+            self._dirty.clear()
+
+    def generation(self) -> int:
+        """Incremented by every edit of the graph."""
+        return self._generation
+
+    def isDirty(self, operator:ExpressionOperator) -> bool:
+        return operator in self._dirty or operator not in self._results
+
+    ## Evaluation
+    def evaluate(self, operator:ExpressionOperator) -> Any:
+        """The value of the operator, recomputing its dirty ancestors first."""
+        with self._lock:
+            for op in self._dirtyAncestors(operator):
+                self._compute(op)
+            return self._results[operator].value
+
+    def result(self, operator:ExpressionOperator) -> CachedResult|None:
+        """The cached result of the operator, which may be dirty."""
+        return self._results.get(operator, None)
+
+    def _dirtyAncestors(self, operator:ExpressionOperator) -> List[ExpressionOperator]:
+        """The dirty operators needed for the operator, inputs first.
+        Clean operators are not looked through."""
+        order = []
+        visited = set()
+        stack = [(operator, False)]
+        while stack:
+            op, expanded = stack.pop()
+            if expanded:
+                order.append(op)
+                continue
+            if op in visited or not self.isDirty(op):
+                continue
+            visited.add(op)
+            stack.append((op, True))
+            for source in self._inputOperators(op).values():
+                if source is not None and source not in visited:
+                    stack.append((source, False))
+        return order
+
+    def _compute(self, operator:ExpressionOperator):
+        key, values = self._prepare(operator)
+        if values is None:
+            self._reuse(operator)
+            return
+        start = time.perf_counter()
+        try:
+            value = operator.evaluate(**values)
+        except Exception as err:
+            raise EvaluationError(operator, err) from err
+        self._store(operator, key, value, time.perf_counter() - start)
+
+    def _prepare(self, operator:ExpressionOperator) -> Tuple[Tuple, Dict[str, Any]|None]:
+        """The cache key of the operator and its input values.
+        The values are None when the cached result is up to date.
+        The inputs must have been computed."""
+        inputs = self._inputOperators(operator)
+        key = (operator.expression(), tuple(
+            (name, source, self._results[source].version if source is not None else None)
+            for name, source in inputs.items()
+        ))
+        cached = self._results.get(operator)
+        if cached is not None and cached.key == key:
+            return key, None
+        return key, {name: self._results[source].value for name, source in inputs.items() if source is not None}
+
+    def _reuse(self, operator:ExpressionOperator):
+        self._stats["reused"] += 1
+        self._profile(operator).cache_hits += 1
+        self._dirty.discard(operator)
+
+    def _store(self, operator:ExpressionOperator, key:Tuple, value:Any, duration:float=0.0):
+        profile = self._profile(operator)
+        profile.calls += 1
+        profile.last_time = duration
+        profile.total_time += duration
+        profile.output_size = _sizeOf(value)
+        self._max_total_time = max(self._max_total_time, profile.total_time)
+
+        cached = self._results.get(operator)
+        if cached is None:
+            version = 0
+        elif self._isSameValue(value, cached.value):
+            version = cached.version # the descendants can keep their results
+        else:
+            version = cached.version + 1
+        self._results[operator] = CachedResult(key, value, version)
+        self._stats["computed"] += 1
+        self._dirty.discard(operator)
+
+    @staticmethod
+    def _isSameValue(a:Any, b:Any) -> bool:
+        if type(a) is not type(b):
+            return False
+        try:
+            same = a == b
+        except Exception:
+            return False
+        return same is True # eg.: numpy arrays compare elementwise
+
+    ## Graph
+    def _inputOperators(self, operator:ExpressionOperator) -> Dict[str, ExpressionOperator|None]:
+        """The source operator of each inlet, None for unconnected inlets."""
+        inputs = {}
+        for inlet in operator.inlets():
+            sources = [link.source.operator for link in self._graph.inLinks(inlet) if link.source is not None]
+            inputs[inlet.name] = sources[0] if sources else None
+        return inputs
+
+    def _outputOperators(self, operator:ExpressionOperator) -> Iterable[ExpressionOperator]:
+        for outlet in operator.outlets():
+            for link in self._graph.outLinks(outlet):
+                if link.target is not None and link.target.operator is not None:
+                    yield link.target.operator
+
+    ## Profiling
+    def _profile(self, operator:ExpressionOperator) -> OperatorProfile:
+        profile = self._profiles.get(operator)
+        if profile is None:
+            profile = self._profiles[operator] = OperatorProfile()
+        return profile
+
+    def profile(self, operator:ExpressionOperator) -> OperatorProfile|None:
+        """The wall time, calls, cache hits and output size of the operator, None before its first evaluation."""
+        return self._profiles.get(operator, None)
+
+    def cost(self, operator:ExpressionOperator) -> float|None:
+        """The total evaluation time of the operator relative to the slowest one, in 0..1."""
+        profile = self._profiles.get(operator, None)
+        if profile is None:
+            return None
+        return profile.total_time / self._max_total_time if self._max_total_time > 0 else 0.0
+
+    def resetProfiles(self):
+        with self._lock:
+            self._profiles.clear()
+            self._max_total_time = 0.0
+
+    ## Statistics
+    def stats(self) -> Dict[str, int]:
+        """Number of computed and reused operator results since the last reset."""
+        return dict(self._stats)
+
+    def resetStats(self):
+        self._stats.clear()
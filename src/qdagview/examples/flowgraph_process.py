@@ -0,0 +1,221 @@
+from __future__ import annotations
+from typing import *
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import multiprocessing
+import pickle
+import time
+import weakref
+import logging
+
+import numpy as np
+
+from .flowgraph import ExpressionOperator
+from .flowgraph_scheduler import FlowGraphScheduler, _timedEvaluate
+
+if TYPE_CHECKING:
+    from types import CodeType
+    from .flowgraph_evaluation import FlowGraphEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArrayRef(NamedTuple):
+    """A NumPy array in a shared memory block, sent to and from the workers instead of its data."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def view(self, block:shared_memory.SharedMemory) -> np.ndarray:
+        """A read-only array over the block. Results are shared by the cache and must not change."""
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=block.buf)
+        array.flags.writeable = False
+        return array
+
+
+def _isLargeArray(value:Any, min_shared_bytes:int) -> bool:
+    return isinstance(value, np.ndarray) and not value.dtype.hasobject and value.nbytes >= min_shared_bytes
+
+def _shareArray(array:np.ndarray) -> Tuple[SharedArrayRef, shared_memory.SharedMemory]:
+    """Copy the array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    ref = SharedArrayRef(block.name, array.shape, array.dtype.str)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return ref, block
+
+def _isPicklingError(err:BaseException) -> bool:
+    """Whether the error comes from pickling a value, rather than from evaluating the expression."""
+    if isinstance(err, pickle.PicklingError):
+        return True
+    # eg.: "cannot pickle '_thread.lock' object", "Can't pickle local object"
+    return isinstance(err, (TypeError, AttributeError)) and "pickle" in str(err).lower()
+
+class _PicklingFailed(Exception):
+    """A value could not be sent to or from a worker. The operator is evaluated again in process."""
+    def __init__(self, error:Exception):
+        super().__init__(error)
+        self.error = error
+
+def _closeBlock(block:shared_memory.SharedMemory, unlink:bool=False):
+    try:
+        block.close()
+    except BufferError:
+        pass # an array still refers to it, the mapping goes away with the process
+    if unlink:
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+## Worker
+_compiled: Dict[str, CodeType] = {} # by expression, per worker process
+
+def _evaluateInWorker(name:str, expression:str, inputs:Dict[str, Any], min_shared_bytes:int) -> Any:
+    """Evaluate the expression like ExpressionOperator.evaluate does, in a worker process.
+    Large array results are returned in a new shared memory block, owned by the caller.
+    Returns the result and the seconds the evaluation took."""
+    code = _compiled.get(expression)
+    if code is None:
+        code = _compiled[expression] = compile(expression, f"<{name}>", "eval")
+
+    blocks = []
+    values = {}
+    for inlet, value in inputs.items():
+        if isinstance(value, SharedArrayRef):
+            block = shared_memory.SharedMemory(name=value.name)
+            blocks.append(block)
+            value = value.view(block)
+        values[inlet] = value
+
+    try:
+        start = time.perf_counter()
+        result = eval(code, {}, values)
+        duration = time.perf_counter() - start
+        if _isLargeArray(result, min_shared_bytes):
+            ref, block = _shareArray(result)
+            blocks.append(block)
+            return ref, duration
+        if isinstance(result, np.ndarray) and blocks:
+            return np.array(result), duration # may be a view of an input block
+        return result, duration
+    finally:
+        result = values = value = None # release the views before closing the blocks
+        for block in blocks:
+            _closeBlock(block)
+
+
+class ProcessFlowGraphScheduler(FlowGraphScheduler):
+    """A FlowGraphScheduler running the operators in worker processes.
+
+    Pure Python expressions, which hold the GIL, run in parallel too.
+    Expressions are compiled once per worker. NumPy arrays of at least
+    `min_shared_bytes` are passed to and from the workers in shared memory
+    blocks, and the results are zero-copy views of those blocks; a block is
+    freed when the last array using it is garbage collected.
+    Smaller or non-array values are pickled.
+
+    Operators that cannot be shipped to a worker, eg.: subclasses overriding
+    ExpressionOperator.evaluate, or inputs and results that cannot be pickled,
+    are evaluated in process instead. Values are pickled once, when they are
+    sent; a pickling failure is what triggers the fallback.
+    """
+    def __init__(self, evaluator:FlowGraphEvaluator, max_workers:int|None=None, min_shared_bytes:int=1<<16, mp_context=None):
+        super().__init__(evaluator, max_workers)
+        self._min_shared_bytes = min_shared_bytes
+        # fork is unsafe once Qt has started its threads
+        self._mp_context = mp_context if mp_context is not None else multiprocessing.get_context("spawn")
+        self._shared: Dict[int, Tuple[weakref.ref, SharedArrayRef]] = {} # arrays viewing a block, by id
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers, mp_context=self._mp_context)
+        return self._executor
+
+    def minSharedBytes(self) -> int:
+        return self._min_shared_bytes
+
+    ## Submission
+    def _submit(self, operator:ExpressionOperator, values:Dict[str, Any]) -> Future:
+        if type(operator).evaluate is not ExpressionOperator.evaluate:
+            return self._evaluateInProcess(operator, values)
+
+        inputs: Dict[str, Any] = {}
+        temporary_blocks: List[shared_memory.SharedMemory] = []
+        for inlet, value in values.items():
+            if _isLargeArray(value, self._min_shared_bytes):
+                ref = self._sharedRef(value)
+                if ref is None:
+                    ref, block = _shareArray(value)
+                    temporary_blocks.append(block)
+                inputs[inlet] = ref
+            else:
+                inputs[inlet] = value
+
+        try:
+            future = self.executor().submit(_evaluateInWorker, operator.name(), operator.expression(), inputs, self._min_shared_bytes)
+        except Exception as err:
+            for block in temporary_blocks:
+                _closeBlock(block, unlink=True)
+            if not _isPicklingError(err):
+                raise
+            return self._evaluateInProcess(operator, values)
+
+        # decode the result as soon as it arrives, so an abandoned result block is freed too
+        decoded = Future()
+        decoded.add_done_callback(lambda decoded: future.cancel() if decoded.cancelled() else None)
+        def done(future:Future):
+            for block in temporary_blocks:
+                _closeBlock(block, unlink=True)
+            try:
+                value, duration = future.result()
+                value = self._decode(value), duration
+            except BaseException as err:
+                if isinstance(err, Exception) and _isPicklingError(err):
+                    err = _PicklingFailed(err) # evaluated again by the scheduler loop, see _resubmit
+                if not decoded.done():
+                    decoded.set_exception(err)
+            else:
+                if not decoded.done():
+                    decoded.set_result(value)
+        future.add_done_callback(done)
+        return decoded
+
+    def _resubmit(self, operator:ExpressionOperator, values:Dict[str, Any], error:Exception) -> Future|None:
+        if isinstance(error, _PicklingFailed):
+            logger.debug(f"{operator} could not be evaluated in a worker: {error.error}")
+            return self._evaluateInProcess(operator, values)
+        return None
+
+    def _evaluateInProcess(self, operator:ExpressionOperator, values:Dict[str, Any]) -> Future:
+        logger.debug(f"evaluating {operator} in process")
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(_timedEvaluate(operator, values))
+        except Exception as err:
+            future.set_exception(err)
+        return future
+
+    ## Shared arrays
+    def _sharedRef(self, array:np.ndarray) -> SharedArrayRef|None:
+        """The block of an array received from a worker, passed on without copying."""
+        entry = self._shared.get(id(array))
+        if entry is not None and entry[0]() is array:
+            return entry[1]
+        return None
+
+    def _decode(self, value:Any) -> Any:
+        if not isinstance(value, SharedArrayRef):
+            return value
+        block = shared_memory.SharedMemory(name=value.name)
+        array = value.view(block)
+        key = id(array)
+        self._shared[key] = weakref.ref(array), value
+        weakref.finalize(array, self._release, key, block)
+        return array
+
+    def _release(self, key:int, block:shared_memory.SharedMemory):
+        self._shared.pop(key, None)
+        _closeBlock(block, unlink=True)
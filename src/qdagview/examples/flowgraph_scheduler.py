@@ -0,0 +1,169 @@
+from __future__ import annotations
+from typing import *
+
+from collections import defaultdict, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading
+import time
+import logging
+
+from .flowgraph_evaluation import FlowGraphEvaluator, EvaluationError, EvaluationCancelled
+
+if TYPE_CHECKING:
+    from .flowgraph import ExpressionOperator
+
+logger = logging.getLogger(__name__)
+
+
+def _timedEvaluate(operator:ExpressionOperator, values:Dict[str, Any]) -> Tuple[Any, float]:
+    """The value of the operator and the seconds it took."""
+    start = time.perf_counter()
+    value = operator.evaluate(**values)
+    return value, time.perf_counter() - start
+
+
+class FlowGraphScheduler:
+    """Evaluates the dirty ancestors of an operator on a thread pool.
+
+    Operators whose inputs are ready are submitted to the executor, and
+    their dependents are released as they complete, so independent branches
+    run concurrently. Expressions holding the GIL gain nothing, but NumPy-heavy
+    ones release it and use all cores.
+
+    Results are stored in the FlowGraphEvaluator on the calling thread, the
+    workers only call ExpressionOperator.evaluate.
+    An edit of the graph, or cancel(), stops the run: nothing new is submitted,
+    results still running are discarded and EvaluationCancelled is raised.
+    A failing operator does not stop its independent branches, see errors().
+    """
+    def __init__(self, evaluator:FlowGraphEvaluator, max_workers:int|None=None):
+        self._evaluator = evaluator
+        self._max_workers = max_workers
+        self._executor: Executor|None = None
+        self._cancelled = threading.Event()
+        self._errors: Dict[ExpressionOperator, EvaluationError] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    ## Executor
+    def maxWorkers(self) -> int|None:
+        return self._max_workers
+
+    def executor(self) -> Executor:
+        """The pool, created on the first evaluation."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="flowgraph")
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, operator:ExpressionOperator, values:Dict[str, Any]) -> Future:
+        """Start evaluating the operator with its input values. Override to change the backend.
+        The future results in the value and the seconds the evaluation took."""
+        return self.executor().submit(_timedEvaluate, operator, values)
+
+    def _resubmit(self, operator:ExpressionOperator, values:Dict[str, Any], error:Exception) -> Future|None:
+        """Called on the calling thread when the future of the operator failed.
+        Return a new future for a failure of the backend rather than of the operator, None to report the error."""
+        return None
+
+    ## Evaluation
+    def cancel(self):
+        """Stop the running evaluation. Safe to call from any thread."""
+        self._cancelled.set()
+
+    def errors(self) -> Dict[ExpressionOperator, EvaluationError]:
+        """The operators that failed during the last evaluation."""
+        return dict(self._errors)
+
+    def evaluate(self, operator:ExpressionOperator, callback:Callable[[ExpressionOperator, float, Any], None]|None=None, cancelled:threading.Event|None=None) -> Any:
+        """The value of the operator, recomputing its dirty ancestors in parallel.
+        Raises the EvaluationError of the first failed ancestor, in topological order.
+
+        callback(operator, seconds, value) is called on the calling thread, after each operator evaluated.
+        Setting the `cancelled` event stops this evaluation only, instead of using cancel()."""
+        evaluator = self._evaluator
+        if cancelled is None:
+            cancelled = self._cancelled
+            cancelled.clear()
+        self._errors = {}
+
+        with evaluator._lock:
+            generation = evaluator.generation()
+            order = evaluator._dirtyAncestors(operator)
+            waiting: Dict[ExpressionOperator, int] = {op: 0 for op in order}
+            dependents: DefaultDict[ExpressionOperator, List[ExpressionOperator]] = defaultdict(list)
+            for op in order:
+                for source in evaluator._inputOperators(op).values():
+                    if source in waiting:
+                        waiting[op] += 1
+                        dependents[source].append(op)
+        logger.debug(f"scheduling {len(order)} operators for {operator}")
+
+        ready = deque(op for op in order if waiting[op] == 0)
+        running: Dict[Future, Tuple[ExpressionOperator, Tuple, Dict[str, Any]]] = {}
+
+        def release(op:ExpressionOperator):
+            for dependent in dependents[op]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+
+        try:
+            while ready or running:
+                # submit the ready operators, the up to date ones complete right away
+                while ready:
+                    op = ready.popleft()
+                    with evaluator._lock:
+                        self._checkCancelled(generation, cancelled)
+                        key, values = evaluator._prepare(op)
+                        if values is None:
+                            evaluator._reuse(op)
+                    if values is None:
+                        release(op)
+                    else:
+                        running[self._submit(op, values)] = op, key, values
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    op, key, values = running.pop(future)
+                    try:
+                        value, duration = future.result()
+                    except Exception as err:
+                        if (retry := self._resubmit(op, values, err)) is not None:
+                            running[retry] = op, key, values
+                            continue
+                        self._errors[op] = EvaluationError(op, err) # its dependents are never released
+                        continue
+                    with evaluator._lock:
+                        self._checkCancelled(generation, cancelled)
+                        evaluator._store(op, key, value, duration)
+                    release(op)
+                    if callback is not None:
+                        callback(op, duration, value)
+        except EvaluationCancelled:
+            for future in running:
+                future.cancel()
+            raise
+
+        for op in order:
+            if op in self._errors:
+                raise self._errors[op]
+        with evaluator._lock:
+            self._checkCancelled(generation, cancelled)
+            return evaluator.result(operator).value
+
+    def _checkCancelled(self, generation:int, cancelled:threading.Event):
+        if cancelled.is_set():
+            raise EvaluationCancelled("evaluation cancelled")
+        if self._evaluator.generation() != generation:
+            raise EvaluationCancelled("the graph was edited during the evaluation")
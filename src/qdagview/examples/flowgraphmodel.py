@@ -6,22 +6,117 @@ from qtpy.QtCore import *
 from qtpy.QtGui import *
 
 from collections import defaultdict
+from enum import IntEnum
+import threading
 
 from ..core import GraphDataRole, GraphItemType
 
 
-from .flowgraph import FlowGraph, ExpressionOperator, Inlet, Outlet, Link
+from .flowgraph import FlowGraph, ExpressionOperator, Inlet, Outlet, Link, itemUid
+from .flowgraph_evaluation import EvaluationError, EvaluationCancelled
+from .flowgraph_scheduler import FlowGraphScheduler
 import logging
 logger = logging.getLogger(__name__)
 
 from ..utils import make_unique_name
 
 
+class ProfileRole(IntEnum):
+    """Execution statistics of an operator, see FlowGraphEvaluator.profile."""
+    WallTimeRole = Qt.ItemDataRole.UserRole+16   # total seconds spent evaluating
+    CallCountRole = Qt.ItemDataRole.UserRole+17  # number of evaluations
+    CacheHitsRole = Qt.ItemDataRole.UserRole+18  # number of cached results reused
+    OutputSizeRole = Qt.ItemDataRole.UserRole+19 # bytes of the last result
+
+
+def formatDuration(seconds:float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds*1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds*1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+def formatSize(size:int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def summarizeResult(value:Any, max_length:int=60) -> str:
+    """A short description of an evaluation result, for the result column."""
+    if hasattr(value, "shape") and hasattr(value, "dtype"): # eg.: numpy arrays
+        return f"{type(value).__name__}{tuple(value.shape)} {value.dtype}"
+    text = repr(value)
+    return text if len(text) <= max_length else text[:max_length-1] + "…"
+
+
+class _EvaluationTask(QRunnable):
+    """Evaluates an operator off the GUI thread, reporting through the private signals of the model."""
+    def __init__(self, model:FlowGraphModel, operator:ExpressionOperator, cancelled:threading.Event):
+        super().__init__()
+        self._model = model
+        self._operator = operator
+        self._cancelled = cancelled
+
+    def run(self):
+        model = self._model
+        if self._cancelled.is_set():
+            model._evaluationDone.emit(self._operator, None, EvaluationCancelled("superseded"), {})
+            return
+
+        scheduler = model._scheduler
+        def evaluated(operator:ExpressionOperator, duration:float, value:Any):
+            model._operatorDone.emit(operator, duration, value)
+
+        try:
+            value = scheduler.evaluate(self._operator, evaluated, self._cancelled)
+        except (EvaluationError, EvaluationCancelled) as err:
+            model._evaluationDone.emit(self._operator, None, err, scheduler.errors())
+        else:
+            model._evaluationDone.emit(self._operator, value, None, scheduler.errors())
+
+
 class FlowGraphModel(QAbstractItemModel):
+    RESULT_COLUMN = 2
+    # the profile of the operators, one column per ProfileRole
+    PROFILE_COLUMNS: Dict[int, ProfileRole] = {
+        3: ProfileRole.WallTimeRole,
+        4: ProfileRole.CallCountRole,
+        5: ProfileRole.CacheHitsRole,
+        6: ProfileRole.OutputSizeRole,
+    }
+    HEADERS = ["name", "expression", "result", "time", "calls", "cache hits", "output size"]
+
+    # asynchronous evaluation, see evaluateAsync
+    evaluationStarted = Signal(QModelIndex)
+    operatorEvaluated = Signal(QModelIndex, float, str) # index, seconds, result summary
+    evaluationFinished = Signal(QModelIndex, object, object) # index, result, error (EvaluationError or EvaluationCancelled)
+
+    # emitted by the evaluation thread, received on the GUI thread
+    _operatorDone = Signal(object, float, object)
+    _evaluationDone = Signal(object, object, object, object)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._root = FlowGraph() 
 
+        ## evaluation
+        self._scheduler = FlowGraphScheduler(self._root.evaluator())
+        self._evaluation_pool = QThreadPool(self)
+        self._evaluation_pool.setMaxThreadCount(1) # requests run one after the other, the newest cancels the others
+        self._evaluation_cancelled = threading.Event() # of the latest request
+        self._evaluation_errors: Dict[ExpressionOperator, EvaluationError] = {}
+        self._pending_results: List[Tuple[ExpressionOperator, float, Any]] = []
+        self._results_timer = QTimer(self) # coalesces the results arriving within an interval
+        self._results_timer.setSingleShot(True)
+        self._results_timer.setInterval(30)
+        self._results_timer.timeout.connect(self._flushResults)
+        self._operatorDone.connect(self._onOperatorDone)
+        self._evaluationDone.connect(self._onEvaluationDone)
+
     def invisibleRootItem(self) -> FlowGraph:
         """Return the root item of the model."""
         return self._root
@@ -219,7 +314,7 @@ class FlowGraphModel(QAbstractItemModel):
         
         match parent_item:
             case FlowGraph():
-                return 2
+                return len(self.HEADERS)
             
             case ExpressionOperator():
                 return 1
@@ -242,7 +337,13 @@ class FlowGraphModel(QAbstractItemModel):
             return None
         
         item = index.internalPointer()
+        if role == GraphDataRole.IdRole and index.column() == 0:
+            return itemUid(item)
+
         match item:
+            case ExpressionOperator() if role in ProfileRole or role == GraphDataRole.CostRole:
+                return self._profileData(item, role)
+
             case ExpressionOperator():
                 operator = item
 
@@ -261,6 +362,25 @@ class FlowGraphModel(QAbstractItemModel):
                     
                     case 1, Qt.ItemDataRole.EditRole:
                         return operator.expression()
+
+                    case self.RESULT_COLUMN, Qt.ItemDataRole.DisplayRole:
+                        if operator in self._evaluation_errors:
+                            return f"error: {self._evaluation_errors[operator].error!r}"
+                        result = self.invisibleRootItem().evaluator().result(operator)
+                        return summarizeResult(result.value) if result is not None else ""
+
+                    case column, Qt.ItemDataRole.DisplayRole if column in self.PROFILE_COLUMNS:
+                        profile_role = self.PROFILE_COLUMNS[column]
+                        value = self._profileData(operator, profile_role)
+                        match profile_role:
+                            case _ if value is None:
+                                return ""
+                            case ProfileRole.WallTimeRole:
+                                return formatDuration(value)
+                            case ProfileRole.OutputSizeRole:
+                                return formatSize(value)
+                            case _:
+                                return f"{value}"
                     case _:
                         return None
                             
@@ -316,6 +436,29 @@ class FlowGraphModel(QAbstractItemModel):
             case _:
                 return None
     
+    def _profileData(self, operator:ExpressionOperator, role:int) -> float|int|None:
+        evaluator = self.invisibleRootItem().evaluator()
+        if role == GraphDataRole.CostRole:
+            return evaluator.cost(operator)
+        profile = evaluator.profile(operator)
+        if profile is None:
+            return None
+        match role:
+            case ProfileRole.WallTimeRole:
+                return profile.total_time
+            case ProfileRole.CallCountRole:
+                return profile.calls
+            case ProfileRole.CacheHitsRole:
+                return profile.cache_hits
+            case ProfileRole.OutputSizeRole:
+                return profile.output_size
+        return None
+
+    def headerData(self, section:int, orientation:Qt.Orientation, role:int=Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
     def setData(self, index:QModelIndex, value, role:int = Qt.ItemDataRole.EditRole)->bool:
         if not index.isValid():
             logger.warning("Invalid index")
@@ -414,9 +557,13 @@ class FlowGraphModel(QAbstractItemModel):
                 link = item
                 match role:
                     case GraphDataRole.SourceRole:
-                        assert isinstance(value, (QModelIndex, QPersistentModelIndex)), "Source must be a valid QModelIndex."
-                        assert value.isValid(), "Source index must be valid."
-                        source_item = self._itemFromIndex(value)
+                        if isinstance(value, (QModelIndex, QPersistentModelIndex)):
+                            assert value.isValid(), "Source index must be valid."
+                            source_item = self._itemFromIndex(value)
+                        else:
+                            # source given by its IdRole
+                            source_item = self.invisibleRootItem().itemByUid(value)
+                            assert source_item is not None, f"Unknown source id: {value}"
                         graph: FlowGraph = self.invisibleRootItem()
                         graph.setLinkSource(link, source_item)  # Relink the existing link to the new source
                         self.dataChanged.emit(index, index, [GraphDataRole.SourceRole])
@@ -430,6 +577,9 @@ class FlowGraphModel(QAbstractItemModel):
         
         item = index.internalPointer()
         match item:
+            case ExpressionOperator() if index.column() >= self.RESULT_COLUMN: # results and profile
+                return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
             case ExpressionOperator():
                 return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
             
@@ -518,6 +668,8 @@ class FlowGraphModel(QAbstractItemModel):
                         self.removeRows(link.row(), 1, inlet)
 
                 # remove the nodes
+                evaluator = graph.evaluator()
+                removes_slowest = any(evaluator.cost(op) == 1.0 for op in graph.operators()[row:row + count])
                 self.beginRemoveRows(parent, row, row + count - 1)
                 for i in reversed(list(range(row, row + count))):
                     logger.info(f"Removing operator at index {i}")
@@ -528,6 +680,8 @@ class FlowGraphModel(QAbstractItemModel):
                             self.endRemoveRows()
                             return False
                 self.endRemoveRows()
+                if removes_slowest:
+                    self._emitCostChanged() # relative to the next slowest operator now
                 return True
             
             case ExpressionOperator():
@@ -558,8 +712,105 @@ class FlowGraphModel(QAbstractItemModel):
                 return False
 
     def evaluate(self, index: QModelIndex) -> Any:
+        """The value of the selected operator.
+        Only the ancestors edited since the last evaluation are recomputed, see FlowGraphEvaluator.
+        Blocks until done, see evaluateAsync."""
+        graph = self.invisibleRootItem()
+        item = self._itemFromIndex(index)  # Ensure the index is valid
+        value = graph.evaluate(item)
+        self._evaluation_errors = {op: err for op, err in self._evaluation_errors.items() if graph.evaluator().isDirty(op)}
+        self._emitResultsChanged(range(len(graph.operators())))
+        return value
+
+    ## Asynchronous evaluation
+    def evaluateAsync(self, index: QModelIndex):
+        """Evaluate the operator on a background thread, superseding any running evaluation.
+
+        Emits evaluationStarted, operatorEvaluated for each recomputed operator and evaluationFinished.
+        Results are shown in the RESULT_COLUMN, updated by batched dataChanged signals.
+        Editing the graph meanwhile cancels the evaluation, see FlowGraphScheduler.
+        """
+        operator = self._itemFromIndex(index)
+        assert isinstance(operator, ExpressionOperator), f"Expected an operator, got {type(operator)}"
+        self.cancelEvaluation()
+        self._evaluation_cancelled = threading.Event()
+        self.evaluationStarted.emit(QModelIndex(index))
+        self._evaluation_pool.start(_EvaluationTask(self, operator, self._evaluation_cancelled))
+
+    def cancelEvaluation(self):
+        """Stop the running and the queued evaluations. Their evaluationFinished report EvaluationCancelled."""
+        self._evaluation_cancelled.set()
+
+    def isEvaluating(self) -> bool:
+        return self._evaluation_pool.activeThreadCount() > 0
+
+    def waitForEvaluation(self, msecs:int=-1) -> bool:
+        """Block until the evaluations are done. Their signals are delivered by the event loop."""
+        return self._evaluation_pool.waitForDone(msecs)
+
+    def _onOperatorDone(self, operator:ExpressionOperator, duration:float, value:Any):
+        if self.invisibleRootItem().evaluator().result(operator) is None:
+            return # removed meanwhile
+        self._evaluation_errors.pop(operator, None)
+        if not self._results_timer.isActive():
+            self._results_timer.start()
+        self._pending_results.append((operator, duration, value))
+
+    def _onEvaluationDone(self, operator:ExpressionOperator, value:Any, error:Exception|None, errors:Dict[ExpressionOperator, EvaluationError]):
+        self._flushResults()
+        self._evaluation_errors.update(errors)
+        operators = self.invisibleRootItem().operators()
+        self._emitResultsChanged(range(len(operators))) # errors and cache hits are not reported per operator
+
+        if operator in operators:
+            index = self._indexFromItem(operator)
+        else:
+            index = QModelIndex()
+            if error is None:
+                error = EvaluationCancelled("the operator was removed")
+        self.evaluationFinished.emit(index, value, error)
+
+    def _flushResults(self):
+        self._results_timer.stop()
+        if not self._pending_results:
+            return
+        pending, self._pending_results = self._pending_results, []
+        rows = {op: row for row, op in enumerate(self.invisibleRootItem().operators())}
+        for operator, duration, value in pending:
+            if operator in rows:
+                index = self.createIndex(rows[operator], 0, operator)
+                self.operatorEvaluated.emit(index, duration, summarizeResult(value))
+        self._emitResultsChanged(rows[op] for op, _, _ in pending if op in rows)
+
+    def _emitResultsChanged(self, rows:Iterable[int]):
+        """A single dataChanged over the result and profile columns of the rows,
+        and one for the cost of all the operators, relative to the slowest one."""
+        rows = list(rows)
+        if not rows:
+            return
+        operators = self.invisibleRootItem().operators()
+        top, bottom = min(rows), max(rows)
+        last_column = self.columnCount() - 1
+        self.dataChanged.emit(
+            self.createIndex(top, self.RESULT_COLUMN, operators[top]),
+            self.createIndex(bottom, last_column, operators[bottom]),
+            [Qt.ItemDataRole.DisplayRole]
+        )
+        self._emitCostChanged()
+
+    def _emitCostChanged(self):
+        """The cost of every operator is relative to the slowest one."""
+        operators = self.invisibleRootItem().operators()
+        if not operators:
+            return
+        self.dataChanged.emit(
+            self.createIndex(0, 0, operators[0]),
+            self.createIndex(len(operators)-1, 0, operators[-1]),
+            [GraphDataRole.CostRole]
+        )
+
+    def buildScript(self, index: QModelIndex) -> str:
         """create a python script from the selected operator and its ancestors."""
-        print(f"Evaluating from index: {index}")
         graph = self.invisibleRootItem()
         item = self._itemFromIndex(index)  # Ensure the index is valid
         return graph.buildScript(item)
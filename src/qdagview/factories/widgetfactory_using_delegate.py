@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import weakref
+from collections import Counter
 logger = logging.getLogger(__name__)
 
 from typing import *
@@ -11,8 +12,9 @@ from qtpy.QtCore import *
 from qtpy.QtWidgets import *
 
 from ..widgets import (
-    NodeWidget, PortWidget, LinkWidget, CellWidget
+    NodeWidget, PortWidget, LinkWidget, CellWidget, StaticTextCellWidget, LinkLayer, LinkBatch
 )
+from ..delegates.graphview_delegate import GraphDelegate, DetailLevel
 
 import weakref
 
@@ -67,14 +69,30 @@ class NodeWidgetWithDelegate(NodeWidget):
     def __init__(self, graphview: QItemModel_GraphView, parent: QGraphicsItem | None = None):
         super().__init__(parent)
         self._graphview = weakref.ref(graphview)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsScenePositionChanges, True)
+
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any):
+        if change == QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged:
+            if graphview:=self._graphview():
+                # keep the hit-test index in sync with the moved node, its ports and cells
+                graphview._refreshHitIndex(self)
+        return super().itemChange(change, value)
+
+    def invalidateLayout(self, *parts:Literal['inlets', 'outlets', 'cells']):
+        super().invalidateLayout(*parts)
+        if graphview:=self._graphview():
+            graphview._invalidateLayout(self) # arranged when the view is done with the current change
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         if graphview:=self._graphview():
             index = graphview._widget_manager.getIndex(self)
             if index is None:
                 return # If index is None, the widget is being removed - skip painting
-            opt = makeViewOption(option, index, graphview)
-            graphview._delegate.paintNode(painter, opt, index)
+            opt = graphview._factory.viewOption(self, option, index, graphview)
+            if graphview._detail_level >= DetailLevel.Shapes:
+                graphview._delegate.paintNodeSimplified(painter, opt, index)
+            else:
+                graphview._delegate.paintNode(painter, opt, index)
         else:
             super().paint(painter, option, widget)
 
@@ -86,12 +104,14 @@ class InletWidgetWithDelegate(PortWidget):
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         if graphview:=self._graphview():
+            if graphview._detail_level >= DetailLevel.NoPorts:
+                return
             index = graphview._widget_manager.getIndex(self)
             if index is None:
                 # TODO: revisit this logic. 
                 # no painting should be invoked after it has been removed from the scene right?
                 return # If index is None, the widget is being removed - skip painting
-            opt = makeViewOption(option, index, graphview)
+            opt = graphview._factory.viewOption(self, option, index, graphview)
             graphview._delegate.paintInlet(painter, opt, index)
         else:
             super().paint(painter, option, widget)
@@ -104,10 +124,12 @@ class OutletWidgetWithDelegate(PortWidget):
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         if graphview:=self._graphview():
+            if graphview._detail_level >= DetailLevel.NoPorts:
+                return
             index = graphview._widget_manager.getIndex(self)
             if index is None:
                 return # If index is None, the widget is being removed - skip painting
-            opt = makeViewOption(option, index, graphview)
+            opt = graphview._factory.viewOption(self, option, index, graphview)
             graphview._delegate.paintInlet(painter, opt, index)
         else:
             super().paint(painter, option, widget)
@@ -117,13 +139,18 @@ class LinkWidgetWithDelegate(LinkWidget):
     def __init__(self, graphview: QItemModel_GraphView, parent: QGraphicsItem | None = None):
         super().__init__(parent)
         self._graphview = weakref.ref(graphview)
+        self._decoration_alignment: Qt.AlignmentFlag|None = None
+
+    def _invalidateGeometry(self):
+        super()._invalidateGeometry()
+        self._decoration_alignment = None
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         if graphview:=self._graphview():
             index = graphview._widget_manager.getIndex(self)
             if index is None:
                 return # If index is None, the widget is being removed - skip painting
-            opt = makeViewOption(option, index, graphview)
+            opt = graphview._factory.viewOption(self, option, index, graphview)
             outlet_index = graphview._controller.linkSource(index)
             inlet_index = graphview._controller.linkTarget(index)
             if outlet_index is None or inlet_index is None:
@@ -133,43 +160,195 @@ class LinkWidgetWithDelegate(LinkWidget):
             if outlet_widget is None or inlet_widget is None:
                 return
 
-            # Set decoration alignment based on relative positions
-            if outlet_widget and inlet_widget:
-                dx = inlet_widget.scenePos().x() - outlet_widget.scenePos().x()
-                dy = inlet_widget.scenePos().y() - outlet_widget.scenePos().y()
-                if dx >= 0 and dy >= 0:  # Target is bottom-right
-                    opt.decorationAlignment = Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight
-                elif dx < 0 and dy >= 0:  # Target is bottom-left  
-                    opt.decorationAlignment = Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft
-                elif dx >= 0 and dy < 0:  # Target is top-right
-                    opt.decorationAlignment = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignRight
-                else:  # Target is top-left
-                    opt.decorationAlignment = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft
-
-            graphview._delegate.paintLink(painter, opt, index)
+            opt.decorationAlignment = self.decorationAlignment()
+            if graphview._detail_level >= DetailLevel.Shapes:
+                graphview._delegate.paintLinkSimplified(painter, opt, index)
+            else:
+                graphview._delegate.paintLink(painter, opt, index)
         
         else:
             super().paint(painter, option, widget)
 
 
-class CellWidgetWithDelegate(CellWidget):
+    def decorationAlignment(self) -> Qt.AlignmentFlag:
+        """Direction of the link as an alignment, for the delegate. Cached with the line geometry."""
+        if self._decoration_alignment is not None:
+            return self._decoration_alignment
+        # Set decoration alignment based on relative positions
+        line = self.line()
+        dx = line.dx()
+        dy = line.dy()
+        if dx >= 0 and dy >= 0:  # Target is bottom-right
+            alignment = Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight
+        elif dx < 0 and dy >= 0:  # Target is bottom-left  
+            alignment = Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignLeft
+        elif dx >= 0 and dy < 0:  # Target is top-right
+            alignment = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignRight
+        else:  # Target is top-left
+            alignment = Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft
+        self._decoration_alignment = alignment
+        return alignment
+
+
+class CellWidgetWithDelegate(StaticTextCellWidget):
     def __init__(self, graphview: QItemModel_GraphView, parent: QGraphicsItem | None = None):
         super().__init__(parent)
         self._graphview = weakref.ref(graphview)
 
     def paint(self, painter: QPainter, option: QStyleOption, widget=None):
         if graphview:=self._graphview():
+            if graphview._detail_level >= DetailLevel.NoCells:
+                return
             index = graphview._cell_manager.getIndex(self)
             if index is not None:
-                opt = makeViewOption(option, index, graphview)
+                if type(graphview._delegate).paintCell is GraphDelegate.paintCell:
+                    # the default delegate centers the display text, which the static text already holds
+                    self.paintText(painter, option.rect)
+                    return
+                opt = graphview._factory.viewOption(self, option, index, graphview)
                 graphview._delegate.paintCell(painter, opt, graphview._controller, index)
             # If index is None, the widget is being removed - skip painting
         else:
             super().paint(painter, option, widget)
 
 
+class LinkLayerWithDelegate(LinkLayer):
+    def __init__(self, scene:QGraphicsScene, graphview: QItemModel_GraphView):
+        super().__init__(scene)
+        self._graphview = weakref.ref(graphview)
+
+    def paintLinks(self, painter:QPainter, option:QStyleOptionGraphicsItem, state:QStyle.StateFlag, batch:LinkBatch):
+        if graphview:=self._graphview():
+            opt = QStyleOptionViewItem()
+            opt.rect = option.rect
+            opt.state = option.state & ~(QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_MouseOver) | state
+            opt.palette = graphview.palette()
+            opt.font = graphview.font()
+            if graphview._detail_level >= DetailLevel.Shapes:
+                graphview._delegate.paintLinkBatchSimplified(painter, opt, batch.lines)
+            else:
+                graphview._delegate.paintLinkBatch(painter, opt, batch.shafts, batch.heads)
+        else:
+            super().paintLinks(painter, option, state, batch)
+
+
 class WidgetFactoryUsingDelegate(QObject):
-    portPositionChanged = Signal(QPersistentModelIndex)
+    """Creates the delegate-painted widgets of the view.
+
+    Destroyed widgets are detached and kept in per-kind pools, then reset and
+    rebound to their new index when a widget of the same kind is created.
+    Pools are capped with setPoolCapacity; widgets beyond the cap are deleted.
+    """
+    portPositionChanged = Signal(object) # QPersistentModelIndex, or the ID with stable IDs
+
+    Kinds = ('node', 'inlet', 'outlet', 'link', 'cell')
+
+    def __init__(self, parent:QObject|None=None):
+        super().__init__(parent)
+        self._pools: Dict[str, List[QGraphicsItem]] = {kind: [] for kind in self.Kinds}
+        self._pool_capacity: Dict[str, int] = {kind: 256 for kind in self.Kinds}
+        # pool hits, misses and discarded widgets by kind, eg.: {"node_hits": 10, "node_misses": 1}
+        self._pool_stats = Counter()
+        # view options by widget and style state, see viewOption
+        self._view_options: Dict[QGraphicsItem, Dict[QStyle.StateFlag, QStyleOptionViewItem]] = {}
+
+    ## View options
+    def viewOption(self, widget:QGraphicsItem, option_graphics:QStyleOptionGraphicsItem, index:QModelIndex, graphview=None) -> QStyleOptionViewItem:
+        """
+        The view option of the widget to paint its index with, see makeViewOption.
+        Options are cached per widget and state, until invalidated with invalidateViewOptions,
+        so painting does not query the model and the palette each time.
+        """
+        options = self._view_options.get(widget, None)
+        if options is None:
+            options = self._view_options[widget] = {}
+        opt = options.get(option_graphics.state, None)
+        if opt is None:
+            opt = options[option_graphics.state] = makeViewOption(option_graphics, index, graphview)
+        else:
+            opt.rect = option_graphics.rect
+        return opt
+
+    def invalidateViewOptions(self, widget:QGraphicsItem|None=None):
+        """Drop the cached view options of the widget, or of all widgets."""
+        if widget is None:
+            self._view_options.clear()
+        else:
+            self._view_options.pop(widget, None)
+
+    ## Pools
+    def setPoolCapacity(self, capacity:int, kind:str|None=None):
+        """Maximum number of detached widgets kept for reuse, for one kind or for all of them. 0 disables pooling."""
+        assert capacity >= 0, "capacity must not be negative"
+        for pool_kind in ([kind] if kind else self.Kinds):
+            self._pool_capacity[pool_kind] = capacity
+            pool = self._pools[pool_kind]
+            while len(pool) > capacity:
+                self._discard(pool_kind, pool.pop())
+
+    def poolCapacity(self, kind:str) -> int:
+        return self._pool_capacity[kind]
+
+    def pooledCount(self, kind:str) -> int:
+        return len(self._pools[kind])
+
+    def poolStats(self) -> Dict[str, int]:
+        """Pool hits, misses and discarded widgets by kind, since the last reset."""
+        return dict(self._pool_stats)
+
+    def resetPoolStats(self):
+        self._pool_stats.clear()
+
+    def clearPools(self):
+        for kind, pool in self._pools.items():
+            while pool:
+                self._discard(kind, pool.pop())
+
+    def _acquire(self, kind:str) -> QGraphicsItem|None:
+        pool = self._pools[kind]
+        if pool:
+            self._pool_stats[f"{kind}_hits"] += 1
+            return pool.pop()
+        self._pool_stats[f"{kind}_misses"] += 1
+        return None
+
+    def _release(self, kind:str, widget:QGraphicsItem):
+        """Detach the widget and keep it for reuse, or delete it when the pool is full."""
+        self._view_options.pop(widget, None)
+        if widget.parentItem():
+            widget.setParentItem(None)
+        if scene := widget.scene():
+            scene.removeItem(widget)
+
+        if isinstance(widget, PortWidget):
+            widget.setProperty("modelIndex", None)
+
+        pool = self._pools[kind]
+        if len(pool) < self._pool_capacity[kind]:
+            pool.append(widget)
+        else:
+            self._discard(kind, widget)
+
+    def _discard(self, kind:str, widget:QGraphicsItem):
+        self._pool_stats[f"{kind}_discarded"] += 1
+        if isinstance(widget, QObject):
+            widget.deleteLater()
+
+    def _reset(self, widget:QGraphicsItem, graphview):
+        """Reset the state left by the previous use of a pooled widget."""
+        widget._graphview = weakref.ref(graphview)
+        widget.setPos(0, 0)
+        widget.setVisible(True)
+        if widget.flags() & QGraphicsItem.GraphicsItemFlag.ItemIsSelectable:
+            widget.setSelected(False)
+        if isinstance(widget, PortWidget):
+            widget._notified_scene_pos = None # notify the first position of the new port
+
+    def _onPortScenePositionChanged(self, pos:QPointF):
+        port_key = self.sender().property("modelIndex")
+        if port_key is None or isinstance(port_key, QPersistentModelIndex) and not port_key.isValid():
+            return
+        self.portPositionChanged.emit(port_key)
 
     ## Widget Factory
     @override
@@ -179,7 +358,10 @@ class WidgetFactoryUsingDelegate(QObject):
         if not index.isValid():
             raise ValueError("Index must be valid")
 
-        widget = NodeWidgetWithDelegate(graphview)
+        if widget := self._acquire('node'):
+            self._reset(widget, graphview)
+        else:
+            widget = NodeWidgetWithDelegate(graphview)
         parent_widget.addItem(widget)
         return widget
 
@@ -191,6 +373,16 @@ class WidgetFactoryUsingDelegate(QObject):
             raise TypeError("Widget must be a NodeWidgetWithDelegate")
 
         parent_widget.removeItem(widget)
+        self._release('node', widget)
+
+    def _createPortWidget(self, kind:str, widget_type:Type[PortWidget], graphview) -> PortWidget:
+        if widget := self._acquire(kind):
+            self._reset(widget, graphview)
+            return widget
+        widget = widget_type(graphview)
+        # connected once, the index is read from the modelIndex property of the sender
+        widget.scenePositionChanged.connect(self._onPortScenePositionChanged)
+        return widget
 
     @override
     def createInletWidget(self, parent_widget: NodeWidgetWithDelegate, index: QModelIndex, graphview) -> PortWidget:
@@ -199,19 +391,10 @@ class WidgetFactoryUsingDelegate(QObject):
         if not index.isValid():
             raise ValueError("Index must be valid")
 
-        widget = InletWidgetWithDelegate(graphview)
+        widget = self._createPortWidget('inlet', InletWidgetWithDelegate, graphview)
+        # bind the widget to its index, or its ID, before it is positioned
+        widget.setProperty("modelIndex", graphview._itemKey(index))
         parent_widget.insertInlet(index.row(), widget)
-        
-        # Store the persistent index directly on the widget
-        # This avoids closure issues entirely
-        persistent_index = QPersistentModelIndex(index)
-        widget.setProperty("modelIndex", persistent_index)
-        
-        # Connect using a simple lambda that gets the property
-        widget.scenePositionChanged.connect(
-            lambda: self.portPositionChanged.emit(widget.property("modelIndex")) 
-            if widget.property("modelIndex").isValid() else None
-        )
         return widget
     
     @override
@@ -222,8 +405,7 @@ class WidgetFactoryUsingDelegate(QObject):
             raise TypeError("Widget must be an PortWidget, got:{widget}")
         
         parent_widget.removeInlet(widget)
-        # Schedule widget for deletion - this automatically disconnects all signals
-        widget.deleteLater()
+        self._release('inlet', widget)
     
     @override
     def createOutletWidget(self, parent_widget: NodeWidget, index: QModelIndex, graphview) -> PortWidget:
@@ -232,21 +414,10 @@ class WidgetFactoryUsingDelegate(QObject):
         if not index.isValid():
             raise ValueError("Index must be valid")
 
-        widget = OutletWidgetWithDelegate(graphview)
-        # Fix: Use actual row position instead of hardcoded 0
-        outlet_position = index.row()
-        parent_widget.insertOutlet(outlet_position, widget)
-        
-        # Store the persistent index directly on the widget
-        # This avoids closure issues entirely
-        persistent_index = QPersistentModelIndex(index)
-        widget.setProperty("modelIndex", persistent_index)
-        
-        # Connect using a simple lambda that gets the property
-        widget.scenePositionChanged.connect(
-            lambda: self.portPositionChanged.emit(widget.property("modelIndex")) 
-            if widget.property("modelIndex").isValid() else None
-        )
+        widget = self._createPortWidget('outlet', OutletWidgetWithDelegate, graphview)
+        # bind the widget to its index, or its ID, before it is positioned
+        widget.setProperty("modelIndex", graphview._itemKey(index))
+        parent_widget.insertOutlet(index.row(), widget)
         return widget
     
     @override
@@ -257,8 +428,7 @@ class WidgetFactoryUsingDelegate(QObject):
             raise TypeError("Widget must be a PortWidget")
 
         parent_widget.removeOutlet(widget)
-        # Schedule widget for deletion - this automatically disconnects all signals
-        widget.deleteLater()
+        self._release('outlet', widget)
         
     @override
     def createLinkWidget(self, scene: QGraphicsScene, index: QModelIndex, graphview) -> LinkWidget:
@@ -268,10 +438,19 @@ class WidgetFactoryUsingDelegate(QObject):
         if not index.isValid():
             raise ValueError("Index must be valid")
 
-        link_widget = LinkWidgetWithDelegate(graphview)
+        if link_widget := self._acquire('link'):
+            self._reset(link_widget, graphview)
+        else:
+            link_widget = LinkWidgetWithDelegate(graphview)
         scene.addItem(link_widget)  # Links are added to the scene, not to the inlet widget
         return link_widget
     
+    def createLinkLayer(self, scene: QGraphicsScene, graphview) -> LinkLayer:
+        """Create the layer drawing all the links, used instead of link widgets when the view enables it."""
+        if not isinstance(scene, QGraphicsScene):
+            raise TypeError("Scene must be a QGraphicsScene")
+        return LinkLayerWithDelegate(scene, graphview)
+
     @override
     def destroyLinkWidget(self, scene: QGraphicsScene, widget: LinkWidget):
         if not isinstance(scene, QGraphicsScene):
@@ -280,27 +459,28 @@ class WidgetFactoryUsingDelegate(QObject):
             raise TypeError(f"Widget must be a LinkWidget, got {widget}")
                 
         scene.removeItem(widget)
-        # Schedule widget for deletion to prevent memory leaks
-        widget.deleteLater()
+        self._release('link', widget)
 
     @override
-    def createCellWidget(self, parent_widget: NodeWidget|PortWidget|LinkWidget, index: QModelIndex, graphview) -> CellWidget:
+    def createCellWidget(self, parent_widget: NodeWidget|PortWidget|LinkWidget, index: QModelIndex, graphview) -> StaticTextCellWidget:
         if not isinstance(parent_widget, (NodeWidget, PortWidget, LinkWidget)):
             raise TypeError(f"Parent widget must be a NodeWidget, PortWidget, or LinkWidget, got {parent_widget}")
         if not index.isValid():
             raise ValueError("Index must be valid")
 
-        cell = CellWidgetWithDelegate(graphview)
+        if cell := self._acquire('cell'):
+            self._reset(cell, graphview)
+        else:
+            cell = CellWidgetWithDelegate(graphview)
         parent_widget.insertCell(index.column(), cell)
         return cell
 
     @override
-    def destroyCellWidget(self, parent_widget: NodeWidget|PortWidget|LinkWidget, widget: CellWidget):
+    def destroyCellWidget(self, parent_widget: NodeWidget|PortWidget|LinkWidget, widget: StaticTextCellWidget):
         if not isinstance(parent_widget, (NodeWidget, PortWidget, LinkWidget)):
             raise TypeError("Parent widget must be a NodeWidget, PortWidget, or LinkWidget")
-        if not isinstance(widget, CellWidget):
+        if not isinstance(widget, (CellWidget, StaticTextCellWidget)):
             raise TypeError("Widget must be a CellWidget")
         
         parent_widget.removeCell(widget)
-        # Schedule widget for deletion - this automatically disconnects all signals
-        widget.deleteLater()
+        self._release('cell', widget)
@@ -15,7 +15,7 @@ from ..widgets import (
 )
 
 class WidgetFactory(QObject):
-    portPositionChanged = Signal(QPersistentModelIndex)
+    portPositionChanged = Signal(object) # QPersistentModelIndex, or the ID with stable IDs
 
     ## Widget Factory
     @override
@@ -48,15 +48,15 @@ class WidgetFactory(QObject):
         widget = PortWidget()
         parent_widget.insertInlet(index.row(), widget)
         
-        # Store the persistent index directly on the widget
+        # Store the persistent index, or the ID of the item, directly on the widget
         # This avoids closure issues entirely
-        persistent_index = QPersistentModelIndex(index)
-        widget.setProperty("modelIndex", persistent_index)
+        port_key = graphview._itemKey(index) if graphview is not None else QPersistentModelIndex(index)
+        widget.setProperty("modelIndex", port_key)
         
         # Connect using a simple lambda that gets the property
         widget.scenePositionChanged.connect(
             lambda: self.portPositionChanged.emit(widget.property("modelIndex")) 
-            if widget.property("modelIndex").isValid() else None
+            if widget.property("modelIndex") is not None else None
         )
         return widget
     
@@ -83,15 +83,15 @@ class WidgetFactory(QObject):
         outlet_position = index.row()
         parent_widget.insertOutlet(outlet_position, widget)
         
-        # Store the persistent index directly on the widget
+        # Store the persistent index, or the ID of the item, directly on the widget
         # This avoids closure issues entirely
-        persistent_index = QPersistentModelIndex(index)
-        widget.setProperty("modelIndex", persistent_index)
+        port_key = graphview._itemKey(index) if graphview is not None else QPersistentModelIndex(index)
+        widget.setProperty("modelIndex", port_key)
         
         # Connect using a simple lambda that gets the property
         widget.scenePositionChanged.connect(
             lambda: self.portPositionChanged.emit(widget.property("modelIndex")) 
-            if widget.property("modelIndex").isValid() else None
+            if widget.property("modelIndex") is not None else None
         )
         return widget
     
@@ -1,12 +1,20 @@
 from .widget_manager_protocol import WidgetIndexManagerProtocol
 from .widget_manager_using_tree_data_structure import TreeWidgetIndexManager
 from .widget_manager_using_persistent_index import PersistentWidgetIndexManager
+from .widget_manager_using_item_data import ItemDataWidgetIndexManager
+from .widget_manager_using_ids import IdWidgetIndexManager
 
 from .linking_manager import LinkingManager
+from .spatial_index import SpatialIndex
+from .segment_index import SegmentIndex
 
 __all__ = [
     'TreeWidgetIndexManager',
     'PersistentWidgetIndexManager',
+    'ItemDataWidgetIndexManager',
+    'IdWidgetIndexManager',
     'WidgetIndexManagerProtocol',
-    'LinkingManager'
+    'LinkingManager',
+    'SpatialIndex',
+    'SegmentIndex'
 ]
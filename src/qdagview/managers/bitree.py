@@ -1,11 +1,19 @@
 from typing import Any, Dict, List, Optional, Tuple, Iterator
 
+from .indexed_list import IndexedList, Handle
+
 class Node:
-    def __init__(self, value: Any, parent: Optional["Node"] = None, index: int = 0):
+    def __init__(self, value: Any, parent: Optional["Node"] = None):
         self.value = value
         self.parent = parent
-        self.index = index
-        self.children: List["Node"] = []
+        self.children: IndexedList["Node"] = IndexedList()
+        self._handle: Optional[Handle["Node"]] = None # position in the children of the parent
+
+    @property
+    def index(self) -> int:
+        if self.parent is None:
+            return 0
+        return self.parent.children.position(self._handle)
 
     def path(self) -> Tuple[int, ...]:
         parts = []
@@ -16,64 +24,79 @@ class Node:
         return tuple(reversed(parts))
 
 class BiTree:
+    """Tree of values, addressed by paths of sibling positions.
+
+    Children are kept in IndexedLists, so insert, remove, value-at-path and
+    path-of-value are O(depth * log n).
+    """
     def __init__(self):
         self.root = Node(None)  # dummy root
         self._value_to_node: Dict[Any, Node] = {}
 
     # ---------- Insert ----------
     def insert(self, path: Tuple[int, ...], value: Any):
-        parent = self.root
-        for comp in path[:-1]:
-            parent = parent.children[comp]
-
-        new_node = Node(value, parent, path[-1])
-        parent.children.insert(path[-1], new_node)
+        parent = self._node(path[:-1])
 
-        # update sibling indices
-        for i, child in enumerate(parent.children):
-            child.index = i
+        new_node = Node(value, parent)
+        new_node._handle = parent.children.insert(path[-1], new_node)
 
         self._value_to_node[value] = new_node
 
     # ---------- Lookup ----------
     def get(self, path: Tuple[int, ...]) -> Any:
-        node = self.root
-        for comp in path:
-            node = node.children[comp]
-        return node.value
+        return self._node(path).value
 
     def index(self, value: Any) -> Optional[Tuple[int, ...]]:
         node = self._value_to_node.get(value)
         return node.path() if node else None
 
+    def parent(self, value: Any) -> Any:
+        """The value of the parent, None for top level values."""
+        node = self._value_to_node[value]
+        return node.parent.value
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._value_to_node
+
+    def __len__(self) -> int:
+        return len(self._value_to_node)
+
+    def _node(self, path: Tuple[int, ...]) -> Node:
+        node = self.root
+        for comp in path:
+            node = node.children[comp]
+        return node
+
     # ---------- Remove ----------
-    def remove(self, path: Tuple[int, ...]):
-        """Remove node at path (and all its descendants) iteratively."""
+    def remove(self, path: Tuple[int, ...]) -> List[Any]:
+        """Remove node at path (and all its descendants) iteratively.
+        Returns the removed values."""
         # Navigate to parent of the node to remove
-        parent = self.root
-        for comp in path[:-1]:
-            parent = parent.children[comp]
+        parent = self._node(path[:-1])
 
         # Remove the target node from parent's children
         target = parent.children.pop(path[-1])
-
-        # Update sibling indices after removal
-        for i, child in enumerate(parent.children):
-            child.index = i
+        target.parent = None
 
         # Iteratively remove target and all descendants from reverse lookup
+        removed = []
         stack = [target]
         while stack:
             current = stack.pop()
             self._value_to_node.pop(current.value, None)
+            removed.append(current.value)
             stack.extend(current.children)
+        return removed
 
+    def clear(self):
+        self.root = Node(None)
+        self._value_to_node.clear()
 
     # ---------- Traversal ----------
     def items(self) -> Iterator[Tuple[Tuple[int, ...], Any]]:
         def _rec(node: Node, prefix: Tuple[int, ...]):
-            for child in node.children:
-                path = prefix + (child.index,)
+            for i, child in enumerate(node.children):
+                path = prefix + (i,)
                 yield path, child.value
                 yield from _rec(child, path)
         yield from _rec(self.root, ())
@@ -0,0 +1,139 @@
+from typing import Any, Generic, Iterator, Optional, Tuple, TypeVar
+import random
+
+T = TypeVar('T')
+
+
+class Handle(Generic[T]):
+    """Position of an item in an IndexedList. Stays valid while the item is in the list."""
+    __slots__ = ('item', 'priority', 'left', 'right', 'up', 'size')
+    def __init__(self, item: T):
+        self.item = item
+        self.priority = random.random()
+        self.left: Optional["Handle[T]"] = None
+        self.right: Optional["Handle[T]"] = None
+        self.up: Optional["Handle[T]"] = None
+        self.size = 1
+
+
+def _size(handle: Optional[Handle]) -> int:
+    return handle.size if handle is not None else 0
+
+def _update(handle: Handle):
+    handle.size = 1 + _size(handle.left) + _size(handle.right)
+    if handle.left is not None:
+        handle.left.up = handle
+    if handle.right is not None:
+        handle.right.up = handle
+
+def _split(handle: Optional[Handle], k: int) -> Tuple[Optional[Handle], Optional[Handle]]:
+    """Split into the first k items and the rest."""
+    if handle is None:
+        return None, None
+    if _size(handle.left) >= k:
+        left, handle.left = _split(handle.left, k)
+        _update(handle)
+        return left, handle
+    else:
+        handle.right, right = _split(handle.right, k - _size(handle.left) - 1)
+        _update(handle)
+        return handle, right
+
+def _merge(a: Optional[Handle], b: Optional[Handle]) -> Optional[Handle]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    else:
+        b.left = _merge(a, b.left)
+        _update(b)
+        return b
+
+
+class IndexedList(Generic[T]):
+    """Sequence backed by an implicit treap.
+
+    insert, pop, item access by position and position of a handle are O(log n),
+    instead of the O(n) renumbering of a plain list.
+    """
+    def __init__(self):
+        self._root: Optional[Handle[T]] = None
+
+    # ---------- Modification ----------
+    def insert(self, position: int, item: T) -> Handle[T]:
+        """Insert the item before position. Returns its handle."""
+        if not 0 <= position <= len(self):
+            raise IndexError(f"Cannot insert at position {position}, list has {len(self)} items")
+        handle = Handle(item)
+        left, right = _split(self._root, position)
+        self._setRoot(_merge(_merge(left, handle), right))
+        return handle
+
+    def append(self, item: T) -> Handle[T]:
+        return self.insert(len(self), item)
+
+    def pop(self, position: int) -> T:
+        if not 0 <= position < len(self):
+            raise IndexError(f"Position {position} out of range")
+        left, right = _split(self._root, position)
+        handle, right = _split(right, 1)
+        self._setRoot(_merge(left, right))
+        handle.up = None
+        return handle.item
+
+    def clear(self):
+        self._root = None
+
+    def _setRoot(self, root: Optional[Handle[T]]):
+        if root is not None:
+            root.up = None
+        self._root = root
+
+    # ---------- Lookup ----------
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __getitem__(self, position: int) -> T:
+        return self.handleAt(position).item
+
+    def handleAt(self, position: int) -> Handle[T]:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"Position {position} out of range")
+        handle = self._root
+        while True:
+            left_size = _size(handle.left)
+            if position < left_size:
+                handle = handle.left
+            elif position == left_size:
+                return handle
+            else:
+                position -= left_size + 1
+                handle = handle.right
+
+    def position(self, handle: Handle[T]) -> int:
+        """Current position of the item of the handle."""
+        position = _size(handle.left)
+        while handle.up is not None:
+            if handle is handle.up.right:
+                position += _size(handle.up.left) + 1
+            handle = handle.up
+        assert handle is self._root, "handle is not in this list"
+        return position
+
+    # ---------- Traversal ----------
+    def __iter__(self) -> Iterator[T]:
+        stack = []
+        handle = self._root
+        while stack or handle is not None:
+            while handle is not None:
+                stack.append(handle)
+                handle = handle.left
+            handle = stack.pop()
+            yield handle.item
+            handle = handle.right
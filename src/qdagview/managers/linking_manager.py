@@ -7,13 +7,22 @@ from typing import TypeVar, Generic
 LinkType = TypeVar('L')  # LinkType
 InletType = TypeVar('I')  # InletType
 OutletType = TypeVar('O')  # OutletType
+NodeType = TypeVar('N')  # NodeType
 
 class LinkingManager(Generic[LinkType, InletType, OutletType]):
+    """
+    Registry of the links, their source and target ports, and optionally the nodes of these ports.
+    Links are kept in insertion order. Queries and modifications are proportional to the result, not to the graph.
+    """
     def __init__(self):
         self._link_source: Dict[LinkType, OutletType | None] = {}
         self._link_target: Dict[LinkType, InletType | None] = {}
-        self._inlet_links: Dict[InletType, List[LinkType]] = defaultdict(list)
-        self._outlet_links: Dict[OutletType, List[LinkType]] = defaultdict(list)
+        # ports and nodes map to their links, dicts are used as ordered sets
+        self._inlet_links: Dict[InletType, Dict[LinkType, None]] = defaultdict(dict)
+        self._outlet_links: Dict[OutletType, Dict[LinkType, None]] = defaultdict(dict)
+        self._link_nodes: Dict[LinkType, tuple[NodeType | None, NodeType | None]] = {}
+        self._node_in_links: Dict[NodeType, Dict[LinkType, None]] = defaultdict(dict)
+        self._node_out_links: Dict[NodeType, Dict[LinkType, None]] = defaultdict(dict)
 
     ## Querying
     def getLinkSource(self, link: LinkType) -> OutletType | None:
@@ -23,39 +32,79 @@ class LinkingManager(Generic[LinkType, InletType, OutletType]):
         return self._link_target.get(link, None)
     
     def getOutletLinks(self, outlet: OutletType) -> List[LinkType]:
-        return self._outlet_links.get(outlet, [])
+        return list(self._outlet_links.get(outlet, ()))
     
     def getInletLinks(self, inlet: InletType) -> List[LinkType]:
-        return self._inlet_links.get(inlet, [])
+        return list(self._inlet_links.get(inlet, ()))
+
+    def getNodeInLinks(self, node: NodeType) -> List[LinkType]:
+        """Links targeting any inlet of the node."""
+        return list(self._node_in_links.get(node, ()))
+
+    def getNodeOutLinks(self, node: NodeType) -> List[LinkType]:
+        """Links sourced from any outlet of the node."""
+        return list(self._node_out_links.get(node, ()))
+
+    def getLinks(self) -> List[LinkType]:
+        return list(self._link_target.keys())
+
+    def linkCount(self) -> int:
+        return len(self._link_target)
     
+    def __contains__(self, link: LinkType) -> bool:
+        return link in self._link_target
+
     ## Modification
-    def link(self, link: LinkType, source: OutletType | None, target: InletType):
+    def link(self, link: LinkType, source: OutletType | None, target: InletType, source_node: NodeType | None=None, target_node: NodeType | None=None):
         assert link is not None, "link must not be None"
         assert target is not None, "target must not be None"
 
         if source:
             self._link_source[link] = source
-            self._outlet_links[source].append(link)
+            self._outlet_links[source][link] = None
         else:
             self._link_source[link] = None
 
         self._link_target[link] = target
-        self._inlet_links[target].append(link)
+        self._inlet_links[target][link] = None
+
+        if source and source_node is not None:
+            self._node_out_links[source_node][link] = None
+        else:
+            source_node = None
+        if target_node is not None:
+            self._node_in_links[target_node][link] = None
+        self._link_nodes[link] = (source_node, target_node)
 
     def unlink(self, link: LinkType):
         source = self._link_source.get(link, None)
         target = self._link_target.get(link, None)
+        source_node, target_node = self._link_nodes.pop(link, (None, None))
 
         if source:
-            self._outlet_links[source].remove(link)
+            self._discard(self._outlet_links, source, link)
         if target:
-            self._inlet_links[target].remove(link)
+            self._discard(self._inlet_links, target, link)
+        if source_node is not None:
+            self._discard(self._node_out_links, source_node, link)
+        if target_node is not None:
+            self._discard(self._node_in_links, target_node, link)
 
         self._link_source.pop(link, None)
         self._link_target.pop(link, None)
 
+    @staticmethod
+    def _discard(links_by_key: Dict[Any, Dict[LinkType, None]], key: Any, link: LinkType):
+        if links := links_by_key.get(key):
+            links.pop(link, None)
+            if not links:
+                del links_by_key[key]
+
     def clear(self):
         self._link_source.clear()
         self._link_target.clear()
         self._inlet_links.clear()
         self._outlet_links.clear()
+        self._link_nodes.clear()
+        self._node_in_links.clear()
+        self._node_out_links.clear()
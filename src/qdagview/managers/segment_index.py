@@ -0,0 +1,171 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Hashable, Iterable, Iterator
+from typing import TypeVar, Generic
+import math
+
+from qtpy.QtCore import QRectF, QPointF, QLineF
+
+# Generic types
+KeyType = TypeVar('K', bound=Hashable)  # KeyType
+
+GridCell = Tuple[int, int]
+
+
+def _distanceToSegment(x:float, y:float, line:QLineF) -> float:
+    x1, y1, x2, y2 = line.x1(), line.y1(), line.x2(), line.y2()
+    dx, dy = x2 - x1, y2 - y1
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return math.hypot(x - x1, y - y1)
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_squared))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+def _segmentIntersectsRect(line:QLineF, rect:QRectF) -> bool:
+    """Liang-Barsky clipping of the segment against the rect."""
+    x1, y1 = line.x1(), line.y1()
+    dx, dy = line.dx(), line.dy()
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - rect.left()), (dx, rect.right() - x1),
+                 (-dy, y1 - rect.top()), (dy, rect.bottom() - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+class SegmentIndex(Generic[KeyType]):
+    """Uniform grid of line segments, used for hit-testing links.
+
+    Unlike SpatialIndex, which buckets the bounding rect of a key,
+    a segment is only bucketed in the grid cells it passes through (padded by `padding`),
+    so a long diagonal link costs a cell per grid step instead of the whole area below it.
+    """
+    def __init__(self, cell_size:float=128.0, padding:float=0.0):
+        assert cell_size > 0, "cell_size must be positive"
+        assert padding >= 0, "padding must not be negative"
+        self._cell_size = cell_size
+        self._padding = padding
+        self._grid: Dict[GridCell, Set[KeyType]] = defaultdict(set)
+        self._lines: Dict[KeyType, QLineF] = {}
+        self._cells: Dict[KeyType, List[GridCell]] = {}
+
+    ## Querying
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self._lines
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def line(self, key: KeyType) -> QLineF | None:
+        return self._lines.get(key, None)
+
+    def keys(self) -> List[KeyType]:
+        return list(self._lines.keys())
+
+    def cells(self, key: KeyType) -> List[GridCell]:
+        """The grid cells the segment of the key passes through."""
+        return list(self._cells.get(key, ()))
+
+    def cellKeys(self, cell: GridCell) -> Set[KeyType]:
+        """The keys passing through the grid cell."""
+        return set(self._grid.get(cell, ()))
+
+    def isCellEmpty(self, cell: GridCell) -> bool:
+        return cell not in self._grid
+
+    def cellRect(self, cell: GridCell) -> QRectF:
+        col, row = cell
+        return QRectF(col * self._cell_size, row * self._cell_size, self._cell_size, self._cell_size)
+
+    def query(self, point: QPointF, tolerance: float=0.0) -> List[KeyType]:
+        """Return the keys whose segment is within tolerance of the point, nearest first."""
+        x, y = point.x(), point.y()
+        extra = tolerance - self._padding # beyond the padding, the neighbour cells are looked at too
+        if extra > 0:
+            candidates = set()
+            (left, top), (right, bottom) = self._cellAt(x - extra, y - extra), self._cellAt(x + extra, y + extra)
+            for col in range(left, right + 1):
+                for row in range(top, bottom + 1):
+                    candidates.update(self._grid.get((col, row), ()))
+        else:
+            candidates = self._grid.get(self._cellAt(x, y), ())
+        hits = []
+        for key in candidates:
+            distance = _distanceToSegment(x, y, self._lines[key])
+            if distance <= tolerance:
+                hits.append((distance, key))
+        hits.sort(key=lambda hit: hit[0])
+        return [key for _, key in hits]
+
+    def queryRect(self, rect: QRectF) -> List[KeyType]:
+        """Return the keys whose segment crosses the rect."""
+        rect = rect.normalized()
+        (left, top), (right, bottom) = self._cellAt(rect.left(), rect.top()), self._cellAt(rect.right(), rect.bottom())
+        candidates = set()
+        for col in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                candidates.update(self._grid.get((col, row), ()))
+        return [key for key in candidates if _segmentIntersectsRect(self._lines[key], rect)]
+
+    ## Modification
+    def insert(self, key: KeyType, line: QLineF):
+        assert key is not None, "key must not be None"
+        if key in self._lines:
+            self.remove(key)
+
+        self._lines[key] = QLineF(line)
+        cells = list(self._cellsForSegment(line))
+        for cell in cells:
+            self._grid[cell].add(key)
+        self._cells[key] = cells
+
+    def update(self, key: KeyType, line: QLineF):
+        """Move the segment of a key."""
+        if key not in self._lines or self._lines[key] == line:
+            return
+        self.insert(key, line)
+
+    def remove(self, key: KeyType):
+        if key not in self._lines:
+            return
+        for cell in self._cells.pop(key):
+            bucket = self._grid[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._grid[cell]
+        del self._lines[key]
+
+    def clear(self):
+        self._grid.clear()
+        self._lines.clear()
+        self._cells.clear()
+
+    ## Grid
+    def _cellAt(self, x:float, y:float) -> GridCell:
+        return math.floor(x / self._cell_size), math.floor(y / self._cell_size)
+
+    def _cellsForSegment(self, line:QLineF) -> Iterator[GridCell]:
+        """The cells within padding of the segment: for each column the segment crosses,
+        the rows spanned by the part of the segment inside that column."""
+        size, pad = self._cell_size, self._padding
+        (x1, y1), (x2, y2) = sorted([(line.x1(), line.y1()), (line.x2(), line.y2())])
+        dx = x2 - x1
+        for col in range(math.floor((x1 - pad) / size), math.floor((x2 + pad) / size) + 1):
+            if dx == 0:
+                ya, yb = y1, y2
+            else:
+                xa = min(max(x1, col * size - pad), x2)
+                xb = min(max(x1, (col + 1) * size + pad), x2)
+                ya = y1 + (xa - x1) / dx * (y2 - y1)
+                yb = y1 + (xb - x1) / dx * (y2 - y1)
+            top, bottom = min(ya, yb) - pad, max(ya, yb) + pad
+            for row in range(math.floor(top / size), math.floor(bottom / size) + 1):
+                yield col, row
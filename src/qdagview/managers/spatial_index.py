@@ -0,0 +1,148 @@
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple, Hashable, Iterable, Any
+from typing import TypeVar, Generic
+import math
+from itertools import count
+
+from qtpy.QtCore import QRectF, QPointF
+
+# Generic types
+KeyType = TypeVar('K', bound=Hashable)  # KeyType
+
+GridCell = Tuple[int, int]
+
+
+class SpatialIndex(Generic[KeyType]):
+    """Uniform grid over scene space, used for hit-testing.
+
+    Every key is stored with its scene bounding rect and an optional kind.
+    Keys are bucketed into the grid cells their rect overlaps,
+    so a point query only looks at the keys of a single cell.
+    Keys spanning more than `max_cells` grid cells (eg.: long links)
+    are kept in a separate list to avoid flooding the grid.
+    """
+    def __init__(self, cell_size:float=128.0, max_cells:int=64):
+        assert cell_size > 0, "cell_size must be positive"
+        self._cell_size = cell_size
+        self._max_cells = max_cells
+        self._grid: Dict[GridCell, Set[KeyType]] = defaultdict(set)
+        self._large: Set[KeyType] = set()
+        self._rects: Dict[KeyType, QRectF] = {}
+        self._kinds: Dict[KeyType, Any] = {}
+        self._cells: Dict[KeyType, List[GridCell]] = {}
+        self._order: Dict[KeyType, int] = {}
+        self._counter = count()
+
+    ## Querying
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self._rects
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def rect(self, key: KeyType) -> QRectF | None:
+        return self._rects.get(key, None)
+
+    def kind(self, key: KeyType) -> Any:
+        return self._kinds.get(key, None)
+
+    def order(self, key: KeyType) -> int:
+        """Insertion order of the key. Moving a key keeps its order."""
+        return self._order.get(key, -1)
+
+    def keys(self) -> List[KeyType]:
+        return list(self._rects.keys())
+
+    def query(self, point: QPointF, kinds: Iterable[Any]|None=None) -> List[KeyType]:
+        """Return the keys whose rect contains the point.
+
+        kinds (optional): only return keys of the given kinds.
+        """
+        kinds = set(kinds) if kinds is not None else None
+        cell = self._cellAt(point.x(), point.y())
+        candidates = self._grid.get(cell, set()) | self._large
+        result = []
+        for key in candidates:
+            if kinds is not None and self._kinds[key] not in kinds:
+                continue
+            if self._rects[key].contains(point):
+                result.append(key)
+        return result
+
+    def queryRect(self, rect: QRectF, kinds: Iterable[Any]|None=None) -> List[KeyType]:
+        """Return the keys whose rect intersects the given rect."""
+        kinds = set(kinds) if kinds is not None else None
+        candidates = set(self._large)
+        for cell in self._cellsForRect(rect):
+            candidates.update(self._grid.get(cell, ()))
+        result = []
+        for key in candidates:
+            if kinds is not None and self._kinds[key] not in kinds:
+                continue
+            if self._rects[key].intersects(rect):
+                result.append(key)
+        return result
+
+    ## Modification
+    def insert(self, key: KeyType, rect: QRectF, kind: Any=None):
+        assert key is not None, "key must not be None"
+        order = self._order.get(key, None)
+        if key in self._rects:
+            self.remove(key)
+
+        self._order[key] = order if order is not None else next(self._counter)
+        self._rects[key] = QRectF(rect)
+        self._kinds[key] = kind
+
+        (left, top), (right, bottom) = self._cellBounds(rect)
+        if (right - left + 1) * (bottom - top + 1) > self._max_cells:
+            self._large.add(key)
+            self._cells[key] = []
+        else:
+            cells = self._cellsForRect(rect)
+            for cell in cells:
+                self._grid[cell].add(key)
+            self._cells[key] = cells
+
+    def update(self, key: KeyType, rect: QRectF):
+        """Move a key to a new rect, keeping its kind."""
+        if key not in self._rects:
+            return
+        if self._rects[key] == rect:
+            return
+        self.insert(key, rect, self._kinds[key])
+
+    def remove(self, key: KeyType):
+        if key not in self._rects:
+            return
+
+        for cell in self._cells.pop(key):
+            bucket = self._grid[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._grid[cell]
+        self._large.discard(key)
+
+        del self._rects[key]
+        del self._kinds[key]
+        del self._order[key]
+
+    def clear(self):
+        self._grid.clear()
+        self._large.clear()
+        self._rects.clear()
+        self._kinds.clear()
+        self._cells.clear()
+        self._order.clear()
+
+    ## Grid
+    def _cellAt(self, x:float, y:float) -> GridCell:
+        return math.floor(x / self._cell_size), math.floor(y / self._cell_size)
+
+    def _cellBounds(self, rect: QRectF) -> Tuple[GridCell, GridCell]:
+        rect = rect.normalized()
+        return self._cellAt(rect.left(), rect.top()), self._cellAt(rect.right(), rect.bottom())
+
+    def _cellsForRect(self, rect: QRectF) -> List[GridCell]:
+        (left, top), (right, bottom) = self._cellBounds(rect)
+        return [(col, row) for col in range(left, right + 1) for row in range(top, bottom + 1)]
@@ -0,0 +1,91 @@
+from typing import *
+from qtpy.QtGui import *
+from qtpy.QtCore import *
+from qtpy.QtWidgets import *
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+from ..core import GraphDataRole
+from .widget_manager_using_item_data import ItemDataWidgetIndexManager
+
+
+class _IdWidgetKey:
+    """Key attached to a widget: the ID of its row and its column."""
+    __slots__ = ('item', 'kind')
+    def __init__(self, item:Tuple[Hashable, int]|None, kind:Any):
+        self.item = item
+        self.kind = kind
+
+
+class IdWidgetIndexManager(ItemDataWidgetIndexManager):
+    """Handles widgets mapping to model indexes, by the stable ID of their items.
+
+    Unlike ItemDataWidgetIndexManager no QPersistentModelIndex is kept, that Qt would have to
+    update on every row insertion and removal. Widgets are keyed by the GraphDataRole.IdRole
+    of their row and their column, and indexes are only resolved on demand, by `index_from_id`,
+    eg.: GraphController_for_QTreeModel.indexFromId.
+    """
+    def __init__(self, item_id:Callable[[QModelIndex|QPersistentModelIndex], Hashable|None], index_from_id:Callable[[Hashable], QModelIndex]):
+        super().__init__()
+        self._item_id = item_id
+        self._index_from_id = index_from_id
+        self._widgets: Dict[Tuple[Hashable, int], QGraphicsItem] = {}
+        self._keys: Dict[Tuple[Hashable, int], _IdWidgetKey] = {}
+
+    def _itemKey(self, index:QModelIndex|QPersistentModelIndex) -> Tuple[Hashable, int]|None:
+        item_id = self._item_id(index)
+        return (item_id, index.column()) if item_id is not None else None
+
+    def insertWidget(self, index:QModelIndex|QPersistentModelIndex, widget:QGraphicsItem, kind:Any=None):
+        """Insert a widget into the manager.
+        kind (optional): bucket of the widget, read from the GraphDataRole.TypeRole when not given.
+        """
+        assert index.isValid(), f"Cannot insert widget for invalid index: {index}"
+        item = self._itemKey(index)
+        assert item is not None, f"Cannot insert widget for an item without IdRole: {index}"
+        if item in self._widgets:
+            self.removeWidget(index)
+
+        if kind is None:
+            kind = index.data(GraphDataRole.TypeRole)
+        key = _IdWidgetKey(item, kind)
+        widget.setData(self.KeySlot, key)
+        widget._widget_key = key
+        self._widgets[item] = widget
+        self._keys[item] = key
+        self._buckets.setdefault(kind, {})[widget] = None
+
+    def removeWidget(self, index:QModelIndex|QPersistentModelIndex):
+        """Remove a widget from the manager."""
+        item = self._itemKey(index)
+        widget = self._widgets.pop(item)
+        key = self._keys.pop(item)
+        del self._buckets[key.kind][widget]
+        key.item = None
+
+    def getWidget(self, index: QModelIndex|QPersistentModelIndex) -> QGraphicsItem|None:
+        if not index.isValid():
+            if not isinstance(index, QPersistentModelIndex):
+                logger.warning(f"Index is invalid: {index}")
+            return None
+        return self._widgets.get(self._itemKey(index), None)
+
+    def getIndex(self, widget:QGraphicsItem) -> QModelIndex|None:
+        """Get the index of the widget in the model, located by its ID."""
+        key:_IdWidgetKey|None = getattr(widget, '_widget_key', None) or widget.data(self.KeySlot)
+        if key is None or key.item is None:
+            return None
+        item_id, column = key.item
+        index = self._index_from_id(item_id)
+        if not index.isValid():
+            return None
+        return index if column == 0 else index.siblingAtColumn(column)
+
+    def clear(self):
+        for key in self._keys.values():
+            key.item = None
+        self._widgets.clear()
+        self._keys.clear()
+        self._buckets.clear()
@@ -0,0 +1,110 @@
+from typing import *
+from qtpy.QtGui import *
+from qtpy.QtCore import *
+from qtpy.QtWidgets import *
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+from ..core import GraphDataRole
+from . import WidgetIndexManagerProtocol
+
+
+class _WidgetKey:
+    """Key attached to a widget."""
+    __slots__ = ('persistent', 'index', 'kind')
+    def __init__(self, persistent:QPersistentModelIndex, kind:Any):
+        self.persistent = persistent
+        self.index = QModelIndex(persistent)
+        self.kind = kind
+
+
+class ItemDataWidgetIndexManager(WidgetIndexManagerProtocol):
+    """Handles widgets mapping to model indexes.
+
+    The key of each widget is attached to the widget itself, so getIndex is an attribute read
+    instead of a hash lookup. The key is also stored with QGraphicsItem.setData, for items
+    coming back from the scene without their python wrapper. (QGraphicsItem.data converts
+    through QVariant, and is an order of magnitude slower than the attribute.)
+    Widgets are also bucketed by their GraphDataRole.TypeRole, to list the widgets of a kind without
+    going through all of them.
+    """
+    KeySlot = 0x7164 # QGraphicsItem.data key holding the _WidgetKey
+
+    def __init__(self):
+        self._widgets: Dict[QPersistentModelIndex, QGraphicsItem] = {}
+        self._keys: Dict[QPersistentModelIndex, _WidgetKey] = {}
+        self._buckets: Dict[Any, Dict[QGraphicsItem, None]] = {}
+
+    def insertWidget(self, index:QModelIndex|QPersistentModelIndex, widget:QGraphicsItem, kind:Any=None):
+        """Insert a widget into the manager.
+        kind (optional): bucket of the widget, read from the GraphDataRole.TypeRole when not given.
+        """
+        assert index.isValid(), f"Cannot insert widget for invalid index: {index}"
+        persistent = QPersistentModelIndex(index)
+        if persistent in self._widgets:
+            self.removeWidget(persistent)
+
+        if kind is None:
+            kind = index.data(GraphDataRole.TypeRole)
+        key = _WidgetKey(persistent, kind)
+        widget.setData(self.KeySlot, key)
+        widget._widget_key = key
+        self._widgets[persistent] = widget
+        self._keys[persistent] = key
+        self._buckets.setdefault(kind, {})[widget] = None
+
+    def removeWidget(self, index:QModelIndex|QPersistentModelIndex):
+        """Remove a widget from the manager."""
+        persistent = QPersistentModelIndex(index)
+        widget = self._widgets.pop(persistent)
+        key = self._keys.pop(persistent)
+        del self._buckets[key.kind][widget]
+        # the widget might be deleted already, detach the key instead of touching the widget
+        key.persistent = QPersistentModelIndex()
+
+    def getWidget(self, index: QModelIndex|QPersistentModelIndex) -> QGraphicsItem|None:
+        if isinstance(index, QPersistentModelIndex):
+            return self._widgets.get(index, None)
+        if not index.isValid():
+            logger.warning(f"Index is invalid: {index}")
+            return None
+        return self._widgets.get(QPersistentModelIndex(index), None)
+
+    def getIndex(self, widget:QGraphicsItem) -> QModelIndex|None:
+        """
+        Get the index of the widget in the model.
+        The QModelIndex is cached on the key, and only rebuilt after its row moved.
+        """
+        key:_WidgetKey|None = getattr(widget, '_widget_key', None) or widget.data(self.KeySlot)
+        if key is None:
+            return None
+        if key.index != key.persistent:
+            if not key.persistent.isValid():
+                return None
+            key.index = QModelIndex(key.persistent)
+        return key.index
+
+    def kind(self, widget:QGraphicsItem) -> Any:
+        """The bucket the widget was inserted in."""
+        key:_WidgetKey|None = getattr(widget, '_widget_key', None) or widget.data(self.KeySlot)
+        return key.kind if key is not None else None
+
+    def widgets(self, kind:Any=None) -> List[QGraphicsItem]:
+        """All widgets, or only the widgets of the given kind."""
+        if kind is None:
+            return list(self._widgets.values())
+        return list(self._buckets.get(kind, ()))
+
+    def widgetCount(self, kind:Any=None) -> int:
+        if kind is None:
+            return len(self._widgets)
+        return len(self._buckets.get(kind, ()))
+
+    def clear(self):
+        for key in self._keys.values():
+            key.persistent = QPersistentModelIndex()
+        self._widgets.clear()
+        self._keys.clear()
+        self._buckets.clear()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, ABCMeta, abstractmethod
-from typing import Literal, TypeVar, Generic, List, Tuple, Any
+from typing import Literal, TypeVar, Generic, List, Tuple, Any, Iterable
 
 from qtpy.QtGui import *
 from qtpy.QtCore import *
@@ -154,7 +154,7 @@ class AbstractGraphModel(QObject):
         return self.createAttributeRef(name, parent_ptr)
     
     ## CREATE
-    ## # TODO: IMPLEMENT Adding and REMOVING multiple items at once
+    ## # TODO: IMPLEMENT REMOVING multiple items at once
     def addNode(self, name:NodeName|None=None)->NodeRef|None:
         """
         Add a new node to the graph.
@@ -187,6 +187,38 @@ class AbstractGraphModel(QObject):
         """
         return None
 
+    def addNodes(self, names:Iterable[NodeName|None])->List[NodeRef]:
+        """
+        Add multiple nodes to the graph.
+        Base implementation calls addNode for each name.
+        Override in subclass to insert them at once.
+        """
+        return [node for name in names if (node := self.addNode(name)) is not None]
+
+    def addInlets(self, node:NodeRef, names:Iterable[InletName|None])->List[InletRef]:
+        """
+        Add multiple inlets to the specified node.
+        Base implementation calls addInlet for each name.
+        Override in subclass to insert them at once.
+        """
+        return [inlet for name in names if (inlet := self.addInlet(node, name)) is not None]
+
+    def addOutlets(self, node:NodeRef, names:Iterable[OutletName|None])->List[OutletRef]:
+        """
+        Add multiple outlets to the specified node.
+        Base implementation calls addOutlet for each name.
+        Override in subclass to insert them at once.
+        """
+        return [outlet for name in names if (outlet := self.addOutlet(node, name)) is not None]
+
+    def addLinks(self, links:Iterable[Tuple[OutletRef, InletRef]])->List[LinkRef]:
+        """
+        Add multiple links between (outlet, inlet) pairs.
+        Base implementation calls addLink for each pair.
+        Override in subclass to insert them at once.
+        """
+        return [link for outlet, inlet in links if (link := self.addLink(outlet, inlet)) is not None]
+
     ## DELETE
     def removeNode(self, node:NodeRef)->bool:
         """
@@ -141,6 +141,101 @@ class NXGraphModel(AbstractGraphModel):
         self.linksInserted.emit([link])
         return link
 
+    def addNodes(self, names:Iterable[str|None])->List[NodeRef]:
+        """Add multiple nodes, emitting nodesInserted once."""
+        taken = set(self.graph.nodes)
+        new_names = []
+        for name in self._uniqueNames(names, "node", taken):
+            if name in taken:
+                logger.error(f"Cannot add node '{name}': node name already exists. Node names must be unique.")
+                continue
+            taken.add(name)
+            new_names.append(name)
+
+        self.graph.add_nodes_from(new_names)
+        for name in new_names:
+            self.graph.nodes[name]['inlets']     = defaultdict(dict)
+            self.graph.nodes[name]['outlets']    = defaultdict(dict)
+            self.graph.nodes[name]['attributes'] = dict()
+
+        nodes = [self.createNodeRef(name) for name in new_names]
+        if nodes:
+            self.nodesInserted.emit(nodes)
+        return nodes
+
+    def addInlets(self, node:NodeRef, names:Iterable[str|None])->List[InletRef]:
+        """Add multiple inlets to the node, emitting inletsInserted once."""
+        inlets = [self.createInletRef(name, node.name()) for name in self._addPorts(node, names, 'inlets', "in")]
+        if inlets:
+            self.inletsInserted.emit(inlets)
+        return inlets
+
+    def addOutlets(self, node:NodeRef, names:Iterable[str|None])->List[OutletRef]:
+        """Add multiple outlets to the node, emitting outletsInserted once."""
+        outlets = [self.createOutletRef(name, node.name()) for name in self._addPorts(node, names, 'outlets', "out")]
+        if outlets:
+            self.outletsInserted.emit(outlets)
+        return outlets
+
+    def _addPorts(self, node:NodeRef, names:Iterable[str|None], kind:Literal['inlets', 'outlets'], prefix:str)->List[str]:
+        node_name = node.name()
+        if node_name not in self.graph.nodes:
+            logger.error(f"Node {node_name} does not exist in the graph.")
+            return []
+
+        ports = self.graph.nodes[node_name].setdefault(kind, defaultdict(dict))
+        new_names = []
+        for name in self._uniqueNames(names, prefix, ports):
+            if name in ports:
+                logger.error(f"Cannot add port '{name}': name already exists in node '{node_name}'. Port names must be unique per node.")
+                continue
+            ports[name] = dict()
+            new_names.append(name)
+        return new_names
+
+    @staticmethod
+    def _uniqueNames(names:Iterable[str|None], prefix:str, taken:Container[str])->Generator[str, None, None]:
+        """Fill in the missing names, like make_unique_name, without rescanning the taken names for each one."""
+        digit = 1
+        generated = set()
+        for name in names:
+            if not name:
+                name = prefix
+                while name in taken or name in generated:
+                    name = f"{prefix}{digit}"
+                    digit += 1
+                generated.add(name)
+            yield name
+
+    def addLinks(self, links:Iterable[Tuple[OutletRef, InletRef]])->List[LinkRef]:
+        """Add multiple edges from outlets to inlets, emitting linksInserted once."""
+        edges = []
+        new_links = []
+        for outlet, inlet in links:
+            source_node, outlet_name = outlet.ptr(), outlet.name()
+            target_node, inlet_name = inlet.ptr(), inlet.name()
+            if source_node not in self.graph.nodes or target_node not in self.graph.nodes:
+                logger.error(f"Cannot link {outlet_name} to {inlet_name}: node does not exist in the graph.")
+                continue
+            if outlet_name not in self.graph.nodes[source_node].get('outlets', []):
+                logger.error(f"Outlet {outlet_name} does not exist in node {source_node}.")
+                continue
+            if inlet_name not in self.graph.nodes[target_node].get('inlets', []):
+                logger.error(f"Inlet {inlet_name} does not exist in node {target_node}.")
+                continue
+
+            edge = (source_node, target_node, (outlet_name, inlet_name))
+            if self.graph.has_edge(*edge) or edge in edges:
+                logger.error(f"Link from outlet {outlet_name} to inlet {inlet_name} already exists.")
+                continue
+            edges.append(edge)
+            new_links.append(self.createLinkRef( (outlet, inlet) ))
+
+        self.graph.add_edges_from(edges)
+        if new_links:
+            self.linksInserted.emit(new_links)
+        return new_links
+
     # DATA
     def setData(self, attribute_ref:AttributeRef, value:Any, role:int=Qt.ItemDataRole.DisplayRole) -> bool:
         attr_name = attribute_ref.name()
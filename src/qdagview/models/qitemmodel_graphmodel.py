@@ -602,6 +602,87 @@ class QItemModelGraphModel(AbstractGraphModel):
             
         return None
 
+    def addNodes(self, count:int, subgraph:QModelIndex|QPersistentModelIndex=QModelIndex())->List[QPersistentModelIndex]:
+        """Add `count` nodes with a single insertRows call."""
+        if count <= 0:
+            return []
+        position = self._source_model.rowCount(subgraph)
+        if self._source_model.insertRows(position, count, subgraph):
+            return [QPersistentModelIndex(self._source_model.index(row, 0, subgraph)) for row in range(position, position + count)]
+        return []
+
+    def addInlets(self, node:QModelIndex|QPersistentModelIndex, count:int)->List[QPersistentModelIndex]:
+        """Add `count` inlets to the node with a single insertRows call."""
+        assert node.isValid(), "Node index must be valid"
+        assert self.itemType(node) == GraphItemType.NODE, "Node index must be of type NODE"
+        # by default node children are inlets. dont need to set GraphItemType.INLET explicitly
+        return self._insertNamedRows(QModelIndex(node), count, "in")
+
+    def addOutlets(self, node:QModelIndex|QPersistentModelIndex, count:int)->List[QPersistentModelIndex]:
+        """Add `count` outlets to the node with a single insertRows call."""
+        assert node.isValid(), "Node index must be valid"
+        assert self.itemType(node) == GraphItemType.NODE, "Node index must be of type NODE"
+        outlets = self._insertNamedRows(QModelIndex(node), count, "out")
+        for outlet in outlets:
+            success = self._source_model.setData(QModelIndex(outlet), GraphItemType.OUTLET, GraphDataRole.TypeRole)
+            assert success, "Failed to set data for the new child item"
+        return outlets
+
+    def _insertNamedRows(self, parent:QModelIndex, count:int, prefix:str)->List[QPersistentModelIndex]:
+        if count <= 0:
+            return []
+        if self._source_model.columnCount(parent) == 0:
+            # Make sure the parent has at least one column for children, otherwise the treeview won't show them
+            self._source_model.insertColumns(0, 1, parent)
+
+        position = self._source_model.rowCount(parent)
+        if not self._source_model.insertRows(position, count, parent):
+            return []
+        new_indexes = []
+        for row in range(position, position + count):
+            new_index = self._source_model.index(row, 0, parent)
+            assert new_index.isValid(), "Created index is not valid"
+            success = self._source_model.setData(new_index, f"{prefix}#{row + 1}", Qt.ItemDataRole.DisplayRole)
+            assert success, "Failed to set data for the new child item"
+            new_indexes.append(QPersistentModelIndex(new_index))
+        return new_indexes
+
+    def addLinks(self, links:Iterable[Tuple[QModelIndex|QPersistentModelIndex, QModelIndex|QPersistentModelIndex]])->List[QPersistentModelIndex|None]:
+        """Add links between (outlet, inlet) pairs.
+
+        The links of each inlet are inserted with a single insertRows call.
+        Returns the new links in the order of the pairs, None where the insertion failed.
+        """
+        assert self._source_model is not None, "Source model must be set before adding child items"
+        links = list(links)
+        outlets_by_inlet: Dict[QPersistentModelIndex, List[Tuple[int, QPersistentModelIndex]]] = defaultdict(list)
+        for i, (outlet, inlet) in enumerate(links):
+            assert outlet.isValid(), "Outlet must be a valid"
+            assert self.itemType(outlet) == GraphItemType.OUTLET, "Outlet index must be of type OUTLET"
+            assert inlet.isValid(), "Inlet must be a valid"
+            assert self.itemType(inlet) == GraphItemType.INLET, "Inlet index must be of type INLET"
+            outlets_by_inlet[QPersistentModelIndex(inlet)].append( (i, QPersistentModelIndex(outlet)) )
+
+        new_links: List[QPersistentModelIndex|None] = [None] * len(links)
+        for inlet, outlets in outlets_by_inlet.items():
+            inlet = QModelIndex(inlet)
+            if self._source_model.columnCount(inlet) == 0:
+                self._source_model.insertColumns(0, 1, inlet)
+            position = self._source_model.rowCount(inlet)
+            if not self._source_model.insertRows(position, len(outlets), inlet):
+                continue
+
+            # keep persistent indexes, setting the source may reorder the links
+            link_indexes = [QPersistentModelIndex(self._source_model.index(row, 0, inlet)) for row in range(position, position + len(outlets))]
+            for link_index, (i, outlet) in zip(link_indexes, outlets):
+                if not self._source_model.setData(QModelIndex(link_index), outlet, role=GraphDataRole.SourceRole):
+                    logger.warning(f"Failed to set source for new link: {outlet}")
+                new_link_name = f"{'Link'}#{link_index.row() + 1}"
+                if not self._source_model.setData(QModelIndex(link_index), new_link_name, role=Qt.ItemDataRole.DisplayRole):
+                    logger.warning(f"Failed to set 'name' data for new link: {new_link_name}")
+                new_links[i] = link_index
+        return new_links
+
     ## UPDATE
     def setLinkSource(self, link:QModelIndex|QPersistentModelIndex, source:QModelIndex|QPersistentModelIndex)->bool:
         """
@@ -13,7 +13,7 @@ from qtpy.QtWidgets import *
 
 from .payload import Payload
 from ..widgets.link_widget import LinkWidget
-from ..utils import makeLineBetweenShapes
+from ..utils import batchLinesBetweenShapes
 from ..core import GraphItemType 
 
 
@@ -88,10 +88,9 @@ class LinkingTool:
                     source_index = self._controller.linkSource(link_index)
                     target_index = self._controller.linkTarget(link_index)
                     if source_index and source_index.isValid() and target_index and target_index.isValid():
-                        link_widget = cast(LinkWidget, self._view._widget_manager.getWidget(link_index))
-                        local_pos = link_widget.mapFromScene(scene_pos)  # Ensure scene_pos is in the correct coordinate system
-                        tail_distance = (local_pos-link_widget.line().p1()).manhattanLength()
-                        head_distance = (local_pos-link_widget.line().p2()).manhattanLength()
+                        line = self._view.linkLine(link_index)
+                        tail_distance = (scene_pos-line.p1()).manhattanLength()
+                        head_distance = (scene_pos-line.p2()).manhattanLength()
 
                         if head_distance < tail_distance:
                             return 'head'  # Drag the head if closer to the mouse position
@@ -108,6 +107,10 @@ class LinkingTool:
                         return 'tail'
                 
                 link_end = getClosestLinkEnd(index, scene_pos) if scene_pos else 'tail' # Default to tail if scene_pos is not provided
+                if not self._view._widget_manager.getWidget(index) and not self._draft_link:
+                    # links of the link layer have no widget to drag, drag a draft link instead
+                    self._draft_link = LinkWidget()
+                    self._view.scene().addItem(self._draft_link)
 
                 self._linking_payload = Payload(index, kind=link_end)
                 self._is_active = True
@@ -127,7 +130,7 @@ class LinkingTool:
         
         # Determine the source and target types
         payload = self._linking_payload
-        target_index = self._view.rowAt(pos)  # Ensure the index is updated
+        target_index = self._view.itemAt(self._view.mapToScene(pos), kinds={GraphItemType.INLET, GraphItemType.OUTLET})
         if target_index:
             drop_target_type = self._controller.itemType(target_index)
         else:
@@ -189,22 +192,22 @@ class LinkingTool:
                 return None
 
 
-        link_widget = self._view._widget_manager.getWidget(link_index) if link_index else self._draft_link
+        link_widget = (self._view._widget_manager.getWidget(link_index) if link_index else None) or self._draft_link
 
         if outlet_index and inlet_index and self._controller.canLink(outlet_index, inlet_index):
             outlet_widget = self._view._widget_manager.getWidget(outlet_index)
             inlet_widget = self._view._widget_manager.getWidget(inlet_index)
-            line = makeLineBetweenShapes(outlet_widget, inlet_widget)
+            line = batchLinesBetweenShapes([outlet_widget], [inlet_widget])[0]
             line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
 
         elif outlet_index:
             outlet_widget = self._view._widget_manager.getWidget(outlet_index)
-            line = makeLineBetweenShapes(outlet_widget, self._view.mapToScene(pos))
+            line = batchLinesBetweenShapes([outlet_widget], [self._view.mapToScene(pos)])[0]
             line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
 
         elif inlet_index:
             inlet_widget = self._view._widget_manager.getWidget(inlet_index)
-            line = makeLineBetweenShapes(self._view.mapToScene(pos), inlet_widget)
+            line = batchLinesBetweenShapes([self._view.mapToScene(pos)], [inlet_widget])[0]
             line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
 
         link_widget.setLine(line)
@@ -300,7 +303,7 @@ class LinkingTool:
         """
         if self._is_active:
 
-            if self._controller.itemType(self._linking_payload.index) == GraphItemType.LINK:
+            if self._controller.itemType(self._linking_payload.index) == GraphItemType.LINK and not self._draft_link:
                 link_widget = cast(LinkWidget, self._view._widget_manager.getWidget(self._linking_payload.index))
                 assert link_widget is not None, "Link widget must not be None"
                 source_widget = self._view._link_manager.getLinkSource(link_widget)
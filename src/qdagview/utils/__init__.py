@@ -6,6 +6,10 @@ from typing import Iterable, List, Callable
 # Import geometry utilities
 from .geo import (
     makeLineBetweenShapes, 
+    batchLinesBetweenShapes,
+    ShapeKind,
+    ShapeDescriptor,
+    shapeDescriptor,
     makeLineToShape, 
     makeArrowShape, 
     getShapeCenter,
@@ -111,6 +115,10 @@ __all__ = [
 
     # Geometry utilities  
     'makeLineBetweenShapes',
+    'batchLinesBetweenShapes',
+    'ShapeKind',
+    'ShapeDescriptor',
+    'shapeDescriptor',
     'makeLineToShape', 
     'makeArrowShape',
     'makeVerticalRoundedPath',
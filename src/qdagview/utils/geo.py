@@ -373,6 +373,153 @@ def makeArrowShape(line:QLineF, width=1.0):
 
     return path
 
+## Batch link geometry
+from enum import IntEnum
+from functools import cache
+from typing import NamedTuple, Sequence
+import numpy as np
+
+
+class ShapeKind(IntEnum):
+    POINT = 0
+    RECT = 1
+    ROUNDED_RECT = 2
+    ELLIPSE = 3
+
+
+class ShapeDescriptor(NamedTuple):
+    """Analytic shape in scene coordinates, given by its center and half extents."""
+    kind: ShapeKind
+    cx: float
+    cy: float
+    half_width: float = 0.0
+    half_height: float = 0.0
+    radius: float = 0.0 # corner radius of ROUNDED_RECT
+
+    @classmethod
+    def fromRect(cls, rect:QRectF, kind:ShapeKind=ShapeKind.RECT, radius:float=0.0) -> 'ShapeDescriptor':
+        center = rect.center()
+        return cls(kind, center.x(), center.y(), rect.width()/2, rect.height()/2, radius)
+
+
+@cache
+def _shapeIsBoundingRect(item_type:type) -> bool:
+    """True if the item type does not override QGraphicsItem.shape(), so its shape is its bounding rect."""
+    owner = next(cls for cls in item_type.__mro__ if 'shape' in cls.__dict__)
+    return owner is QGraphicsItem
+
+
+def shapeDescriptor(shape: QPointF | QRectF | QPainterPath | QGraphicsItem | ShapeDescriptor) -> ShapeDescriptor | None:
+    """
+    Describe the shape analytically, if possible.
+    Returns None for arbitrary shapes, that need the path based routines.
+    """
+    match shape:
+        case ShapeDescriptor():
+            return shape
+        case QPointF():
+            return ShapeDescriptor(ShapeKind.POINT, shape.x(), shape.y())
+        case QRectF():
+            return ShapeDescriptor.fromRect(shape.normalized())
+        case QGraphicsItem():
+            if _shapeIsBoundingRect(type(shape)) and shape.sceneTransform().type().value <= QTransform.TransformationType.TxScale.value:
+                return ShapeDescriptor.fromRect(shape.sceneBoundingRect())
+            return None
+        case _:
+            return None
+
+
+def _batchBoundaryPoints(shapes:np.ndarray, origins:np.ndarray) -> np.ndarray:
+    """
+    For each shape, the point where the ray from its center towards the origin leaves the shape.
+    shapes: (N, 6) array of ShapeDescriptor fields
+    origins: (N, 2) array of points
+    Falls back to the center when the origin is the center or lies inside the shape.
+    """
+    kind = shapes[:, 0]
+    center = shapes[:, 1:3]
+    half = shapes[:, 3:5]
+    radius = np.minimum(shapes[:, 5], half.min(axis=1))
+
+    e = origins - center
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # rect: scale the direction until it touches a side
+        rect_scale = np.abs(e) / half
+        rect_scale = np.where(np.isnan(rect_scale), 0.0, rect_scale)
+        rect_u = 1.0 / rect_scale.max(axis=1)
+
+        # ellipse
+        ellipse_u = 1.0 / np.sqrt(np.square(rect_scale).sum(axis=1))
+
+        # rounded rect: the rect hit point, unless it falls into a rounded corner
+        hit = e * rect_u[:, None]
+        inner = half - radius[:, None]
+        in_corner = (np.abs(hit) > inner).all(axis=1) & (radius > 0)
+        corner = np.sign(e) * inner
+        ee = np.square(e).sum(axis=1)
+        ek = (e * corner).sum(axis=1)
+        kk = np.square(corner).sum(axis=1)
+        corner_u = (ek + np.sqrt(np.maximum(ek*ek - ee*(kk - radius*radius), 0.0))) / ee
+        rounded_u = np.where(in_corner, corner_u, rect_u)
+
+    u = np.select(
+        [kind == ShapeKind.RECT, kind == ShapeKind.ROUNDED_RECT, kind == ShapeKind.ELLIPSE],
+        [rect_u, rounded_u, ellipse_u],
+        default=0.0
+    )
+    u = np.where(np.isfinite(u) & (u < 1.0), u, 0.0)
+    return center + e * u[:, None]
+
+
+def batchLinesBetweenShapes(
+    sources: Sequence[QPointF | QRectF | QPainterPath | QGraphicsItem | ShapeDescriptor],
+    targets: Sequence[QPointF | QRectF | QPainterPath | QGraphicsItem | ShapeDescriptor],
+    distance:float=10
+) -> List[QLineF]:
+    """
+    Same as makeLineBetweenShapes for many pairs of shapes at once.
+    Pairs of analytic shapes (points, rects, rounded rects, ellipses) are computed with NumPy in one pass,
+    other pairs fall back to makeLineBetweenShapes.
+    """
+    assert len(sources) == len(targets), "sources and targets must have the same length"
+    lines: List[QLineF|None] = [None] * len(sources)
+
+    analytic_rows = []
+    source_shapes = []
+    target_shapes = []
+    for row, (A, B) in enumerate(zip(sources, targets)):
+        a, b = shapeDescriptor(A), shapeDescriptor(B)
+        if a is None or b is None:
+            lines[row] = makeLineBetweenShapes(A, B, distance)
+        else:
+            analytic_rows.append(row)
+            source_shapes.append(a)
+            target_shapes.append(b)
+
+    if analytic_rows:
+        A = np.array(source_shapes, dtype=float).reshape(-1, 6)
+        B = np.array(target_shapes, dtype=float).reshape(-1, 6)
+        I1 = _batchBoundaryPoints(A, B[:, 1:3])
+        I2 = _batchBoundaryPoints(B, A[:, 1:3])
+
+        # offset both ends by distance, like makeLineBetweenShapes does with QLineF
+        V = I2 - I1
+        length = np.sqrt(np.square(V).sum(axis=1))
+        degenerate = length <= 0.0001
+        with np.errstate(divide='ignore', invalid='ignore'):
+            P1 = I1 + V * (distance / length)[:, None]
+            remaining = np.abs(length - distance)
+            scale = np.where(remaining > 0, (1 - distance/length) * (length - 2*distance) / remaining, 0.0)
+            P2 = P1 + V * scale[:, None]
+        P1 = np.where(degenerate[:, None], I1, P1)
+        P2 = np.where(degenerate[:, None], I1, P2)
+
+        for row, (x1, y1), (x2, y2) in zip(analytic_rows, P1.tolist(), P2.tolist()):
+            lines[row] = QLineF(x1, y1, x2, y2)
+
+    return lines
+
+
 from typing import Tuple
 import math
 
@@ -17,6 +17,8 @@ logger = logging.getLogger(__name__)
 from typing import *
 from enum import Enum
 from dataclasses import dataclass
+import time
+from contextlib import contextmanager
 
 from qtpy.QtGui import *
 from qtpy.QtCore import *
@@ -27,15 +29,17 @@ import networkx as nx
 from ..core import GraphDataRole, GraphItemType, GraphMimeType, indexToPath, indexFromPath
 from ..utils import group_consecutive_numbers
 from ..utils import makeLineBetweenShapes, makeLineToShape, makeArrowShape, getShapeCenter
+from ..utils import batchLinesBetweenShapes
 from ..utils import bfs
 
 from ..tools.linking_tool import LinkingTool
 
-from ..managers import PersistentWidgetIndexManager
+from ..managers import ItemDataWidgetIndexManager, IdWidgetIndexManager
 from ..managers import LinkingManager
+from ..managers import SpatialIndex
 
 from ..widgets import (
-    NodeWidget, PortWidget, LinkWidget, CellWidget
+    NodeWidget, PortWidget, LinkWidget, CellWidget, LinkLayer
 )
 class InletWidget(PortWidget):
     pass
@@ -43,7 +47,17 @@ class InletWidget(PortWidget):
 class OutletWidget(PortWidget):
     pass
 
-from ..delegates.graphview_delegate import GraphDelegate
+@dataclass
+class NodeRecord:
+    """Lightweight stand-in for a node that has no widget in the scene."""
+    index: QPersistentModelIndex
+    pos: QPointF
+    bounds: QRectF # local bounds of the node including its ports and cells
+
+    def sceneRect(self) -> QRectF:
+        return self.bounds.translated(self.pos)
+
+from ..delegates.graphview_delegate import GraphDelegate, DetailLevel
 from ..controllers import GraphController_for_QTreeModel
 # from .factories.widget_factory import WidgetFactory
 from ..factories.widgetfactory_using_delegate import WidgetFactoryUsingDelegate
@@ -82,12 +96,51 @@ class QItemModel_GraphView(QGraphicsView):
         self._factory = WidgetFactoryUsingDelegate()
         self._factory.portPositionChanged.connect(self.handlePortPositionChanged)
 
+        # Link geometry is recomputed once per frame for the ports moved since the last one
+        self._dirty_ports: Set[Hashable] = set() # by their _itemKey()
+        self._link_update_scheduled = False
+        self._synchronous_link_updates = False
+
+        # Node widgets arrange their ports and cells once, after a whole batch of insertions and removals
+        self._pending_layouts: Dict[NodeWidget, None] = {}
+        self._layout_depth = 0
+
+        # Throttled mode: changed attributes are delivered to visible cells at most once per frame
+        self._throttled_cell_updates = False
+        self._max_cell_update_rate = 60.0 # updates per second
+        self._dirty_cells: Set[QPersistentModelIndex] = set()
+        self._cell_update_scheduled = False
+        self._last_cell_update = 0.0
+        self._cell_update_area = QRectF() # visible scene rect at the last update
+
         ## State of the graph view
         self._linking_tool = LinkingTool(self, self._controller)
+        self._pressed_layer_link: Tuple[QPersistentModelIndex, QPointF, QPoint]|None = None # link, scene and view press position
 
         # Widget Manager
-        self._widget_manager = PersistentWidgetIndexManager()
-        self._cell_manager = PersistentWidgetIndexManager()
+        self._widget_manager = ItemDataWidgetIndexManager()
+        self._cell_manager = ItemDataWidgetIndexManager()
+
+        # Hit-test indexes over the scene bounds of the widgets
+        self._hit_index = SpatialIndex[QGraphicsItem]()
+        self._cell_hit_index = SpatialIndex[QGraphicsItem]()
+
+        # Virtualization: when enabled only nodes near the viewport get widgets
+        self._virtualized = False
+        self._virtualization_margin = 200.0
+        self._node_records: Dict[QPersistentModelIndex, NodeRecord] = {}
+        self._node_record_index = SpatialIndex[QPersistentModelIndex]()
+        self._materialized_nodes: Set[QPersistentModelIndex] = set()
+        self._materialized_area = QRectF()
+        self._materialize_scheduled = False
+        self._default_node_bounds = NodeWidget().boundingRect() # for nodes that never had a widget
+
+        # Link layer: when set, links are drawn by the layer instead of a widget each
+        self._link_layer: LinkLayer | None = None
+
+        # Level of detail: what the widgets draw, from the zoom of the view
+        self._detail_level = DetailLevel.Full
+        self._full_detail_hints = QPainter.RenderHint(0) # antialiasing hints turned off below DetailLevel.Shapes
 
         # setup the view
         self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
@@ -105,86 +158,505 @@ class QItemModel_GraphView(QGraphicsView):
         
     def setModel(self, model:QAbstractItemModel):
         self._item_model = model
-        self._controller.setSourceModel(model)
-        
-        # populate initial scene
+
         ## clear
         scene = self.scene()
         assert scene
+        if self._link_layer is not None:
+            self._link_layer.clear()
         scene.clear()
         self._widget_manager.clear()
         self._cell_manager.clear()
+        self._factory.invalidateViewOptions()
+        self._hit_index.clear()
+        self._cell_hit_index.clear()
+        self._node_records.clear()
+        self._node_record_index.clear()
+        self._materialized_nodes.clear()
+        self._materialized_area = QRectF()
+
+        # populate initial scene
+        # (the controller emits the existing rows as inserted)
+        self._controller.setSourceModel(model)
 
     def model(self) -> QAbstractItemModel | None:
         return self._item_model
+
+    ## Stable IDs
+    def setStableIdsEnabled(self, enabled:bool):
+        """
+        Key the widgets, the cells and the port widgets by the GraphDataRole.IdRole of their items,
+        instead of a QPersistentModelIndex each, see GraphController_for_QTreeModel.setStableIdsEnabled.
+        Indexes are resolved on demand by the controller. The widgets are rebuilt.
+        """
+        if enabled == self.hasStableIds():
+            return
+        model = self._item_model
+        self.setModel(None)
+        self._controller.setStableIdsEnabled(enabled)
+        if enabled:
+            self._widget_manager = IdWidgetIndexManager(self._controller.itemId, self._controller.indexFromId)
+            self._cell_manager = IdWidgetIndexManager(self._controller.itemId, self._controller.indexFromId)
+        else:
+            self._widget_manager = ItemDataWidgetIndexManager()
+            self._cell_manager = ItemDataWidgetIndexManager()
+        self.setModel(model)
+
+    def hasStableIds(self) -> bool:
+        return self._controller.hasStableIds()
+
+    def _itemKey(self, index:QModelIndex|QPersistentModelIndex) -> Hashable:
+        """What the widgets keep of their index: its ID with stable IDs, a QPersistentModelIndex otherwise."""
+        if self._controller.hasStableIds():
+            return self._controller.itemId(index)
+        return QPersistentModelIndex(index)
+
+    def _indexFromKey(self, key:Hashable) -> QModelIndex|QPersistentModelIndex:
+        if isinstance(key, QPersistentModelIndex):
+            return key
+        return self._controller.indexFromId(key)
     
     ## Index lookup
+    def itemAt(self, scene_pos:QPointF, kinds:Iterable[GraphItemType]|None=None) -> QModelIndex|None:
+        """
+        Find the index of the top-most graph item at the given scene position.
+        kinds (optional): only consider items of the given GraphItemTypes, eg.: {INLET, OUTLET}
+        """
+        widget = self._topmostWidgetAt(self._hit_index, scene_pos, kinds)
+        if widget:
+            return self._widget_manager.getIndex(widget)
+        return self._layerLinkAt(scene_pos, 0.0, kinds)
+
     def rowAt(self, point:QPoint, filter_type:GraphItemType|None=None) -> QPersistentModelIndex|None:
-        all_widgets = set(self._widget_manager.widgets())
-        for item in self.items(point):
-            if item in all_widgets:
-                index = self._widget_manager.getIndex(item)
-                if filter_type is None:
-                    return index
-                else:
-                    if self._controller.itemType(index) == filter_type:
-                        return index
-        return None
+        kinds = {filter_type} if filter_type is not None else None
+        area = self._pixelArea(point)
+        widget = self._topmostWidgetAt(self._hit_index, area, kinds)
+        if widget:
+            return self._widget_manager.getIndex(widget)
+        bounds = area.boundingRect()
+        return self._layerLinkAt(bounds.center(), max(bounds.width(), bounds.height()) / 2, kinds)
+
+    def _layerLinkAt(self, scene_pos:QPointF, extra_tolerance:float, kinds:Iterable[GraphItemType]|None=None) -> QModelIndex|None:
+        """The link of the link layer at the scene position. Links are below the widgets."""
+        if self._link_layer is None or (kinds is not None and GraphItemType.LINK not in kinds):
+            return None
+        link_index = self._link_layer.linkAt(scene_pos, self._link_layer.hitTolerance() + extra_tolerance)
+        return QModelIndex(link_index) if link_index is not None and link_index.isValid() else None
     
     def attributeAt(self, point:QPoint) -> QPersistentModelIndex|None:
         """
         Find the index at the given position.
         point is in untransformed viewport coordinates, just like QMouseEvent::pos().
         """
-        all_cells = set(self._cell_manager.widgets())
-        for item in self.items(point):
-            if item in all_cells:
-                return self._cell_manager.getIndex(item)
+        widget = self._topmostWidgetAt(self._cell_hit_index, self._pixelArea(point))
+        return self._cell_manager.getIndex(widget) if widget else None
+
+    def _pixelArea(self, point:QPoint) -> QPolygonF:
+        """The scene area covered by a viewport pixel, just like QGraphicsView.items(QPoint) uses."""
+        return self.mapToScene(QRect(point.x(), point.y(), 1, 1))
+
+    def _topmostWidgetAt(self, hit_index:SpatialIndex, scene_area:QPointF|QPolygonF, kinds:Iterable|None=None) -> QGraphicsItem|None:
+        if self._dirty_ports:
+            self.flushLinkUpdates() # hit-test against the current link geometry
+
+        match scene_area:
+            case QPointF():
+                candidates = hit_index.query(scene_area, kinds)
+                def isHit(widget:QGraphicsItem) -> bool:
+                    return widget.contains(widget.mapFromScene(scene_area))
+            case QPolygonF():
+                candidates = hit_index.queryRect(scene_area.boundingRect(), kinds)
+                area_path = QPainterPath()
+                area_path.addPolygon(scene_area)
+                def isHit(widget:QGraphicsItem) -> bool:
+                    return widget.collidesWithPath(widget.mapFromScene(area_path))
+            case _:
+                raise TypeError(f"scene_area must be a QPointF or QPolygonF, got: {scene_area}")
+
+        hits = [widget for widget in candidates if widget.isVisible() and isHit(widget)]
+        if not hits:
+            return None
+
+        def stackingOrder(widget:QGraphicsItem) -> List[Tuple[float, int]]:
+            # mimic the scene's stacking order: siblings are sorted by z-value then insertion order,
+            # and children are drawn above their parents.
+            chain = []
+            item = widget
+            while item:
+                order = self._hit_index.order(item) if item in self._hit_index else self._cell_hit_index.order(item)
+                chain.append((item.zValue(), order))
+                item = item.parentItem()
+            return list(reversed(chain))
+
+        return max(hits, key=stackingOrder)
+
+    def _refreshHitIndex(self, widget:QGraphicsItem):
+        """Update the scene bounds of the widget and its descendants in the hit-test indexes."""
+        stack = [widget]
+        while stack:
+            item = stack.pop()
+            if item in self._hit_index:
+                self._hit_index.update(item, item.sceneBoundingRect())
+            elif item in self._cell_hit_index:
+                self._cell_hit_index.update(item, item.sceneBoundingRect())
+            stack.extend(item.childItems())
+
+    ## Node placement
+    def nodePosition(self, node_index:QModelIndex|QPersistentModelIndex) -> QPointF|None:
+        """Scene position of the node, whether or not it currently has a widget."""
+        if widget := self._widget_manager.getWidget(node_index):
+            return widget.pos()
+        if record := self._node_records.get(QPersistentModelIndex(node_index)):
+            return QPointF(record.pos)
         return None
 
-    def handlePortPositionChanged(self, port_index:QPersistentModelIndex):
-        """Reposition all links connected to the moved port widget."""
-        
+    def setNodePosition(self, node_index:QModelIndex|QPersistentModelIndex, pos:QPointF):
+        """Move the node to the given scene position, whether or not it currently has a widget."""
+        if widget := self._widget_manager.getWidget(node_index):
+            widget.setPos(pos)
+            return
 
-        link_indexes = self._controller.links(port_index)
+        node_index = QPersistentModelIndex(node_index)
+        record = self._node_records.get(node_index)
+        assert record, f"Unknown node: {node_index}"
+        record.pos = QPointF(pos)
+        self._node_record_index.insert(node_index, record.sceneRect(), GraphItemType.NODE)
+        if self._materialized_area.intersects(record.sceneRect()):
+            self._materializeNode(node_index)
 
+    ## Virtualization
+    def setVirtualized(self, enabled:bool, margin:float|None=None):
+        """
+        Only create widgets for the nodes intersecting the viewport (grown by `margin` scene units).
+        Off-screen nodes are kept as NodeRecords (index + cached bounds),
+        and widgets are created and released as the view is panned or zoomed.
+        Links get a widget when both of their nodes have one.
+        """
+        if margin is not None:
+            assert margin >= 0, "margin must not be negative"
+            self._virtualization_margin = margin
 
+        if enabled == self._virtualized:
+            self.updateMaterializedWidgets()
+            return
+
+        if enabled:
+            self._virtualized = True
+            for node_index in self._controller.nodes():
+                node_index = QPersistentModelIndex(node_index)
+                self._addNodeRecord(node_index)
+                if self._widget_manager.getWidget(node_index):
+                    self._materialized_nodes.add(node_index)
+            self._materialized_area = QRectF()
+            self.updateMaterializedWidgets()
+        else:
+            # give every node its widget back
+            for node_index in list(self._node_records.keys()):
+                if node_index not in self._materialized_nodes:
+                    self._materializeNode(node_index)
+            self._virtualized = False
+            self._node_records.clear()
+            self._node_record_index.clear()
+            self._materialized_nodes.clear()
+            self._materialized_area = QRectF()
+
+    def isVirtualized(self) -> bool:
+        return self._virtualized
+
+    def updateMaterializedWidgets(self):
+        """
+        Create widgets for the nodes around the viewport and release the others.
+        Normally scheduled after the viewport changes; call it directly to update synchronously.
+        """
+        self._materialize_scheduled = False
+        if not self._virtualized:
+            return
+
+        margin = self._virtualization_margin
+        area = self.mapToScene(self.viewport().rect()).boundingRect().adjusted(-margin, -margin, margin, margin)
+
+        # widgets may have been moved since they were created
+        for node_index in self._materialized_nodes:
+            self._syncNodeRecord(node_index)
+
+        wanted = set(self._node_record_index.queryRect(area))
+
+        # keep both ends of the links leaving the area, so these links are shown too
+        for node_index in list(wanted):
+            for link_index in self._nodeLinks(node_index):
+                wanted.update(self._linkNodes(link_index))
+
+        scene = self.scene()
+        assert scene
+        with blockingSignals(scene), self._deferringLayouts(): # releasing widgets must not deselect their indexes
+            for node_index in self._materialized_nodes - wanted:
+                self._dematerializeNode(node_index)
+            for node_index in wanted - self._materialized_nodes:
+                self._materializeNode(node_index)
+
+        self._materialized_area = area
+
+    def _scheduleMaterializedWidgetsUpdate(self):
+        if not self._materialize_scheduled:
+            self._materialize_scheduled = True
+            QTimer.singleShot(0, self.updateMaterializedWidgets)
+
+    def _addNodeRecord(self, node_index:QPersistentModelIndex) -> NodeRecord:
+        if widget := self._widget_manager.getWidget(node_index):
+            record = NodeRecord(node_index, widget.pos(), widget.boundingRect() | widget.childrenBoundingRect())
+        else:
+            record = NodeRecord(node_index, QPointF(), QRectF(self._default_node_bounds))
+        self._node_records[node_index] = record
+        self._node_record_index.insert(node_index, record.sceneRect(), GraphItemType.NODE)
+        return record
+
+    def _removeNodeRecord(self, node_index:QPersistentModelIndex):
+        self._node_records.pop(node_index, None)
+        self._node_record_index.remove(node_index)
+        self._materialized_nodes.discard(node_index)
+
+    def _syncNodeRecord(self, node_index:QPersistentModelIndex):
+        """Cache the position and bounds of the node widget on its record."""
+        widget = self._widget_manager.getWidget(node_index)
+        record = self._node_records.get(node_index)
+        if widget and record:
+            record.pos = widget.pos()
+            record.bounds = widget.boundingRect() | widget.childrenBoundingRect()
+            self._node_record_index.update(node_index, record.sceneRect())
+
+    def _nodeLinks(self, node_index:QPersistentModelIndex) -> List[QPersistentModelIndex]:
+        return self._controller.inLinks(node_index) + self._controller.outLinks(node_index)
+
+    def _linkNodes(self, link_index:QPersistentModelIndex) -> List[QPersistentModelIndex]:
+        ports = [self._controller.linkSource(link_index), self._controller.linkTarget(link_index)]
+        return [QPersistentModelIndex(port.parent()) for port in ports if port is not None and port.isValid()]
+
+    def _materializeNode(self, node_index:QPersistentModelIndex):
+        if node_index in self._materialized_nodes:
+            return
+        record = self._node_records[node_index]
+        self._materialized_nodes.add(node_index)
+
+        node_widget = self._addNodeWidgets(node_index)
+        node_widget.setPos(record.pos)
+        if self._selection and self._selection.isSelected(node_index):
+            node_widget.setSelected(True)
+
+        # links to the nodes that already have widgets
+        for link_index in self._nodeLinks(node_index):
+            if not self._hasLinkItem(link_index) and self._canMaterializeLink(link_index):
+                self._addLinkWidgets(link_index)
+
+    def _dematerializeNode(self, node_index:QPersistentModelIndex):
+        if node_index not in self._materialized_nodes:
+            return
+        self._syncNodeRecord(node_index)
+        self._materialized_nodes.discard(node_index)
+
+        self.handleLinksRemoved(self._nodeLinks(node_index))
+        self._removeNodeWidgets(node_index)
+
+    def _canMaterializeLink(self, link_index:QPersistentModelIndex) -> bool:
+        source_index = self._controller.linkSource(link_index)
+        if source_index is not None and not self._widget_manager.getWidget(source_index):
+            return False
+        return self._widget_manager.getWidget(self._controller.linkTarget(link_index)) is not None
+
+    def handlePortPositionChanged(self, port_key:Hashable):
+        """Mark the links of the moved port widget for repositioning. port_key: see _itemKey()"""
+        if isinstance(port_key, QModelIndex):
+            port_key = QPersistentModelIndex(port_key)
+        self._dirty_ports.add(port_key)
+        if self._synchronous_link_updates:
+            self.flushLinkUpdates()
+        elif not self._link_update_scheduled:
+            self._link_update_scheduled = True
+            QTimer.singleShot(0, self.flushLinkUpdates)
+
+    def setSynchronousLinkUpdates(self, enabled:bool):
+        """
+        When enabled, links are repositioned as soon as one of their ports moves,
+        instead of once per frame. Useful for tests.
+        """
+        self._synchronous_link_updates = enabled
+        if enabled:
+            self.flushLinkUpdates()
+
+    def flushLinkUpdates(self):
+        """Reposition the links connected to the ports that moved, each link once."""
+        self._link_update_scheduled = False
+        if not self._dirty_ports:
+            return
+        dirty_ports, self._dirty_ports = self._dirty_ports, set()
+
+        link_indexes: Set[QPersistentModelIndex] = set()
+        for port_key in dirty_ports:
+            port_index = self._indexFromKey(port_key)
+            if port_index.isValid():
+                link_indexes.update(self._controller.links(port_index))
+
+        connected_links = []
+        layer_links = []
         for link_index in link_indexes:
-            if link_widget := self._widget_manager.getWidget(link_index):
+            link_item = self._widget_manager.getWidget(link_index)
+            if link_item is None and self._link_layer is not None and link_index in self._link_layer:
+                link_item = link_index
+            if link_item is not None:
                 source_index = self._controller.linkSource(link_index)
                 source_widget = self._widget_manager.getWidget(source_index)
                 target_index = self._controller.linkTarget(link_index)
                 target_widget = self._widget_manager.getWidget(target_index)
                 if source_widget and target_widget:
-                    self._update_link_position(link_widget, source_widget, target_widget)
+                    links = layer_links if link_item is link_index else connected_links
+                    links.append( (link_item, source_widget, target_widget) )
+
+        self._update_link_positions(connected_links)
+        self._update_layer_link_positions(layer_links)
+
+    def _update_link_positions(self, links:List[Tuple[LinkWidget, QGraphicsItem, QGraphicsItem]]):
+        """Reposition connected links, computing their geometry in a single batch."""
+        lines = batchLinesBetweenShapes(
+            [source_widget for _, source_widget, _ in links], 
+            [target_widget for _, _, target_widget in links]
+        )
+        for (link_widget, _, _), line in zip(links, lines):
+            # Compute the link geometry in the link widget's local coordinates.
+            line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
+            link_widget.setLine(line)
+            link_widget.update()
+            self._refreshHitIndex(link_widget)
+
+    def _update_layer_link_positions(self, links:List[Tuple[QPersistentModelIndex, QGraphicsItem, QGraphicsItem]]):
+        """Reposition connected links of the link layer, computing their geometry in a single batch."""
+        if not links:
+            return
+        lines = batchLinesBetweenShapes(
+            [source_widget for _, source_widget, _ in links],
+            [target_widget for _, _, target_widget in links]
+        )
+        for (link_index, _, _), line in zip(links, lines):
+            self._link_layer.setLine(link_index, line)
 
     def _update_link_position(self, link_widget:LinkWidget, source_widget:QGraphicsItem|None=None, target_widget:QGraphicsItem|None=None):
         # Compute the link geometry in the link widget's local coordinates.
         if source_widget and target_widget:
-            line = makeLineBetweenShapes(source_widget, target_widget)
+            self._update_link_positions([(link_widget, source_widget, target_widget)])
+            return
+
+        elif source_widget or target_widget:
+            line = self._danglingLinkLine(source_widget, target_widget)
             line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
             link_widget.setLine(line)
+        else:
+            ...
 
-        elif source_widget:
+        link_widget.update()
+        self._refreshHitIndex(link_widget)
+
+    def _danglingLinkLine(self, source_widget:QGraphicsItem|None, target_widget:QGraphicsItem|None) -> QLineF:
+        """Scene line of a link with a single connected end."""
+        if source_widget:
             source_center = getShapeCenter(source_widget)
             source_size = source_widget.boundingRect().size()
             origin = QPointF(source_center.x() - source_size.width()/2, source_center.y() - source_size.height()/2)+QPointF(24,24)
             line = makeLineToShape(origin, source_widget)
-            line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
-            line = QLineF(line.p2(), line.p1())  # Reverse the line direction
-            link_widget.setLine(line)
-
-        elif target_widget:
+            return QLineF(line.p2(), line.p1())  # Reverse the line direction
+        else:
+            assert target_widget is not None
             target_center = getShapeCenter(target_widget)
             target_size = target_widget.boundingRect().size()
             origin = QPointF(target_center.x() - target_size.width()/2, target_center.y() - target_size.height()/2)-QPointF(24,24)
-            line = makeLineToShape(origin, target_widget)
-            line = QLineF(link_widget.mapFromScene(line.p1()), link_widget.mapFromScene(line.p2()))
-            link_widget.setLine(line)
+            return makeLineToShape(origin, target_widget)
+
+    def linkLine(self, link_index:QModelIndex|QPersistentModelIndex) -> QLineF|None:
+        """The scene line of the link, None if it is not shown."""
+        if link_widget := self._widget_manager.getWidget(link_index):
+            line = link_widget.line()
+            return QLineF(link_widget.mapToScene(line.p1()), link_widget.mapToScene(line.p2()))
+        if self._link_layer is not None:
+            return self._link_layer.line(QPersistentModelIndex(link_index))
+        return None
+
+    ## Link layer
+    def setLinkLayerEnabled(self, enabled:bool):
+        """
+        When enabled, links are drawn by a few tiled items of a LinkLayer, instead of a LinkWidget each.
+        Links are hit-tested with a segment index, and still show their selection and hover state.
+        Links are drawn below the nodes, and their cells are not shown.
+        """
+        if enabled == self.isLinkLayerEnabled():
+            return
+        if self._link_layer is not None:
+            link_indexes = self._link_layer.links()
+            selected = set(self._link_layer.selectedLinks())
         else:
-            ...
+            link_widgets = self._widget_manager.widgets(GraphItemType.LINK)
+            link_indexes = [QPersistentModelIndex(self._widget_manager.getIndex(widget)) for widget in link_widgets]
+            selected = {index for index, widget in zip(link_indexes, link_widgets) if widget.isSelected()}
 
-        link_widget.update()
+        scene = self.scene()
+        assert scene is not None
+        self.handleLinksRemoved(link_indexes)
+        if enabled:
+            self._link_layer = self._factory.createLinkLayer(scene, self)
+        else:
+            self._link_layer.clear()
+            self._link_layer = None
+
+        with blockingSignals(scene):
+            for link_index in link_indexes:
+                if link_index.isValid():
+                    self._addLinkWidgets(link_index)
+                    if link_index in selected:
+                        self._setLinkSelected(link_index, True)
+
+    def isLinkLayerEnabled(self) -> bool:
+        return self._link_layer is not None
+
+    def linkLayer(self) -> LinkLayer|None:
+        return self._link_layer
+
+    def _hasLinkItem(self, link_index:QPersistentModelIndex) -> bool:
+        """Whether the link is shown, by a widget or by the link layer."""
+        if self._widget_manager.getWidget(link_index):
+            return True
+        return self._link_layer is not None and link_index in self._link_layer
+
+    def _setLinkSelected(self, link_index:QPersistentModelIndex, selected:bool):
+        if widget := self._widget_manager.getWidget(link_index):
+            if widget.scene() and widget.isSelected() != selected:
+                widget.setSelected(selected)
+        elif self._link_layer is not None:
+            self._link_layer.setSelected(link_index, selected)
+
+    ## Deferred layouts
+    @contextmanager
+    def _deferringLayouts(self):
+        """Arrange the node widgets invalidated in the block once, when leaving the outermost block."""
+        self._layout_depth += 1
+        try:
+            yield
+        finally:
+            self._layout_depth -= 1
+            if self._layout_depth == 0:
+                self.flushLayouts()
+
+    def _invalidateLayout(self, node_widget:NodeWidget):
+        self._pending_layouts[node_widget] = None
+        if self._layout_depth == 0:
+            self.flushLayouts()
+
+    def flushLayouts(self):
+        """Run the pending layout pass of the node widgets, and update their hit-test bounds."""
+        if not self._pending_layouts:
+            return
+        pending, self._pending_layouts = self._pending_layouts, {}
+        scene = self.scene()
+        for node_widget in pending:
+            if node_widget.scene() is not scene:
+                continue # removed meanwhile
+            node_widget.ensureLayout()
+            self._refreshHitIndex(node_widget)
 
     ## Manage widgets
     def _addNodeWidgetForIndex(self, row_index:QPersistentModelIndex)->QGraphicsItem:
@@ -192,7 +664,8 @@ class QItemModel_GraphView(QGraphicsView):
 
         # widget management
         row_widget = self._factory.createNodeWidget(self.scene(), row_index, self)
-        self._widget_manager.insertWidget(row_index, row_widget)
+        self._widget_manager.insertWidget(row_index, row_widget, kind=GraphItemType.NODE)
+        self._hit_index.insert(row_widget, row_widget.sceneBoundingRect(), GraphItemType.NODE)
 
         return row_widget
     
@@ -204,7 +677,9 @@ class QItemModel_GraphView(QGraphicsView):
         row_widget = self._factory.createOutletWidget(parent_node_widget, row_index, self)
 
         # widget management
-        self._widget_manager.insertWidget(row_index, row_widget)
+        self._widget_manager.insertWidget(row_index, row_widget, kind=GraphItemType.OUTLET)
+        self._hit_index.insert(row_widget, row_widget.sceneBoundingRect(), GraphItemType.OUTLET)
+        self._invalidateLayout(parent_node_widget) # siblings are rearranged
 
         return row_widget
 
@@ -216,11 +691,27 @@ class QItemModel_GraphView(QGraphicsView):
         row_widget = self._factory.createInletWidget(parent_node_widget, row_index, self)
 
         # widget management
-        self._widget_manager.insertWidget(row_index, row_widget)
+        self._widget_manager.insertWidget(row_index, row_widget, kind=GraphItemType.INLET)
+        self._hit_index.insert(row_widget, row_widget.sceneBoundingRect(), GraphItemType.INLET)
+        self._invalidateLayout(parent_node_widget) # siblings are rearranged
 
         return row_widget
 
+    def _addLayerLinkForIndex(self, link:QPersistentModelIndex):
+        self.flushLayouts() # the link geometry needs the final port positions
+        source_index = self._controller.linkSource(link)
+        source_widget = self._widget_manager.getWidget(source_index) if source_index is not None else None
+        target_index = self._controller.linkTarget(link)
+        target_widget = self._widget_manager.getWidget(target_index) if target_index is not None else None
+        assert isinstance(target_widget, PortWidget)
+        if source_widget:
+            line = batchLinesBetweenShapes([source_widget], [target_widget])[0]
+        else:
+            line = self._danglingLinkLine(None, target_widget)
+        self._link_layer.insertLink(QPersistentModelIndex(link), line)
+
     def _addLinkWidgetForIndex(self, link:QPersistentModelIndex)->QGraphicsItem:
+        self.flushLayouts() # the link geometry needs the final port positions
         inlet_index = self._controller.linkTarget(link)  # ensure target is valid
         parent_inlet_widget = self._widget_manager.getWidget(inlet_index)
         assert isinstance(parent_inlet_widget, PortWidget)
@@ -228,7 +719,8 @@ class QItemModel_GraphView(QGraphicsView):
         link_widget = self._factory.createLinkWidget(self.scene(), link, self)
 
         # widget management
-        self._widget_manager.insertWidget(link, link_widget)
+        self._widget_manager.insertWidget(link, link_widget, kind=GraphItemType.LINK)
+        self._hit_index.insert(link_widget, link_widget.sceneBoundingRect(), GraphItemType.LINK)
 
         # link management
         source_index = self._controller.linkSource(link)
@@ -245,6 +737,9 @@ class QItemModel_GraphView(QGraphicsView):
         row_widget = self._widget_manager.getWidget(row_index)
         cell_widget = self._factory.createCellWidget(row_widget, cell_index, self)
         self._cell_manager.insertWidget(cell_index, cell_widget)
+        self._cell_hit_index.insert(cell_widget, cell_widget.sceneBoundingRect())
+        if isinstance(row_widget, NodeWidget):
+            self._invalidateLayout(row_widget)
         self._set_cell_data(cell_index, roles=[Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
         return cell_widget
 
@@ -253,6 +748,7 @@ class QItemModel_GraphView(QGraphicsView):
         if row_widget := self._widget_manager.getWidget(row_index):
             self._factory.destroyNodeWidget(self.scene(), row_widget)
             self._widget_manager.removeWidget(row_index)
+            self._hit_index.remove(row_widget)
 
     def _removeInletWidgetForIndex(self, row_index:QPersistentModelIndex):    
         # widget management
@@ -260,6 +756,9 @@ class QItemModel_GraphView(QGraphicsView):
             parent_widget = self._widget_manager.getWidget(row_index.parent())
             self._factory.destroyInletWidget(parent_widget, row_widget)
             self._widget_manager.removeWidget(row_index)
+            self._hit_index.remove(row_widget)
+            if parent_widget:
+                self._invalidateLayout(parent_widget)
 
     def _removeOutletWidgetForIndex(self, row_index:QPersistentModelIndex):
         # widget management
@@ -267,6 +766,9 @@ class QItemModel_GraphView(QGraphicsView):
             parent_widget = self._widget_manager.getWidget(row_index.parent())
             self._factory.destroyOutletWidget(parent_widget, row_widget)
             self._widget_manager.removeWidget(row_index)
+            self._hit_index.remove(row_widget)
+            if parent_widget:
+                self._invalidateLayout(parent_widget)
     
     def _removeLinkWidgetForIndex(self, link_index:QPersistentModelIndex):
         # widget management
@@ -274,6 +776,9 @@ class QItemModel_GraphView(QGraphicsView):
             parent_widget = self._widget_manager.getWidget(link_index.parent())
             self._factory.destroyLinkWidget(self.scene(), link_widget)
             self._widget_manager.removeWidget(link_index)
+            self._hit_index.remove(link_widget)
+        elif self._link_layer is not None:
+            self._link_layer.removeLink(QPersistentModelIndex(link_index))
     
     def _removeCellWidgetForIndex(self, cell_index:QPersistentModelIndex):
         if cell_widget := self._cell_manager.getWidget(cell_index):
@@ -281,48 +786,81 @@ class QItemModel_GraphView(QGraphicsView):
             row_widget = self._widget_manager.getWidget(row_index)
             self._factory.destroyCellWidget(row_widget, cell_widget)
             self._cell_manager.removeWidget(cell_index)
+            self._cell_hit_index.remove(cell_widget)
+            if isinstance(row_widget, NodeWidget):
+                self._invalidateLayout(row_widget)
 
     ## Handle model changes / Manage widget lifecycle
     def handleNodesInserted(self, node_indexes:List[QPersistentModelIndex]):
-        for node_index in node_indexes:
-            self._addNodeWidgetForIndex(node_index)
-            self.handleInletsInserted(self._controller.inlets(node_index))
-            self.handleOutletsInserted(self._controller.outlets(node_index))
-            self.handleAttributesInserted(self._controller.attributes(node_index))
+        with self._deferringLayouts():
+            for node_index in node_indexes:
+                if self._virtualized:
+                    self._addNodeRecord(node_index)
+                    self._scheduleMaterializedWidgetsUpdate()
+                else:
+                    self._addNodeWidgets(node_index)
 
     def handleOutletsInserted(self, outlet_indexes:List[QPersistentModelIndex]):
-        for outlet_index in outlet_indexes:
-            self._addOutletWidgetForIndex(outlet_index)
-            self.handleAttributesInserted(self._controller.attributes(outlet_index))
+        with self._deferringLayouts():
+            for outlet_index in outlet_indexes:
+                if not self._widget_manager.getWidget(outlet_index.parent()):
+                    continue # the node is virtualized
+                if self._widget_manager.getWidget(outlet_index):
+                    continue # created with its node
+                self._addOutletWidgetForIndex(outlet_index)
+                self.handleAttributesInserted(self._controller.attributes(outlet_index))
 
     def handleInletsInserted(self, inlet_indexes:List[QPersistentModelIndex]):
-        for inlet_index in inlet_indexes:
-            self._addInletWidgetForIndex(inlet_index)
-            self.handleAttributesInserted(self._controller.attributes(inlet_index))
+        with self._deferringLayouts():
+            for inlet_index in inlet_indexes:
+                if not self._widget_manager.getWidget(inlet_index.parent()):
+                    continue # the node is virtualized
+                if self._widget_manager.getWidget(inlet_index):
+                    continue # created with its node
+                self._addInletWidgetForIndex(inlet_index)
+                self.handleAttributesInserted(self._controller.attributes(inlet_index))
 
     def handleLinksInserted(self, link_indexes:List[QPersistentModelIndex]):
-        for link_index in link_indexes:
-            self._addLinkWidgetForIndex(link_index)
-            self.handleAttributesInserted(self._controller.attributes(link_index))
+        with self._deferringLayouts():
+            for link_index in link_indexes:
+                if self._virtualized:
+                    # a link to a shown node brings the other node along
+                    link_nodes = self._linkNodes(link_index)
+                    if not any(node_index in self._materialized_nodes for node_index in link_nodes):
+                        continue
+                    for node_index in link_nodes:
+                        self._materializeNode(node_index)
+                    if not self._canMaterializeLink(link_index):
+                        continue
+                if self._hasLinkItem(link_index):
+                    continue
+                self._addLinkWidgets(link_index)
 
     def handleAttributesInserted(self, attributes:List[QPersistentModelIndex]):
-        for attribute in attributes:
-            self._addCellWidgetForIndex(attribute)
+        with self._deferringLayouts():
+            for attribute in attributes:
+                if not self._widget_manager.getWidget(self._controller.attributeOwner(attribute)):
+                    continue # the owner is virtualized
+                self._addCellWidgetForIndex(attribute)
 
     def handleNodesRemoved(self, node_indexes:List[QPersistentModelIndex]):
-        for node_index in node_indexes:
-            self.handleAttributesRemoved(self._controller.attributes(node_index))
-            self.handleInletsRemoved(self._controller.inlets(node_index))
-            self.handleOutletsRemoved(self._controller.outlets(node_index))
-            self._removeNodeWidgetForIndex(node_index)
+        with self._deferringLayouts():
+            for node_index in node_indexes:
+                self._removeNodeWidgets(node_index)
+                if self._virtualized:
+                    self._removeNodeRecord(node_index)
 
     def handleInletsRemoved(self, inlet_indexes:List[QPersistentModelIndex]):
-        for inlet_index in inlet_indexes:
-            self._removeInletWidgetForIndex(inlet_index)
+        with self._deferringLayouts():
+            for inlet_index in inlet_indexes:
+                self.handleAttributesRemoved(self._controller.attributes(inlet_index))
+                self._removeInletWidgetForIndex(inlet_index)
 
     def handleOutletsRemoved(self, outlet_indexes:List[QPersistentModelIndex]):
-        for outlet_index in outlet_indexes:
-            self._removeOutletWidgetForIndex(outlet_index)
+        with self._deferringLayouts():
+            for outlet_index in outlet_indexes:
+                self.handleAttributesRemoved(self._controller.attributes(outlet_index))
+                self._removeOutletWidgetForIndex(outlet_index)
 
     def handleLinksRemoved(self, link_indexes:List[QPersistentModelIndex]):
         for link_index in link_indexes:
@@ -330,14 +868,100 @@ class QItemModel_GraphView(QGraphicsView):
             self._removeLinkWidgetForIndex(link_index)
 
     def handleAttributesRemoved(self, attributes:List[QPersistentModelIndex]):
-        for attribute in reversed(attributes):
-            self._removeCellWidgetForIndex(attribute)
+        with self._deferringLayouts():
+            for attribute in reversed(attributes):
+                self._removeCellWidgetForIndex(attribute)
+
+    def _addNodeWidgets(self, node_index:QPersistentModelIndex) -> QGraphicsItem:
+        """Create the widget of the node with its ports and cells."""
+        node_widget = self._addNodeWidgetForIndex(node_index)
+        self.handleInletsInserted(self._controller.inlets(node_index))
+        self.handleOutletsInserted(self._controller.outlets(node_index))
+        self.handleAttributesInserted(self._controller.attributes(node_index))
+        return node_widget
+
+    def _addLinkWidgets(self, link_index:QPersistentModelIndex) -> QGraphicsItem|None:
+        if self._link_layer is not None:
+            self._addLayerLinkForIndex(link_index)
+            return None
+        link_widget = self._addLinkWidgetForIndex(link_index)
+        self.handleAttributesInserted(self._controller.attributes(link_index))
+        return link_widget
+
+    def _removeNodeWidgets(self, node_index:QPersistentModelIndex):
+        self.handleAttributesRemoved(self._controller.attributes(node_index))
+        self.handleInletsRemoved(self._controller.inlets(node_index))
+        self.handleOutletsRemoved(self._controller.outlets(node_index))
+        self._removeNodeWidgetForIndex(node_index)
 
     ## Handle attributes data changes
     def handleAttributeDataChanged(self, attributes:List[QPersistentModelIndex], roles:List[int]):
+        # the cached view options hold the model data of the cells and their owners
+        for attribute in attributes:
+            if cell_widget := self._cell_manager.getWidget(attribute):
+                self._factory.invalidateViewOptions(cell_widget)
+            if attribute.column() == 0 and (row_widget := self._widget_manager.getWidget(attribute)):
+                self._factory.invalidateViewOptions(row_widget)
+                if GraphDataRole.CostRole in roles:
+                    row_widget.update() # nodes are tinted by their cost
+
+        if self._throttled_cell_updates:
+            if Qt.ItemDataRole.DisplayRole in roles or roles == []:
+                self._dirty_cells.update(attributes)
+                self._scheduleCellUpdate()
+            return
+
         for attribute in attributes:
             self._set_cell_data(attribute, roles)
 
+    def setThrottledCellUpdates(self, enabled:bool, max_rate:float|None=None):
+        """
+        When enabled, changed attributes are collected and delivered to their cells
+        at most once per frame, and at most `max_rate` times per second.
+        Cells out of the viewport are updated when they are scrolled into view.
+        """
+        if max_rate is not None:
+            assert max_rate > 0, "max_rate must be positive"
+            self._max_cell_update_rate = max_rate
+        self._throttled_cell_updates = enabled
+        if not enabled:
+            self.flushCellUpdates(offscreen=True)
+
+    def isThrottledCellUpdates(self) -> bool:
+        return self._throttled_cell_updates
+
+    def _scheduleCellUpdate(self):
+        if self._cell_update_scheduled:
+            return
+        self._cell_update_scheduled = True
+        delay = self._last_cell_update + 1.0 / self._max_cell_update_rate - time.monotonic()
+        QTimer.singleShot(max(0, int(delay * 1000)), self.flushCellUpdates)
+
+    def flushCellUpdates(self, offscreen:bool=False):
+        """Deliver the changed attributes to their cells.
+
+        offscreen: also update the cells out of the viewport. Otherwise they stay dirty.
+        """
+        self._cell_update_scheduled = False
+        self._last_cell_update = time.monotonic()
+        if not self._dirty_cells:
+            return
+
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        self._cell_update_area = visible
+        still_dirty = set()
+        for index in self._dirty_cells:
+            if not index.isValid():
+                continue
+            cell_widget = self._cell_manager.getWidget(index)
+            if cell_widget is None:
+                continue # cells are created with the current data
+            if not offscreen and not cell_widget.sceneBoundingRect().intersects(visible):
+                still_dirty.add(index)
+                continue
+            self._set_cell_data(index, [Qt.ItemDataRole.DisplayRole])
+        self._dirty_cells = still_dirty
+
     def _set_cell_data(self, index:QPersistentModelIndex, roles:list=[]):
         """Set the data for a cell widget."""
         assert index.isValid(), "Index must be valid"
@@ -345,7 +969,11 @@ class QItemModel_GraphView(QGraphicsView):
         if Qt.ItemDataRole.DisplayRole in roles or Qt.ItemDataRole.DisplayRole in roles or roles == []:
             if cell_widget:= self._cell_manager.getWidget(index):
                 text = index.data(Qt.ItemDataRole.DisplayRole)
+                if isinstance(text, str) and text == cell_widget.text():
+                    return # avoid the text relayout
                 cell_widget.setText(text)
+                if parent_widget := cell_widget.parentItem():
+                    self._refreshHitIndex(parent_widget) # cells are rearranged by their parent
 
     ## Selection handling   
     def setSelectionModel(self, selection: QItemSelectionModel):
@@ -411,12 +1039,16 @@ class QItemModel_GraphView(QGraphicsView):
                     if widget:=self._widget_manager.getWidget(index):
                         if widget.scene() and widget.isSelected():
                             widget.setSelected(False)
+                    elif self._link_layer is not None:
+                        self._link_layer.setSelected(QPersistentModelIndex(index), False)
 
             for index in selected_indexes:
                 if index.isValid() and index.column() == 0:
                     if widget:=self._widget_manager.getWidget(index):
                         if widget.scene() and not widget.isSelected():
                             widget.setSelected(True)
+                    elif self._link_layer is not None:
+                        self._link_layer.setSelected(QPersistentModelIndex(index), True)
 
     def _syncSelectionModel(self):
         """update selection model from scene selection"""
@@ -427,7 +1059,9 @@ class QItemModel_GraphView(QGraphicsView):
             selected_widgets = scene.selectedItems()
 
             # map widgets to QModelIndexes
-            selected_indexes = map(self._widget_manager.getIndex, selected_widgets)
+            selected_indexes = list(map(self._widget_manager.getIndex, selected_widgets))
+            if self._link_layer is not None:
+                selected_indexes += [QModelIndex(link_index) for link_index in self._link_layer.selectedLinks()]
             selected_indexes = filter(lambda idx: idx is not None and idx.isValid(), selected_indexes)
             
             assert self._item_model
@@ -453,6 +1087,50 @@ class QItemModel_GraphView(QGraphicsView):
                 self._selection.clearSelection()
                 self._selection.setCurrentIndex(QModelIndex(), QItemSelectionModel.SelectionFlag.Current | QItemSelectionModel.SelectionFlag.Rows)
 
+    ## Handle viewport changes
+    def changeEvent(self, event:QEvent):
+        if event.type() in (QEvent.Type.PaletteChange, QEvent.Type.FontChange):
+            # the cached view options copy the palette and the font of the view
+            self._factory.invalidateViewOptions()
+            self.viewport().update()
+        super().changeEvent(event)
+
+    def detailLevel(self) -> DetailLevel:
+        """What the widgets draw at the current zoom, see GraphDelegate.detailLevel."""
+        return self._detail_level
+
+    def _updateDetailLevel(self):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(self.transform())
+        level = self._delegate.detailLevel(lod)
+        if level == self._detail_level:
+            return
+
+        antialiasing = QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing | QPainter.RenderHint.SmoothPixmapTransform
+        if level >= DetailLevel.Shapes and self._detail_level < DetailLevel.Shapes:
+            self._full_detail_hints = self.renderHints() & antialiasing
+            self.setRenderHints(self.renderHints() & ~antialiasing)
+        elif level < DetailLevel.Shapes and self._detail_level >= DetailLevel.Shapes:
+            self.setRenderHints(self.renderHints() | self._full_detail_hints)
+        self._detail_level = level
+
+    def paintEvent(self, event:QPaintEvent):
+        self.flushLayouts()
+        self._updateDetailLevel()
+        super().paintEvent(event)
+        if self._dirty_cells and not self._cell_update_scheduled:
+            # offscreen cells left dirty may have been scrolled into view
+            if self.mapToScene(self.viewport().rect()).boundingRect() != self._cell_update_area:
+                self._scheduleCellUpdate()
+
+        if self._virtualized and not self._materialize_scheduled:
+            # the viewport was panned, zoomed or resized past the materialized area
+            visible = self.mapToScene(self.viewport().rect()).boundingRect()
+            margin = self._virtualization_margin
+            expected = visible.adjusted(-margin, -margin, margin, margin)
+            materialized = self._materialized_area
+            if not materialized.contains(visible) or materialized.width() * materialized.height() > 4 * expected.width() * expected.height():
+                self._scheduleMaterializedWidgetsUpdate()
+
     ## Handle mouse events
     def mousePressEvent(self, event):
         """
@@ -470,21 +1148,74 @@ class QItemModel_GraphView(QGraphicsView):
         index = self.rowAt(QPoint(int(pos.x()), int(pos.y())))
         scene_pos = self.mapToScene(event.position().toPoint())
 
+        # layer links are selected on press, and their ends are dragged once the mouse moves
+        if index is not None and self._link_layer is not None and (link_index := QPersistentModelIndex(index)) in self._link_layer:
+            self._layerMousePressEvent(event, index)
+            if event.button() == Qt.MouseButton.LeftButton:
+                self._pressed_layer_link = link_index, scene_pos, event.position().toPoint()
+            return
+
         # If we can start linking, do so
         if index is not None and self._linking_tool.startLinking(index, scene_pos):
             return
+        elif self._link_layer is not None:
+            self._layerMousePressEvent(event, index)
         else:
             # Fallback to default behavior
             super().mousePressEvent(event)
 
+    def _layerMousePressEvent(self, event:QMouseEvent, index:QModelIndex|None):
+        """Select the links of the link layer, which the scene does not know about."""
+        scene = self.scene()
+        assert scene is not None
+        link_index = QPersistentModelIndex(index) if index is not None and index.isValid() else None
+        is_layer_link = link_index is not None and link_index in self._link_layer
+        toggle = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+
+        if is_layer_link and event.button() == Qt.MouseButton.LeftButton:
+            if toggle:
+                self._link_layer.setSelected(link_index, not self._link_layer.isSelected(link_index))
+            else:
+                with blockingSignals(scene):
+                    scene.clearSelection()
+                self._link_layer.clearSelection()
+                self._link_layer.setSelected(link_index, True)
+            self._syncSelectionModel()
+            return
+
+        had_selected_links = bool(self._link_layer.selectedLinks())
+        if not toggle:
+            self._link_layer.clearSelection()
+        super().mousePressEvent(event)
+        if had_selected_links and not toggle:
+            self._syncSelectionModel()
+
     def mouseMoveEvent(self, event):
+        if self._pressed_layer_link is not None:
+            link_index, scene_pos, press_pos = self._pressed_layer_link
+            if (event.position().toPoint() - press_pos).manhattanLength() >= QApplication.startDragDistance():
+                self._pressed_layer_link = None
+                if link_index.isValid():
+                    self._linking_tool.startLinking(QModelIndex(link_index), scene_pos)
+
         if self._linking_tool.isActive():
             pos = QPoint(int(event.position().x()), int(event.position().y())) # Ensure pos is in integer coordinates
             self._linking_tool.updateLinking(pos)
         else:
+            if self._link_layer is not None:
+                # hover the link under the cursor, unless a widget covers it
+                index = self.rowAt(QPoint(int(event.position().x()), int(event.position().y())))
+                link_index = QPersistentModelIndex(index) if index is not None else None
+                self._link_layer.setHoveredLink(link_index if link_index in self._link_layer else None)
             super().mouseMoveEvent(event)
 
+    def leaveEvent(self, event:QEvent):
+        if self._link_layer is not None:
+            self._link_layer.setHoveredLink(None)
+        super().leaveEvent(event)
+
     def mouseReleaseEvent(self, event):
+        self._pressed_layer_link = None
         if self._linking_tool.isActive():
             pos = QPoint(int(event.position().x()), int(event.position().y())) # Ensure pos is in integer coordinates
             drop_target = self.rowAt(pos)  # Ensure the index is updated
@@ -502,6 +1233,9 @@ class QItemModel_GraphView(QGraphicsView):
             if widget := self._widget_manager.getWidget(idx):
                 center = widget.boundingRect().center()
                 widget.setPos(self.mapToScene(event.position().toPoint())-center)
+            elif record := self._node_records.get(idx):
+                center = record.bounds.center()
+                self.setNodePosition(idx, self.mapToScene(event.position().toPoint())-center)
 
             return
             
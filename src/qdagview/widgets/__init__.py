@@ -6,13 +6,19 @@ Provides graph models, views, and interaction components for building graph-base
 
 # Import main public API components
 from .cell_widget import CellWidget
+from .static_text_cell_widget import StaticTextCellWidget
 from .port_widget import PortWidget
 from .link_widget import LinkWidget
 from .node_widget import NodeWidget
+from .link_layer import LinkLayer, LinkTileItem, LinkBatch
 
 __all__ = [
     'NodeWidget',
     'CellWidget',
+    'StaticTextCellWidget',
     'PortWidget',
-    'LinkWidget'
+    'LinkWidget',
+    'LinkLayer',
+    'LinkTileItem',
+    'LinkBatch'
 ]
@@ -0,0 +1,254 @@
+from typing import *
+from qtpy.QtGui import *
+from qtpy.QtCore import *
+from qtpy.QtWidgets import *
+
+from ..managers.segment_index import SegmentIndex, GridCell
+
+
+class LinkBatch(NamedTuple):
+    """The links of a tile sharing the same state.
+
+    Arrows are split into their shafts, drawn with a single drawLines call,
+    and their heads, in a single path. (A path of whole arrows is rasterized
+    an order of magnitude slower, as the long outlines intersect each other.)
+    """
+    lines: List[QLineF]   # whole links, eg.: for hairlines
+    shafts: List[QLineF]  # links up to their arrow head
+    heads: QPainterPath
+
+def _arrowParts(line:QLineF, width:float) -> Tuple[QLineF, QPolygonF]:
+    """The shaft and the head of the arrow along the line, sized like makeArrowShape."""
+    head_width, head_length = width*2, width*4
+    length = line.length()
+    if length == 0:
+        return QLineF(line), QPolygonF()
+    dx, dy = line.dx() / length, line.dy() / length
+    tip = line.p2()
+    base = QPointF(tip.x() - dx * head_length, tip.y() - dy * head_length)
+    normal = QPointF(-dy * head_width, dx * head_width)
+    return QLineF(line.p1(), base), QPolygonF([tip, base + normal, base - normal])
+
+
+class LinkTileItem(QGraphicsItem):
+    """A tile of a LinkLayer. Draws the links crossing its rect."""
+    def __init__(self, layer:"LinkLayer", cell:GridCell, rect:QRectF):
+        super().__init__()
+        self._layer = layer
+        self._cell = cell
+        self._rect = QRectF(rect)
+        self._batches: Dict[QStyle.StateFlag, LinkBatch] | None = None # by link state
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton) # links are hit-tested by the layer
+
+    def cell(self) -> GridCell:
+        return self._cell
+
+    def invalidate(self):
+        """Rebuild the batches of the tile when next drawn."""
+        self._batches = None
+        self.update()
+
+    def batches(self) -> Dict[QStyle.StateFlag, LinkBatch]:
+        if self._batches is None:
+            self._batches = self._layer._buildBatches(self._cell)
+        return self._batches
+
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def shape(self) -> QPainterPath:
+        return QPainterPath() # never found by QGraphicsScene.items
+
+    def paint(self, painter:QPainter, option:QStyleOptionGraphicsItem, widget:QWidget|None=None):
+        painter.save()
+        painter.setClipRect(self._rect) # links crossing several tiles are drawn once
+        for state, batch in self.batches().items():
+            self._layer.paintLinks(painter, option, state, batch)
+        painter.restore()
+
+
+class LinkLayer:
+    """Draws all the links with a few tiled items, instead of a LinkWidget per link.
+
+    Links are kept as scene lines in two SegmentIndexes: one with the tile size,
+    telling the tiles each link crosses, and a finer one for hit-testing.
+    Each tile draws its links in one LinkBatch per link state (normal, selected, hovered),
+    rebuilt only when a link of the tile moves or changes state.
+    """
+    def __init__(self, scene:QGraphicsScene, tile_size:float=1024.0, hit_tolerance:float=2.0):
+        self._scene = scene
+        self._arrow_width = 2.0
+        margin = self._arrow_width * 2 + 1 # the arrow head is wider than the line
+        self._tile_index = SegmentIndex[Hashable](cell_size=tile_size, padding=margin)
+        self._hit_index = SegmentIndex[Hashable](cell_size=128.0, padding=hit_tolerance)
+        self._hit_tolerance = hit_tolerance
+        self._tiles: Dict[GridCell, LinkTileItem] = {}
+        self._arrows: Dict[Hashable, Tuple[QLineF, QPolygonF]] = {}
+        self._selected: Set[Hashable] = set()
+        self._hovered: Hashable|None = None
+        self._z_value = -1.0 # below the nodes
+
+    ## Links
+    def __contains__(self, key:Hashable) -> bool:
+        return key in self._hit_index
+
+    def __len__(self) -> int:
+        return len(self._hit_index)
+
+    def links(self) -> List[Hashable]:
+        return self._hit_index.keys()
+
+    def line(self, key:Hashable) -> QLineF | None:
+        """The scene line of the link."""
+        return self._hit_index.line(key)
+
+    def insertLink(self, key:Hashable, line:QLineF):
+        if key in self:
+            self.removeLink(key)
+        self._hit_index.insert(key, line)
+        self._tile_index.insert(key, line)
+        self._invalidateTiles(self._tile_index.cells(key))
+
+    def setLine(self, key:Hashable, line:QLineF):
+        """Move the link to the scene line."""
+        if key not in self or self._hit_index.line(key) == line:
+            return
+        old_cells = self._tile_index.cells(key)
+        self._arrows.pop(key, None)
+        self._hit_index.update(key, line)
+        self._tile_index.update(key, line)
+        self._invalidateTiles(set(old_cells) | set(self._tile_index.cells(key)))
+
+    def removeLink(self, key:Hashable):
+        if key not in self:
+            return
+        cells = self._tile_index.cells(key)
+        self._hit_index.remove(key)
+        self._tile_index.remove(key)
+        self._arrows.pop(key, None)
+        self._selected.discard(key)
+        if self._hovered == key:
+            self._hovered = None
+        self._invalidateTiles(cells)
+
+    def clear(self):
+        """Remove the links and the tiles."""
+        for tile in self._tiles.values():
+            if tile.scene() is not None:
+                tile.scene().removeItem(tile)
+        self._tiles.clear()
+        self._hit_index.clear()
+        self._tile_index.clear()
+        self._arrows.clear()
+        self._selected.clear()
+        self._hovered = None
+
+    ## Hit testing
+    def linkAt(self, scene_pos:QPointF, tolerance:float|None=None) -> Hashable|None:
+        """The link nearest to the scene position, within the tolerance."""
+        hits = self._hit_index.query(scene_pos, self._hit_tolerance if tolerance is None else tolerance)
+        return hits[0] if hits else None
+
+    def linksInRect(self, rect:QRectF) -> List[Hashable]:
+        return self._hit_index.queryRect(rect)
+
+    def hitTolerance(self) -> float:
+        return self._hit_tolerance
+
+    ## State
+    def isSelected(self, key:Hashable) -> bool:
+        return key in self._selected
+
+    def setSelected(self, key:Hashable, selected:bool):
+        if key not in self or (key in self._selected) == selected:
+            return
+        if selected:
+            self._selected.add(key)
+        else:
+            self._selected.discard(key)
+        self._invalidateTiles(self._tile_index.cells(key))
+
+    def selectedLinks(self) -> List[Hashable]:
+        return list(self._selected)
+
+    def clearSelection(self):
+        for key in list(self._selected):
+            self.setSelected(key, False)
+
+    def hoveredLink(self) -> Hashable|None:
+        return self._hovered
+
+    def setHoveredLink(self, key:Hashable|None):
+        if key == self._hovered:
+            return
+        previous, self._hovered = self._hovered, key if key in self else None
+        for changed in (previous, self._hovered):
+            if changed is not None:
+                self._invalidateTiles(self._tile_index.cells(changed))
+
+    def linkState(self, key:Hashable) -> QStyle.StateFlag:
+        state = QStyle.StateFlag.State_None
+        if key in self._selected:
+            state |= QStyle.StateFlag.State_Selected
+        if key == self._hovered:
+            state |= QStyle.StateFlag.State_MouseOver
+        return state
+
+    ## Tiles
+    def tiles(self) -> List[LinkTileItem]:
+        return list(self._tiles.values())
+
+    def _invalidateTiles(self, cells:Iterable[GridCell]):
+        for cell in cells:
+            tile = self._tiles.get(cell)
+            if self._tile_index.isCellEmpty(cell):
+                if tile is not None:
+                    del self._tiles[cell]
+                    if tile.scene() is not None:
+                        tile.scene().removeItem(tile)
+                continue
+            if tile is None:
+                tile = self._tiles[cell] = LinkTileItem(self, cell, self._tile_index.cellRect(cell))
+                tile.setZValue(self._z_value)
+                self._scene.addItem(tile)
+            tile.invalidate()
+
+    ## Painting
+    def arrowWidth(self) -> float:
+        return self._arrow_width
+
+    def _buildBatches(self, cell:GridCell) -> Dict[QStyle.StateFlag, LinkBatch]:
+        batches: Dict[QStyle.StateFlag, LinkBatch] = {}
+        for key in self._tile_index.cellKeys(cell):
+            state = self.linkState(key)
+            if state not in batches:
+                heads = QPainterPath()
+                heads.setFillRule(Qt.FillRule.WindingFill) # overlapping heads must not cancel out
+                batches[state] = LinkBatch([], [], heads)
+            batch = batches[state]
+            line = self._hit_index.line(key)
+            if key not in self._arrows:
+                self._arrows[key] = _arrowParts(line, self._arrow_width)
+            shaft, head = self._arrows[key]
+            batch.lines.append(line)
+            batch.shafts.append(shaft)
+            batch.heads.addPolygon(head)
+        # selected and hovered links are drawn above the others
+        return dict(sorted(batches.items(), key=lambda item: item[0].value))
+
+    def paintLinks(self, painter:QPainter, option:QStyleOptionGraphicsItem, state:QStyle.StateFlag, batch:LinkBatch):
+        """Draw the links of a tile sharing the same state. Override to change the style."""
+        palette = option.palette
+        if state & QStyle.StateFlag.State_Selected:
+            brush = palette.accent()
+        elif state & QStyle.StateFlag.State_MouseOver:
+            brush = QBrush(Qt.GlobalColor.red)
+        else:
+            brush = palette.text()
+        pen = QPen(brush, self._arrow_width)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        painter.setPen(pen)
+        painter.drawLines(batch.shafts)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brush)
+        painter.drawPath(batch.heads)
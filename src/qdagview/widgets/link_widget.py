@@ -1,4 +1,5 @@
 from typing import *
+from collections import Counter
 from qtpy.QtGui import *
 from qtpy.QtCore import *
 from qtpy.QtWidgets import *
@@ -9,6 +10,10 @@ from ..utils import makeArrowShape
 
 
 class LinkWidget(QGraphicsWidget):
+    # geometry cache hits and misses of all link widgets, eg.: {"shape_hits": 10, "shape_misses": 1}
+    # None unless turned on with setCacheStatsEnabled, boundingRect and shape are hit-testing hot paths
+    _cache_stats: Counter|None = None
+
     def __init__(self, parent: QGraphicsItem | None = None):
         super().__init__(parent=parent)
         # self.setZValue(-1)  # Ensure links are drawn below nodes
@@ -19,6 +24,36 @@ class LinkWidget(QGraphicsWidget):
 
         self._graphview = None
 
+        # style
+        self._stroke_width = 4.0 # width of the shape used for hit tests
+        self._arrow_width = 2.0
+
+        # geometry cache, computed once per line or style change
+        self._bounding_rect: QRectF|None = None
+        self._shape: QPainterPath|None = None
+        self._arrow_shape: QPainterPath|None = None
+
+    # geometry cache
+    def _invalidateGeometry(self):
+        self._bounding_rect = None
+        self._shape = None
+        self._arrow_shape = None
+
+    @classmethod
+    def setCacheStatsEnabled(cls, enabled:bool):
+        """Count the geometry cache hits and misses of all link widgets. Off by default."""
+        LinkWidget._cache_stats = Counter() if enabled else None
+
+    @classmethod
+    def cacheStats(cls) -> Dict[str, int]:
+        """Geometry cache hits and misses of all link widgets since the last reset."""
+        return dict(LinkWidget._cache_stats or {})
+
+    @classmethod
+    def resetCacheStats(cls):
+        if LinkWidget._cache_stats is not None:
+            LinkWidget._cache_stats.clear()
+
     
     # manage cells
     def insertCell(self, pos:int, cell:CellWidget):
@@ -33,7 +68,6 @@ class LinkWidget(QGraphicsWidget):
         pos = self.__cells.index(cell)
         self.__cells.remove(cell)
         cell.setParentItem(None)
-        cell.deleteLater()
         for i, cell in enumerate(self.__cells[pos:]):
             center = self._line.pointAt(0.5)
             cell.setPos(center.x(), center.y() + (pos + i) * 20)
@@ -51,6 +85,7 @@ class LinkWidget(QGraphicsWidget):
         
         self.prepareGeometryChange()
         self._line = line
+        self._invalidateGeometry()
 
         _ = QRectF(line.p1(), line.p2())
         _ = _.normalized()
@@ -61,19 +96,60 @@ class LinkWidget(QGraphicsWidget):
             center = self._line.pointAt(0.5)
             cell.setPos(center.x(), center.y() + (i) * 20)
 
+    def strokeWidth(self) -> float:
+        return self._stroke_width
+
+    def setStrokeWidth(self, width:float):
+        """Set the width of the shape used for hit tests."""
+        self.prepareGeometryChange()
+        self._stroke_width = width
+        self._invalidateGeometry()
+
+    def arrowWidth(self) -> float:
+        return self._arrow_width
+
+    def setArrowWidth(self, width:float):
+        self._arrow_width = width
+        self._invalidateGeometry()
+        self.update()
+
     def boundingRect(self):
-        _ = QRectF(self._line.p1(), self._line.p2())
-        _ = _.normalized()
-        _ = _.adjusted(-5,-5,5,5)
-        return _
+        stats = LinkWidget._cache_stats
+        if self._bounding_rect is None:
+            _ = QRectF(self._line.p1(), self._line.p2())
+            _ = _.normalized()
+            _ = _.adjusted(-5,-5,5,5)
+            self._bounding_rect = _
+            if stats is not None:
+                stats["bounding_rect_misses"] += 1
+        elif stats is not None:
+            stats["bounding_rect_hits"] += 1
+        return QRectF(self._bounding_rect)
     
     def shape(self)->QPainterPath:
-        path = QPainterPath()
-        path.moveTo(self._line.p1())
-        path.lineTo(self._line.p2())
-        stroker = QPainterPathStroker()
-        stroker.setWidth(4)
-        return stroker.createStroke(path)
+        stats = LinkWidget._cache_stats
+        if self._shape is None:
+            path = QPainterPath()
+            path.moveTo(self._line.p1())
+            path.lineTo(self._line.p2())
+            stroker = QPainterPathStroker()
+            stroker.setWidth(self._stroke_width)
+            self._shape = stroker.createStroke(path)
+            if stats is not None:
+                stats["shape_misses"] += 1
+        elif stats is not None:
+            stats["shape_hits"] += 1
+        return QPainterPath(self._shape)
+
+    def arrowShape(self) -> QPainterPath:
+        stats = LinkWidget._cache_stats
+        if self._arrow_shape is None:
+            self._arrow_shape = makeArrowShape(self._line, self._arrow_width)
+            if stats is not None:
+                stats["arrow_misses"] += 1
+        elif stats is not None:
+            stats["arrow_hits"] += 1
+        return QPainterPath(self._arrow_shape)
     
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
         palette = option.palette
@@ -84,6 +160,5 @@ class LinkWidget(QGraphicsWidget):
         else:
             painter.setBrush(palette.text())
         painter.setPen(Qt.PenStyle.NoPen)
-        arrow = makeArrowShape(self._line, 2)
-        painter.drawPath(arrow)
+        painter.drawPath(self.arrowShape())
         
@@ -20,8 +20,55 @@ class NodeWidget(QGraphicsItem):
         # manage cells
         self._cells: List[CellWidget] = []
 
+        # deferred layout: parts to arrange in the next layout pass
+        self._dirty_layouts: Set[str] = set()
+
         self._graphview = None
 
+    # layout
+    def invalidateLayout(self, *parts:Literal['inlets', 'outlets', 'cells']):
+        """
+        Mark the parts to be arranged in the next layout pass, instead of arranging them on each change.
+        The pass runs with ensureLayout: the view calls it once it has handled a batch of changes,
+        standalone widgets are arranged when added to a scene. Painting never changes the layout.
+        Ports do not notify their position changes until their final positions are known.
+        """
+        parts = parts or ('inlets', 'outlets', 'cells')
+        for part in parts:
+            if part in ('inlets', 'outlets'):
+                for port in self._inlets if part == 'inlets' else self._outlets:
+                    port.setPositionNotificationsEnabled(False)
+        self._dirty_layouts.update(parts)
+        self.update()
+
+    def isLayoutDirty(self) -> bool:
+        return bool(self._dirty_layouts)
+
+    def ensureLayout(self):
+        """Run the pending layout pass, if any."""
+        if not self._dirty_layouts:
+            return
+        dirty_layouts, self._dirty_layouts = self._dirty_layouts, set()
+        if 'inlets' in dirty_layouts:
+            self._arrangeInlets()
+        if 'outlets' in dirty_layouts:
+            self._arrangeOutlets()
+        if 'cells' in dirty_layouts:
+            self._arrangeCells()
+
+        # notify the final positions
+        if 'inlets' in dirty_layouts:
+            for inlet in self._inlets:
+                inlet.setPositionNotificationsEnabled(True)
+        if 'outlets' in dirty_layouts:
+            for outlet in self._outlets:
+                outlet.setPositionNotificationsEnabled(True)
+
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any):
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged and value is not None:
+            self.ensureLayout()
+        return super().itemChange(change, value)
+
     # manage inlets
     def _arrangeInlets(self, first=0, last=-1):
         for i, inlet in enumerate(self._inlets):
@@ -30,13 +77,14 @@ class NodeWidget(QGraphicsItem):
 
     def insertInlet(self, pos: int, inlet: PortWidget):
         self._inlets.insert(pos, inlet)
+        inlet.setPositionNotificationsEnabled(False)
         inlet.setParentItem(self)
-        self._arrangeInlets(pos)
+        self.invalidateLayout('inlets')
 
     def removeInlet(self, inlet:PortWidget):
         self._inlets.remove(inlet)
         inlet.setParentItem(None)  # Remove from graphics hierarchy
-        self._arrangeInlets()
+        self.invalidateLayout('inlets')
 
     def inlets(self) -> list[PortWidget]:
         return [inlet for inlet in self._inlets]
@@ -49,13 +97,14 @@ class NodeWidget(QGraphicsItem):
 
     def insertOutlet(self, pos: int, outlet: PortWidget):
         self._outlets.insert(pos, outlet)
+        outlet.setPositionNotificationsEnabled(False)
         outlet.setParentItem(self)
-        self._arrangeOutlets(pos)
+        self.invalidateLayout('outlets')
 
     def removeOutlet(self, outlet: PortWidget):
         self._outlets.remove(outlet)
         outlet.setParentItem(None)  # Remove from graphics hierarchy
-        self._arrangeOutlets()
+        self.invalidateLayout('outlets')
 
     def outlets(self) -> list[PortWidget]:
         return [outlet for outlet in self._outlets]
@@ -75,12 +124,12 @@ class NodeWidget(QGraphicsItem):
     def insertCell(self, pos, cell:QGraphicsItem):
         self._cells.insert(pos, cell)
         cell.setParentItem(self)
-        self._arrangeCells(pos)
+        self.invalidateLayout('cells')
 
     def removeCell(self, cell: CellWidget):
         self._cells.remove(cell)
         cell.setParentItem(None)  # Remove from graphics hierarchy
-        self._arrangeCells()
+        self.invalidateLayout('cells')
 
     def cells(self) -> list[CellWidget]:
         return [cell for cell in self._cells]
@@ -16,8 +16,22 @@ class PortWidget(QGraphicsObject):
 
         self._cells: List[CellWidget] = []
 
+        # scenePositionChanged is held back while the parent lays out its ports
+        self._position_notifications_enabled = True
+        self._notified_scene_pos: QPointF|None = None
+
         self._graphview = None
 
+    def setPositionNotificationsEnabled(self, enabled:bool):
+        """
+        Enable or disable the scenePositionChanged signal.
+        Re-enabling emits it once, if the port moved in the meantime.
+        """
+        self._position_notifications_enabled = enabled
+        if enabled and self.scene() and self.scenePos() != self._notified_scene_pos:
+            self._notified_scene_pos = self.scenePos()
+            self.scenePositionChanged.emit(self._notified_scene_pos)
+
     def setTextAlignment(self, alignment:Qt.AlignmentFlag):
         match alignment:
             case Qt.AlignmentFlag.AlignLeft:
@@ -42,8 +56,9 @@ class PortWidget(QGraphicsObject):
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any):
         match change:
             case QGraphicsItem.GraphicsItemChange.ItemScenePositionHasChanged:
-                if self.scene():
+                if self.scene() and self._position_notifications_enabled:
                     # Emit signal when position changes
+                    self._notified_scene_pos = value
                     self.scenePositionChanged.emit(value)
                     
         return super().itemChange(change, value)
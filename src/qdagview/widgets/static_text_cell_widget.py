@@ -0,0 +1,97 @@
+from typing import *
+from qtpy.QtGui import *
+from qtpy.QtCore import *
+from qtpy.QtWidgets import *
+
+
+class StaticTextCellWidget(QGraphicsItem):
+    """Display-only cell, drawn with a QStaticText.
+
+    A drop-in alternative to CellWidget, without a QTextDocument per cell:
+    the text is laid out once per change, when next drawn, and elided to the text width if one is set.
+    Font metrics are shared by all cells with the same font.
+    """
+    _font_metrics: Dict[str, QFontMetricsF] = {}
+
+    def __init__(self, parent: QGraphicsItem | None = None):
+        super().__init__(parent)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
+        font = QFont()
+        font.setPointSize(8)
+        self._font = font
+        self._text = ""
+        self._text_width = -1.0 # -1: the natural width of the text
+        self._static_text = QStaticText()
+        self._static_text.setTextFormat(Qt.TextFormat.PlainText)
+        self._bounds = QRectF()
+        self._graphview = None
+        self._layoutText()
+
+    @classmethod
+    def fontMetrics(cls, font:QFont) -> QFontMetricsF:
+        """Font metrics shared by the cells using the font."""
+        key = font.key()
+        try:
+            return cls._font_metrics[key]
+        except KeyError:
+            metrics = cls._font_metrics[key] = QFontMetricsF(font)
+            return metrics
+
+    def text(self) -> str:
+        return self._text
+
+    def setText(self, text:str):
+        text = str(text) if text is not None else ""
+        if text == self._text:
+            return
+        self._text = text
+        self._layoutText()
+
+    def font(self) -> QFont:
+        return QFont(self._font)
+
+    def setFont(self, font:QFont):
+        self._font = QFont(font)
+        self._layoutText()
+
+    def textWidth(self) -> float:
+        return self._text_width
+
+    def setTextWidth(self, width:float):
+        """Elide the text to the width. -1 shows the whole text."""
+        if width == self._text_width:
+            return
+        self._text_width = width
+        self._layoutText()
+
+    def staticText(self) -> QStaticText:
+        return self._static_text
+
+    def _layoutText(self):
+        metrics = self.fontMetrics(self._font)
+        text = self._text
+        if self._text_width >= 0:
+            text = metrics.elidedText(text, Qt.TextElideMode.ElideRight, self._text_width)
+            width = self._text_width
+        else:
+            width = metrics.horizontalAdvance(text)
+
+        self._static_text.setText(text) # laid out on its first draw
+
+        bounds = QRectF(0, 0, width, metrics.height())
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+
+    def paint(self, painter:QPainter, option, /, widget:QWidget|None = None):
+        self.paintText(painter, self._bounds)
+
+    def paintText(self, painter:QPainter, rect:QRectF):
+        """Draw the static text centered in the rect."""
+        size = self._static_text.size()
+        painter.setFont(self._font)
+        painter.drawStaticText(QPointF(rect.center().x() - size.width()/2, rect.center().y() - size.height()/2), self._static_text)
@@ -0,0 +1,92 @@
+import pytest
+
+import logging
+import random
+
+from qtpy.QtGui import QStandardItemModel, QStandardItem
+from qtpy.QtWidgets import QGraphicsRectItem
+
+from qdagview.managers.indexed_list import IndexedList
+from qdagview.managers.bitree import BiTree
+from qdagview.managers import TreeWidgetIndexManager
+
+
+def test_indexed_list_matches_list():
+    rng = random.Random(0)
+    indexed = IndexedList[int]()
+    expected = []
+    handles = {}
+    for value in range(500):
+        if expected and rng.random() < 0.3:
+            position = rng.randrange(len(expected))
+            assert indexed.pop(position) == expected.pop(position)
+        else:
+            position = rng.randint(0, len(expected))
+            handles[value] = indexed.insert(position, value)
+            expected.insert(position, value)
+
+    assert list(indexed) == expected
+    assert len(indexed) == len(expected)
+    assert [indexed[i] for i in range(len(expected))] == expected
+    for position, value in enumerate(expected):
+        assert indexed.position(handles[value]) == position
+
+def test_indexed_list_out_of_range():
+    indexed = IndexedList[str]()
+    indexed.append("a")
+    with pytest.raises(IndexError):
+        indexed.insert(3, "b")
+    with pytest.raises(IndexError):
+        indexed[1]
+    with pytest.raises(IndexError):
+        indexed.pop(1)
+
+def test_bitree_paths_follow_sibling_shifts():
+    tree = BiTree()
+    tree.insert((0,), "A")
+    tree.insert((1,), "B")
+    tree.insert((1, 0), "B.in")
+    assert tree.index("B.in") == (1, 0)
+
+    tree.insert((0,), "C")
+    assert tree.index("B.in") == (2, 0)
+    assert tree.get((2, 0)) == "B.in"
+
+    assert sorted(tree.remove((0,))) == ["C"]
+    assert tree.index("B") == (1,)
+    assert sorted(tree.remove((1,))) == ["B", "B.in"]
+    assert "B.in" not in tree
+    assert list(tree.items()) == [((0,), "A")]
+
+def test_tree_widget_manager(qapp):
+    model = QStandardItemModel()
+    node1, node2 = QStandardItem("node1"), QStandardItem("node2")
+    node2.appendRow(QStandardItem("inlet"))
+    model.appendRow(node1)
+    model.appendRow(node2)
+
+    manager = TreeWidgetIndexManager()
+    node1_widget, node2_widget, inlet_widget = QGraphicsRectItem(), QGraphicsRectItem(), QGraphicsRectItem()
+    manager.insertWidget(model.index(0, 0), node1_widget)
+    manager.insertWidget(model.index(1, 0), node2_widget)
+    manager.insertWidget(model.index(0, 0, model.index(1, 0)), inlet_widget, allow_children=False)
+    assert manager.widgets() == [node1_widget, node2_widget, inlet_widget]
+
+    # remove the first node, the others shift up
+    manager.removeWidget(model.index(0, 0))
+    model.removeRow(0)
+    assert manager.getIndex(node2_widget) == model.index(0, 0)
+    assert manager.getIndex(inlet_widget) == model.index(0, 0, model.index(0, 0))
+    assert manager.getWidget(model.index(0, 0)) is node2_widget
+    assert manager.getIndex(node1_widget) is None
+
+    # removing a node removes its children
+    manager.removeWidget(model.index(0, 0))
+    assert manager.widgets() == []
+    assert manager.getIndex(inlet_widget) is None
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex
+from qtpy.QtGui import QStandardItemModel
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.models import NXGraphModel
+
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    return controller
+
+def test_add_nodes_inserts_rows_at_once(controller):
+    calls = []
+    controller.sourceModel().rowsInserted.connect(lambda parent, start, end: calls.append( (start, end) ) if not parent.isValid() else None)
+    nodes = controller.addNodes(10)
+
+    assert calls == [(0, 9)]
+    assert [node.row() for node in nodes] == list(range(10))
+    assert controller.nodesCount() == 10
+
+def test_add_links(controller):
+    nodes = controller.addNodes(4)
+    pairs = [(controller.outlets(source)[0], controller.inlets(target)[0]) for source, target in zip(nodes, nodes[1:])]
+
+    emitted = []
+    controller.linksInserted.connect(emitted.append)
+    links = controller.addLinks(pairs)
+
+    assert len(emitted) == 1, "links are emitted as a single batch"
+    assert emitted[0] == links
+    for link, (outlet, inlet) in zip(links, pairs):
+        assert controller.linkSource(link) == outlet
+        assert controller.linkTarget(link) == inlet
+
+def test_add_inlets(qapp):
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(QStandardItemModel())
+    node, = controller.addNodes(1)
+
+    emitted = []
+    controller.inletsInserted.connect(emitted.append)
+    inlets = controller.addInlets(node, 3)
+
+    assert emitted == [inlets]
+    assert [controller.attributeData(inlet) for inlet in inlets] == ["in#1", "in#2", "in#3"]
+
+def test_nx_graphmodel_bulk_creation(qapp):
+    model = NXGraphModel()
+    emitted = []
+    model.nodesInserted.connect(lambda nodes: emitted.append(len(nodes)))
+
+    source, target = model.addNodes([None, None])
+    assert emitted == [2]
+    assert (source.name(), target.name()) == ("node", "node1")
+
+    outlets = model.addOutlets(source, [None, None])
+    inlets = model.addInlets(target, ["x"])
+    assert [outlet.name() for outlet in outlets] == ["out", "out1"]
+
+    links = model.addLinks([(outlets[0], inlets[0]), (outlets[1], inlets[0]), (outlets[0], inlets[0])])
+    assert len(links) == 2, "the duplicate link is skipped"
+    assert model.linkCount() == 2
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
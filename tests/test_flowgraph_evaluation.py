@@ -0,0 +1,105 @@
+import pytest
+
+import logging
+
+from qdagview.examples.flowgraph import FlowGraph, ExpressionOperator
+from qdagview.examples.flowgraph_evaluation import EvaluationError
+
+
+def _chain():
+    """x=2, y=3 -> s=a+b -> t=a*10"""
+    graph = FlowGraph()
+    x = graph.createOperator("2", "x")
+    y = graph.createOperator("3", "y")
+    s = graph.createOperator("a+b", "s")
+    t = graph.createOperator("a*10", "t")
+    graph.insertLink(0, x.outlets()[0], s.inlets()[0])
+    graph.insertLink(0, y.outlets()[0], s.inlets()[1])
+    graph.insertLink(0, s.outlets()[0], t.inlets()[0])
+    return graph, x, y, s, t
+
+
+def test_evaluate_chain():
+    graph, x, y, s, t = _chain()
+    assert graph.evaluate(t) == 50
+    assert graph.evaluate(s) == 5
+    assert graph.evaluator().stats() == {"computed": 4}
+
+
+def test_clean_graph_is_not_recomputed():
+    graph, x, y, s, t = _chain()
+    graph.evaluate(t)
+    graph.evaluator().resetStats()
+    assert graph.evaluate(t) == 50
+    assert graph.evaluator().stats() == {}
+
+
+def test_edit_recomputes_descendants_only():
+    graph, x, y, s, t = _chain()
+    other = graph.createOperator("7", "other")
+    graph.evaluate(t)
+    graph.evaluate(other)
+    graph.evaluator().resetStats()
+
+    x.setExpression("4")
+    assert graph.evaluator().isDirty(x)
+    assert graph.evaluator().isDirty(t)
+    assert not graph.evaluator().isDirty(y)
+    assert not graph.evaluator().isDirty(other)
+
+    assert graph.evaluate(t) == 70
+    assert graph.evaluator().stats() == {"computed": 3} # x, s and t
+
+
+def test_early_cutoff():
+    graph, x, y, s, t = _chain()
+    graph.evaluate(t)
+    graph.evaluator().resetStats()
+
+    x.setExpression("1+1") # same value
+    assert graph.evaluate(t) == 50
+    assert graph.evaluator().stats() == {"computed": 1, "reused": 2}
+
+
+def test_link_changes_invalidate_target():
+    graph, x, y, s, t = _chain()
+    z = graph.createOperator("20", "z")
+    graph.evaluate(t)
+
+    link = graph.inLinks(s.inlets()[0])[0]
+    graph.setLinkSource(link, z.outlets()[0])
+    assert graph.evaluate(t) == 230
+
+    graph.removeLink(link)
+    with pytest.raises(EvaluationError):
+        graph.evaluate(t) # 'a' is not connected anymore
+
+    graph.insertLink(0, x.outlets()[0], s.inlets()[0])
+    assert graph.evaluate(t) == 50
+
+
+def test_removed_operator_is_forgotten():
+    graph, x, y, s, t = _chain()
+    graph.evaluate(t)
+    graph.removeOperator(x)
+    assert graph.evaluator().result(x) is None
+    assert graph.evaluator().isDirty(t)
+    x.setExpression("4") # not in the graph anymore
+    assert not graph.evaluator().isDirty(y)
+
+
+def test_evaluation_error():
+    graph = FlowGraph()
+    op = graph.createOperator("1/0", "op")
+    with pytest.raises(EvaluationError) as info:
+        graph.evaluate(op)
+    assert info.value.operator is op
+    assert isinstance(info.value.error, ZeroDivisionError)
+
+    op.setExpression("1/2")
+    assert graph.evaluate(op) == 0.5
+
+
+if __name__ == "__main__": # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
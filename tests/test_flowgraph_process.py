@@ -0,0 +1,116 @@
+import pytest
+
+import gc
+import logging
+import threading
+
+import numpy as np
+
+from qdagview.examples.flowgraph import FlowGraph, ExpressionOperator
+from qdagview.examples.flowgraph_evaluation import EvaluationError
+from qdagview.examples import flowgraph_process
+from qdagview.examples.flowgraph_process import ProcessFlowGraphScheduler
+from qdagview.examples.flowgraph_scheduler import _timedEvaluate
+
+
+@pytest.fixture
+def graph():
+    return FlowGraph()
+
+@pytest.fixture
+def scheduler(graph):
+    with ProcessFlowGraphScheduler(graph.evaluator(), max_workers=2, min_shared_bytes=1024) as scheduler:
+        yield scheduler
+
+
+def test_pure_python_expressions(graph, scheduler):
+    x = graph.createOperator("sum(range(1000))", "x")
+    y = graph.createOperator("a*2", "y")
+    graph.insertLink(0, x.outlets()[0], y.inlets()[0])
+    assert scheduler.evaluate(y) == 2 * sum(range(1000))
+
+    x.setExpression("1")
+    assert scheduler.evaluate(y) == 2
+
+
+def test_arrays_are_passed_in_shared_memory(graph, scheduler):
+    x = graph.createOperator("__import__('numpy').arange(1000.0)", "x")
+    y = graph.createOperator("a*2", "y")
+    small = graph.createOperator("a[:3]", "small")
+    graph.insertLink(0, x.outlets()[0], y.inlets()[0])
+    graph.insertLink(0, y.outlets()[0], small.inlets()[0])
+
+    assert scheduler.evaluate(small).tolist() == [0.0, 2.0, 4.0]
+    result = graph.evaluator().result(y).value
+    assert np.array_equal(result, np.arange(1000.0) * 2)
+    assert scheduler._sharedRef(result) is not None # a view of the block written by the worker
+    assert not result.flags.writeable
+    assert scheduler._sharedRef(graph.evaluator().result(small).value) is None # small values are pickled
+
+    del result
+    graph.evaluator().clear()
+    gc.collect()
+    assert scheduler._shared == {} # the blocks are freed with their arrays
+
+
+def test_in_process_fallback(graph, scheduler):
+    class Custom(ExpressionOperator):
+        def evaluate(self, **inputs):
+            return 40
+
+    custom = Custom("0", "custom")
+    graph.appendOperator(custom)
+    f = graph.createOperator("lambda v: v + 1", "f")
+    graph.evaluate(f) # a lambda cannot be returned from a worker, but can be evaluated here
+    call = graph.createOperator("a(b)", "call")
+    graph.insertLink(0, f.outlets()[0], call.inlets()[0])
+    graph.insertLink(0, custom.outlets()[0], call.inlets()[1])
+
+    assert scheduler.evaluate(call) == 41
+
+
+def test_unpicklable_results_are_evaluated_in_process(graph, scheduler):
+    f = graph.createOperator("lambda v: v + 1", "f")
+    assert scheduler.evaluate(f)(1) == 2
+
+def test_unpicklable_results_are_evaluated_on_the_calling_thread(graph, scheduler, monkeypatch):
+    threads = []
+    def timedEvaluate(operator, values):
+        threads.append(threading.get_ident())
+        return _timedEvaluate(operator, values)
+    monkeypatch.setattr(flowgraph_process, "_timedEvaluate", timedEvaluate)
+
+    f = graph.createOperator("lambda v: v + 1", "f")
+    assert scheduler.evaluate(f)(1) == 2
+    assert threads == [threading.get_ident()] # not on the thread handling the results of the workers
+
+def test_inputs_are_pickled_once(graph, scheduler):
+    class Counted:
+        reductions = 0
+        def __reduce__(self):
+            Counted.reductions += 1
+            return int, (5, )
+
+    class Source(ExpressionOperator):
+        def evaluate(self, **inputs):
+            return Counted()
+
+    source = Source("0", "source")
+    graph.appendOperator(source)
+    y = graph.createOperator("a+1", "y")
+    graph.insertLink(0, source.outlets()[0], y.inlets()[0])
+
+    assert scheduler.evaluate(y) == 6
+    assert Counted.reductions == 1
+
+def test_worker_errors_are_captured(graph, scheduler):
+    bad = graph.createOperator("1/0", "bad")
+    with pytest.raises(EvaluationError) as info:
+        scheduler.evaluate(bad)
+    assert isinstance(info.value.error, ZeroDivisionError)
+    assert list(scheduler.errors()) == [bad]
+
+
+if __name__ == "__main__": # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
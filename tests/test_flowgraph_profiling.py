@@ -0,0 +1,128 @@
+import pytest
+
+import io
+import logging
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import QModelIndex, QRect, Qt
+from qtpy.QtGui import QImage, QPainter, QColor, QPalette
+from qtpy.QtWidgets import QStyleOptionViewItem, QStyle
+
+from qdagview.core import GraphDataRole
+from qdagview.delegates.graphview_delegate import GraphDelegate
+from qdagview.examples.flowgraph import FlowGraph
+from qdagview.examples.flowgraphmodel import FlowGraphModel, ProfileRole
+from qdagview.controllers import GraphController_for_QTreeModel
+
+
+def test_evaluator_profiles_operators():
+    graph = FlowGraph()
+    x = graph.createOperator("1000", "x")
+    y = graph.createOperator("__import__('numpy').zeros(a)", "y")
+    a = next(inlet for inlet in y.inlets() if inlet.name == "a") # builtins are inlets too
+    graph.insertLink(0, x.outlets()[0], a)
+    evaluator = graph.evaluator()
+    assert evaluator.profile(y) is None
+    assert evaluator.cost(y) is None
+
+    graph.evaluate(y)
+    profile = evaluator.profile(y)
+    assert (profile.calls, profile.cache_hits, profile.output_size) == (1, 0, 8000)
+    assert profile.total_time > 0
+    assert max(evaluator.cost(x), evaluator.cost(y)) == 1.0
+
+    x.setExpression("999+1") # recomputed, same value
+    graph.evaluate(y)
+    assert evaluator.profile(x).calls == 2
+    assert (evaluator.profile(y).calls, evaluator.profile(y).cache_hits) == (1, 1)
+
+    evaluator.resetProfiles()
+    assert evaluator.profile(y) is None
+
+def test_cost_is_relative_to_the_remaining_operators():
+    graph = FlowGraph()
+    slow = graph.createOperator("sum(range(200000))", "slow")
+    fast = graph.createOperator("1", "fast")
+    graph.evaluate(slow)
+    graph.evaluate(fast)
+    evaluator = graph.evaluator()
+    assert evaluator.cost(slow) == 1.0 and evaluator.cost(fast) < 1.0
+
+    graph.removeOperator(slow)
+    assert evaluator.cost(fast) == 1.0
+
+
+@pytest.fixture
+def model(qapp) -> FlowGraphModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    with redirect_stdout(io.StringIO()):
+        for expression in ("2", "a*3"):
+            node = controller.addNode()
+            model.setData(QModelIndex(node).siblingAtColumn(1), expression)
+        controller.addLink(controller.outlets(controller.nodes()[0])[0], controller.inlets(controller.nodes()[1])[0])
+    return model
+
+def test_model_exposes_profile(model):
+    y = model.index(1, 0)
+    assert model.data(y, ProfileRole.CallCountRole) is None
+    assert model.data(y.siblingAtColumn(4)) == ""
+
+    assert model.evaluate(y) == 6
+    assert model.data(y, ProfileRole.CallCountRole) == 1
+    assert model.data(y, ProfileRole.CacheHitsRole) == 0
+    assert model.data(y, ProfileRole.WallTimeRole) > 0
+    assert 0 <= model.data(y, GraphDataRole.CostRole) <= 1
+
+    assert [model.headerData(column, Qt.Orientation.Horizontal) for column in model.PROFILE_COLUMNS] == ["time", "calls", "cache hits", "output size"]
+    assert model.data(y.siblingAtColumn(4)) == "1"
+    assert model.data(y.siblingAtColumn(6)).endswith(" B")
+    assert not model.flags(y.siblingAtColumn(3)) & Qt.ItemFlag.ItemIsEditable
+
+
+def _paintNode(delegate:GraphDelegate, model:FlowGraphModel, row:int) -> QColor:
+    image = QImage(20, 20, QImage.Format.Format_ARGB32)
+    image.fill(Qt.GlobalColor.transparent)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 20, 20)
+    option.state = QStyle.StateFlag.State_Enabled
+    option.palette.setColor(QPalette.ColorRole.AlternateBase, QColor(0, 0, 0))
+    painter = QPainter(image)
+    delegate.paintNodeSimplified(painter, option, model.index(row, 0))
+    painter.end()
+    return image.pixelColor(10, 10)
+
+def test_delegate_cost_heatmap(model):
+    operators = model.invisibleRootItem().operators()
+    model.evaluate(model.index(1, 0))
+    evaluator = model.invisibleRootItem().evaluator()
+    evaluator.profile(operators[0]).total_time = 0.0
+    evaluator.profile(operators[1]).total_time = evaluator._max_total_time = 1.0 # the slowest
+
+    delegate = GraphDelegate()
+    assert _paintNode(delegate, model, 1) == QColor(0, 0, 0)
+
+    delegate.setCostHeatmap(True, QColor(255, 0, 0))
+    assert _paintNode(delegate, model, 0) == QColor(0, 0, 0)
+    assert _paintNode(delegate, model, 1) == QColor(255, 0, 0)
+    assert delegate.heatmapColor(QColor(0, 0, 0), 0.5).red() in (127, 128)
+
+def test_removing_the_slowest_operator_updates_the_costs(model):
+    operators = model.invisibleRootItem().operators()
+    model.evaluate(model.index(1, 0))
+    evaluator = model.invisibleRootItem().evaluator()
+    evaluator.profile(operators[0]).total_time = 0.5
+    evaluator.profile(operators[1]).total_time = evaluator._max_total_time = 1.0 # the slowest
+
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.extend(roles))
+    with redirect_stdout(io.StringIO()):
+        assert model.removeRows(1, 1, QModelIndex())
+    assert GraphDataRole.CostRole in changed
+    assert model.data(model.index(0, 0), GraphDataRole.CostRole) == 1.0
+
+
+if __name__ == "__main__": # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+import pytest
+
+import logging
+import threading
+from typing import List
+
+from qdagview.examples import flowgraph
+from qdagview.examples.flowgraph import FlowGraph, ExpressionOperator
+from qdagview.examples.flowgraph_evaluation import EvaluationError, EvaluationCancelled
+from qdagview.examples.flowgraph_scheduler import FlowGraphScheduler
+
+
+class BarrierOperator(ExpressionOperator):
+    """Waits for the other branches, so it only completes when they run concurrently."""
+    def __init__(self, expression, name, barrier:threading.Barrier):
+        super().__init__(expression, name)
+        self.barrier = barrier
+
+    def evaluate(self, **inputs):
+        self.barrier.wait(timeout=5)
+        return super().evaluate(**inputs)
+
+
+def _wide(graph:FlowGraph, branches:List[ExpressionOperator]) -> ExpressionOperator:
+    """Sum the branches."""
+    names = [f"v{i}" for i in range(len(branches))]
+    total = graph.createOperator("+".join(names), "total")
+    for branch, inlet in zip(branches, total.inlets()):
+        graph.insertLink(0, branch.outlets()[0], inlet)
+    return total
+
+
+def test_matches_serial_evaluation():
+    graph = FlowGraph()
+    x = graph.createOperator("3", "x")
+    branches = []
+    for i in range(6):
+        op = graph.createOperator(f"a*{i}", f"b{i}")
+        graph.insertLink(0, x.outlets()[0], op.inlets()[0])
+        branches.append(op)
+    total = _wide(graph, branches)
+
+    with FlowGraphScheduler(graph.evaluator(), max_workers=3) as scheduler:
+        assert scheduler.evaluate(total) == 3 * sum(range(6))
+        assert graph.evaluator().stats() == {"computed": 8}
+
+        graph.evaluator().resetStats()
+        x.setExpression("1")
+        assert scheduler.evaluate(total) == sum(range(6))
+        assert graph.evaluate(total) == sum(range(6))
+        assert graph.evaluator().stats() == {"computed": 8}
+
+
+def test_branches_run_concurrently():
+    graph = FlowGraph()
+    barrier = threading.Barrier(4)
+    branches = []
+    for i in range(4):
+        op = BarrierOperator(f"{i}", f"b{i}", barrier)
+        graph.appendOperator(op)
+        branches.append(op)
+    total = _wide(graph, branches)
+
+    with FlowGraphScheduler(graph.evaluator(), max_workers=4) as scheduler:
+        assert scheduler.evaluate(total) == 6
+
+
+def test_errors_are_captured_per_operator():
+    graph = FlowGraph()
+    good = graph.createOperator("1", "good")
+    bad = graph.createOperator("1/0", "bad")
+    child = graph.createOperator("a+1", "child")
+    graph.insertLink(0, bad.outlets()[0], child.inlets()[0])
+    total = _wide(graph, [good, child])
+
+    with FlowGraphScheduler(graph.evaluator(), max_workers=2) as scheduler:
+        with pytest.raises(EvaluationError) as info:
+            scheduler.evaluate(total)
+        assert info.value.operator is bad
+        assert list(scheduler.errors()) == [bad]
+        assert not graph.evaluator().isDirty(good) # the independent branch completed
+        assert graph.evaluator().isDirty(child)
+
+        bad.setExpression("2")
+        assert scheduler.evaluate(total) == 4
+        assert scheduler.errors() == {}
+
+
+def test_edit_during_evaluation_cancels():
+    graph = FlowGraph()
+    x = graph.createOperator("1", "x")
+    y = graph.createOperator("2", "y")
+
+    class EditingOperator(ExpressionOperator):
+        def evaluate(self, **inputs):
+            x.setExpression("10") # edited from another thread, while running
+            return super().evaluate(**inputs)
+
+    editing = EditingOperator("a+1", "editing")
+    graph.appendOperator(editing)
+    graph.insertLink(0, y.outlets()[0], editing.inlets()[0])
+    total = _wide(graph, [x, editing])
+
+    with FlowGraphScheduler(graph.evaluator(), max_workers=2) as scheduler:
+        with pytest.raises(EvaluationCancelled):
+            scheduler.evaluate(total)
+        assert graph.evaluator().isDirty(total)
+
+def test_stale_compile_does_not_stick(monkeypatch):
+    op = ExpressionOperator("1", "op")
+
+    def compileDuringEdit(source, *args):
+        monkeypatch.undo()
+        op.setExpression("2") # edited from another thread, while the old expression compiles
+        return compile(source, *args)
+    monkeypatch.setattr(flowgraph, "compile", compileDuringEdit, raising=False)
+
+    assert op.evaluate() == 1
+    assert op.evaluate() == 2
+
+
+if __name__ == "__main__": # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+import pytest
+
+import io
+import logging
+import threading
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import QModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.examples.flowgraph_evaluation import EvaluationError, EvaluationCancelled
+
+
+@pytest.fixture
+def controller(qtbot) -> GraphController_for_QTreeModel:
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(FlowGraphModel())
+    yield controller
+    controller.sourceModel().cancelEvaluation()
+    controller.sourceModel().waitForEvaluation()
+
+
+def _addOperator(controller:GraphController_for_QTreeModel, expression:str) -> QModelIndex:
+    model = controller.sourceModel()
+    with redirect_stdout(io.StringIO()):
+        node = QModelIndex(controller.addNode())
+        model.setData(node.siblingAtColumn(1), expression)
+    return node
+
+def _addLink(controller:GraphController_for_QTreeModel, source:QModelIndex, target:QModelIndex, inlet:int=0):
+    with redirect_stdout(io.StringIO()):
+        controller.addLink(controller.outlets(source)[0], controller.inlets(target)[inlet])
+
+
+def test_evaluate_async(qtbot, controller):
+    model = controller.sourceModel()
+    x = _addOperator(controller, "2")
+    y = _addOperator(controller, "3")
+    s = _addOperator(controller, "a*b")
+    _addLink(controller, x, s, 0)
+    _addLink(controller, y, s, 1)
+
+    evaluated = []
+    changed = []
+    model.operatorEvaluated.connect(lambda index, duration, summary: evaluated.append((index.row(), summary)))
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append((top.row(), bottom.row(), top.column())) if top.column() > 0 else None)
+
+    with qtbot.waitSignal(model.evaluationStarted, timeout=1000):
+        with qtbot.waitSignal(model.evaluationFinished, timeout=5000) as finished:
+            model.evaluateAsync(s)
+
+    index, result, error = finished.args
+    assert (index.row(), result, error) == (s.row(), 6, None)
+    assert sorted(evaluated) == [(0, "2"), (1, "3"), (2, "6")]
+    assert model.data(s.siblingAtColumn(model.RESULT_COLUMN)) == "6"
+    assert {column for _, _, column in changed} == {model.RESULT_COLUMN}
+    assert {row for top, bottom, _ in changed for row in range(top, bottom+1)} == {0, 1, 2}
+
+
+def test_results_are_coalesced(qtbot, controller):
+    model = controller.sourceModel()
+    for i in range(5):
+        _addOperator(controller, f"{i}")
+    graph = model.invisibleRootItem()
+    for op in graph.operators():
+        graph.evaluate(op)
+
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append((top.row(), bottom.row(), top.column(), bottom.column())))
+    for row in (3, 1, 2):
+        model._operatorDone.emit(graph.operators()[row], 0.0, row)
+    qtbot.waitUntil(lambda: len(changed) > 0, timeout=1000)
+    assert changed == [
+        (1, 3, model.RESULT_COLUMN, model.columnCount()-1), # results and profiles
+        (0, 4, 0, 0) # costs
+    ]
+
+
+def test_errors_are_shown_in_result_column(qtbot, controller):
+    model = controller.sourceModel()
+    bad = _addOperator(controller, "1/0")
+
+    with qtbot.waitSignal(model.evaluationFinished, timeout=5000) as finished:
+        model.evaluateAsync(bad)
+    assert isinstance(finished.args[2], EvaluationError)
+    assert model.data(bad.siblingAtColumn(model.RESULT_COLUMN)).startswith("error: ZeroDivisionError")
+
+    model.setData(bad.siblingAtColumn(1), "1/2")
+    assert model.evaluate(bad) == 0.5
+    assert model.data(bad.siblingAtColumn(model.RESULT_COLUMN)) == "0.5"
+
+
+def test_newer_request_supersedes(qtbot, controller):
+    model = controller.sourceModel()
+    release = threading.Event()
+    slow = _addOperator(controller, "0")
+    other = _addOperator(controller, "1")
+    slow_operator = model.invisibleRootItem().operators()[slow.row()]
+    slow_operator.evaluate = lambda **inputs: release.wait(5) and 42 # blocks the evaluation thread
+
+    finished = []
+    model.evaluationFinished.connect(lambda index, result, error: finished.append((index.row(), result, error)))
+    model.evaluateAsync(slow)
+    model.evaluateAsync(other) # cancels the running evaluation
+    release.set()
+    qtbot.waitUntil(lambda: len(finished) == 2, timeout=5000)
+
+    (first_row, _, first_error), second = finished
+    assert first_row == slow.row() and isinstance(first_error, EvaluationCancelled)
+    assert second == (other.row(), 1, None)
+
+
+def test_edit_cancels_evaluation(qtbot, controller):
+    model = controller.sourceModel()
+    running, release = threading.Event(), threading.Event()
+    slow = _addOperator(controller, "0")
+    slow_operator = model.invisibleRootItem().operators()[slow.row()]
+    slow_operator.evaluate = lambda **inputs: running.set() or release.wait(5) and 42
+
+    with qtbot.waitSignal(model.evaluationFinished, timeout=5000) as finished:
+        model.evaluateAsync(slow)
+        assert running.wait(5)
+        model.setData(slow.siblingAtColumn(1), "7") # edited while running
+        release.set()
+    assert isinstance(finished.args[2], EvaluationCancelled)
+
+
+if __name__ == "__main__": # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QPointF, QRectF, QLineF
+from qtpy.QtWidgets import QGraphicsScene
+
+from qdagview.utils import makeLineBetweenShapes, batchLinesBetweenShapes, ShapeDescriptor, ShapeKind, shapeDescriptor
+from qdagview.widgets import PortWidget
+
+
+def _distance(a:QPointF, b:QPointF) -> float:
+    return QLineF(a, b).length()
+
+def test_batch_lines_to_circle_and_rounded_rect():
+    circle = ShapeDescriptor(ShapeKind.ELLIPSE, 0, 0, 10, 10)
+    rounded = ShapeDescriptor(ShapeKind.ROUNDED_RECT, 0, 0, 10, 10, radius=5)
+    rect = ShapeDescriptor.fromRect(QRectF(-10, -10, 20, 20))
+    diagonal = QPointF(100, 100)
+
+    circle_line, rounded_line, rect_line = batchLinesBetweenShapes([circle, rounded, rect], [diagonal]*3, distance=0)
+    corner = 10 / 2**0.5
+    assert _distance(circle_line.p1(), QPointF(corner, corner)) < 1e-6
+    assert _distance(rounded_line.p1(), QPointF(5 + 5 / 2**0.5, 5 + 5 / 2**0.5)) < 1e-6
+    assert _distance(rect_line.p1(), QPointF(10, 10)) < 1e-6
+    assert rect_line.p2() == diagonal
+
+def test_batch_lines_are_offset_by_distance():
+    A = QRectF(0, 0, 10, 10)
+    B = QRectF(100, 0, 10, 10)
+    line, = batchLinesBetweenShapes([A], [B], distance=10)
+    assert _distance(line.p1(), QPointF(20, 5)) < 1e-6
+    assert _distance(line.p2(), QPointF(90, 5)) < 1e-6
+
+def test_batch_lines_match_path_based_lines(qapp):
+    scene = QGraphicsScene()
+    ports = []
+    for x, y in [(0, 0), (150, 80), (-40, 200), (300, -120)]:
+        port = PortWidget()
+        scene.addItem(port)
+        port.setPos(x, y)
+        ports.append(port)
+    assert shapeDescriptor(ports[0]) is not None, "ports with the default shape are analytic"
+
+    sources, targets = ports[:-1], ports[1:]
+    for expected, line in zip([makeLineBetweenShapes(A, B) for A, B in zip(sources, targets)], batchLinesBetweenShapes(sources, targets)):
+        # the path based routine intersects with a 1px wide stroke
+        assert _distance(expected.p1(), line.p1()) < 1.0
+        assert _distance(expected.p2(), line.p2()) < 1.0
+
+def test_degenerate_lines():
+    A = QPointF(5, 5)
+    line, = batchLinesBetweenShapes([A], [A])
+    assert line.p1() == A and line.p2() == A
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
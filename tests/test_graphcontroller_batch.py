@@ -0,0 +1,106 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QPersistentModelIndex
+from qtpy.QtGui import QStandardItemModel
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.widgets import PortWidget
+
+
+SIGNALS = [
+    'nodesInserted', 'inletsInserted', 'outletsInserted', 'linksInserted',
+    'nodesAboutToBeRemoved', 'inletsAboutToBeRemoved', 'outletsAboutToBeRemoved', 'linksAboutToBeRemoved',
+    'attributesDataChanged'
+]
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    return controller
+
+@pytest.fixture
+def emissions(controller):
+    emissions = []
+    for name in SIGNALS:
+        getattr(controller, name).connect(lambda *args, name=name: emissions.append( (name, args) ))
+    return emissions
+
+def test_batch_merges_insertions(controller, emissions):
+    with controller.batch():
+        nodes = [controller.addNode() for _ in range(50)]
+        for source, target in zip(nodes, nodes[1:]):
+            controller.addLink(controller.outlets(source)[0], controller.inlets(target)[0])
+        assert emissions == []
+
+    names = [name for name, _ in emissions]
+    assert names.count('nodesInserted') == 1
+    assert names.count('linksInserted') == 1
+    assert 'linksAboutToBeRemoved' not in names, "links are only reported once their source is set"
+
+    _, (inserted_nodes, ) = next(emission for emission in emissions if emission[0] == 'nodesInserted')
+    assert inserted_nodes == nodes
+    _, (inserted_links, ) = next(emission for emission in emissions if emission[0] == 'linksInserted')
+    assert inserted_links == controller.links()
+
+def test_items_added_and_removed_in_a_batch_are_not_emitted(controller, emissions):
+    controller.beginBatch()
+    node1, node2 = controller.addNode(), controller.addNode()
+    controller.removeNode(node1)
+    controller.endBatch()
+
+    assert emissions == [('nodesInserted', ([QPersistentModelIndex(node2)], ))]
+
+def test_removing_existing_items_flushes_the_batch(controller, emissions):
+    existing = controller.addNode()
+    emissions.clear()
+
+    with controller.batch():
+        node = controller.addNode()
+        controller.removeNode(existing)
+        assert [name for name, _ in emissions] == ['nodesInserted', 'nodesAboutToBeRemoved']
+
+    assert [name for name, _ in emissions] == ['nodesInserted', 'nodesAboutToBeRemoved']
+    assert emissions[0][1] == ([QPersistentModelIndex(node)], )
+
+def test_nested_batches(controller, emissions):
+    with controller.batch():
+        with controller.batch():
+            controller.addNode()
+        assert controller.isBatching()
+        assert emissions == []
+    assert not controller.isBatching()
+    assert [name for name, _ in emissions] == ['nodesInserted']
+
+def test_ports_inserted_with_their_node_are_created_once(qtbot):
+    view = QItemModel_GraphView()
+    view.setModel(QStandardItemModel())
+    qtbot.addWidget(view)
+    controller = view._controller
+
+    emissions = []
+    controller.inletsInserted.connect(emissions.append)
+    with controller.batch():
+        node = controller.addNode()
+        controller.addInlet(node)
+        controller.addInlet(node)
+    assert emissions == [], "the ports are reported with their node"
+
+    existing = controller.addNode()
+    with controller.batch():
+        controller.addInlet(existing)
+    assert len(emissions) == 1
+
+    port_widgets = [item for item in view.scene().items() if isinstance(item, PortWidget)]
+    assert len(port_widgets) == 3
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,53 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.core import GraphItemType
+
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    return controller
+
+def test_types_are_cached_when_rows_are_inserted(controller):
+    node = controller.addNode()
+    assert QPersistentModelIndex(node) in controller._item_type_cache
+    for inlet in controller.inlets(node):
+        assert controller._item_type_cache[QPersistentModelIndex(inlet)] == GraphItemType.INLET
+    for outlet in controller.outlets(node):
+        assert controller._item_type_cache[QPersistentModelIndex(outlet)] == GraphItemType.OUTLET
+
+def test_cached_types_match_the_model(controller):
+    node1, node2 = controller.addNode(), controller.addNode()
+    link = controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+
+    for index in [node1, node2, link, *controller.inlets(node2), *controller.outlets(node1)]:
+        assert controller.itemType(index) == controller._queryItemType(index)
+
+def test_removed_rows_are_dropped_from_the_cache(controller):
+    node1, node2 = controller.addNode(), controller.addNode()
+    controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+    controller.itemType(controller.sourceModel().index(0, 1, QModelIndex())) # attribute columns are cached too
+
+    controller.removeNode(node1)
+    controller.removeNode(node2)
+    assert controller._item_type_cache == {}
+
+def test_disable_item_type_cache(controller):
+    controller.setItemTypeCacheEnabled(False)
+    node = controller.addNode()
+    assert controller.itemType(node) == GraphItemType.NODE
+    assert controller._item_type_cache == {}
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QPersistentModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.managers import LinkingManager
+
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    return controller
+
+def test_linking_manager_queries():
+    manager = LinkingManager[str, str, str]()
+    manager.link("link1", "out", "in1", "A", "B")
+    manager.link("link2", "out", "in2", "A", "C")
+
+    assert manager.getLinks() == ["link1", "link2"]
+    assert manager.getOutletLinks("out") == ["link1", "link2"]
+    assert manager.getNodeOutLinks("A") == ["link1", "link2"]
+    assert manager.getNodeInLinks("C") == ["link2"]
+
+    manager.unlink("link1")
+    assert manager.linkCount() == 1
+    assert manager.getInletLinks("in1") == []
+    assert manager.getNodeInLinks("B") == []
+    assert manager.getNodeOutLinks("A") == ["link2"]
+
+def test_linking_manager_returns_copies():
+    manager = LinkingManager[str, str, str]()
+    manager.link("link", "out", "in")
+    manager.getInletLinks("in").clear()
+    assert manager.getInletLinks("in") == ["link"]
+
+def test_link_queries(controller):
+    node1, node2, node3 = controller.addNode(), controller.addNode(), controller.addNode()
+    link1 = controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+    link2 = controller.addLink(controller.outlets(node1)[0], controller.inlets(node3)[0])
+
+    assert controller.links() == [QPersistentModelIndex(link1), QPersistentModelIndex(link2)]
+    assert controller.linkCount() == 2
+    assert controller.links(controller.outlets(node1)[0]) == [QPersistentModelIndex(link1), QPersistentModelIndex(link2)]
+    assert controller.links(controller.inlets(node3)[0]) == [QPersistentModelIndex(link2)]
+    assert controller.outLinks(node1) == [QPersistentModelIndex(link1), QPersistentModelIndex(link2)]
+    assert controller.inLinks(node2) == [QPersistentModelIndex(link1)]
+    assert controller.inLinks(node1) == []
+
+def test_registry_follows_removals(controller):
+    node1, node2 = controller.addNode(), controller.addNode()
+    link = controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+
+    controller.removeLink(link)
+    assert controller.links() == []
+    assert controller.outLinks(node1) == []
+    assert controller.inLinks(node2) == []
+
+def test_existing_links_are_registered_with_the_model(controller):
+    node1, node2 = controller.addNode(), controller.addNode()
+    controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+
+    other = GraphController_for_QTreeModel()
+    other.setSourceModel(controller.sourceModel())
+    assert other.links() == controller.links()
+    assert other.outLinks(node1) == controller.links()
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
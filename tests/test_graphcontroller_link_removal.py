@@ -0,0 +1,46 @@
+import pytest
+
+import logging
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.controllers.graphcontroller_for_qtreemodel import sequence_to_ranges
+
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    return controller
+
+def test_sequence_to_ranges():
+    assert sequence_to_ranges([10, 1, 2, 3, 7, 8]) == [(1, 3), (7, 2), (10, 1)]
+    assert sequence_to_ranges([]) == []
+
+def test_removing_a_hub_node_removes_its_links_in_ranges(controller):
+    hub, *sources = controller.addNodes(21)
+    inlet = controller.inlets(hub)[0]
+    controller.addLinks([(controller.outlets(source)[0], inlet) for source in sources])
+    assert controller.linkCount() == 20
+
+    announced = []
+    controller.linksAboutToBeRemoved.connect(announced.append)
+    link_removals = []
+    controller.sourceModel().rowsAboutToBeRemoved.connect(
+        lambda parent, start, end: link_removals.append( (start, end) ) if parent == inlet else None
+    )
+
+    controller.removeNode(hub)
+
+    assert len(announced) == 1, "links should be announced at once"
+    assert len(announced[0]) == 20
+    assert link_removals == [(0, 19)], "links of the inlet should be removed as a single range"
+    assert controller.linkCount() == 0
+    assert controller.nodesCount() == 20
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
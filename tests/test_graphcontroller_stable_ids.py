@@ -0,0 +1,162 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.controllers import GraphController_for_QTreeModel
+from qdagview.core import GraphDataRole
+from qdagview.views import QItemModel_GraphView
+from qdagview.managers import IdWidgetIndexManager
+
+
+@pytest.fixture
+def controller(qapp) -> GraphController_for_QTreeModel:
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    controller.setStableIdsEnabled(True)
+    return controller
+
+def _keys_are_ids(controller):
+    keys = list(controller._item_type_cache.keys()) + controller._link_manager.getLinks()
+    return not any(isinstance(key, QPersistentModelIndex) for key in keys)
+
+def test_links_are_keyed_by_id(controller):
+    with redirect_stdout(io.StringIO()):
+        node1, node2 = controller.addNode(), controller.addNode()
+        link = controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+
+    assert controller.hasStableIds()
+    assert controller.links() == [QPersistentModelIndex(link)]
+    assert controller.outLinks(node1) == [QPersistentModelIndex(link)]
+    assert controller.inLinks(node2) == [QPersistentModelIndex(link)]
+    assert controller.linkSource(link) == QPersistentModelIndex(controller.outlets(node1)[0])
+    assert controller.itemId(link) is not None
+    assert _keys_are_ids(controller)
+
+def test_index_from_id_follows_row_shifts(controller):
+    with redirect_stdout(io.StringIO()):
+        node1, node2 = controller.addNode(), controller.addNode()
+    node2_id = controller.itemId(node2)
+    assert controller.indexFromId(node2_id) == QModelIndex(node2)
+
+    controller.removeNode(node1)
+    assert controller.indexFromId(node2_id).row() == 0
+    assert controller.indexFromId(controller.itemId(node2)) == controller.nodes()[0]
+    assert controller.indexFromId("missing").isValid() == False
+
+def test_removals_with_stable_ids(controller):
+    with redirect_stdout(io.StringIO()):
+        node1, node2, node3 = controller.addNode(), controller.addNode(), controller.addNode()
+        controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+        controller.addLink(controller.outlets(node2)[0], controller.inlets(node3)[0])
+
+    controller.removeNode(node2)
+    assert controller.linkCount() == 0
+    assert controller.outLinks(node1) == []
+    assert controller.inLinks(controller.nodes()[1]) == []
+
+def test_ids_are_not_reused(controller):
+    with redirect_stdout(io.StringIO()):
+        node = controller.addNode()
+    removed_ids = {controller.itemId(item) for item in [node, *controller.inlets(node), *controller.outlets(node)]}
+    controller.removeNode(node)
+
+    with redirect_stdout(io.StringIO()):
+        for _ in range(10):
+            node = controller.addNode()
+            assert controller.itemId(node) not in removed_ids
+    for item_id in removed_ids:
+        assert not controller.indexFromId(item_id).isValid()
+
+def test_link_source_by_id_of_an_item_never_read(qapp):
+    model = FlowGraphModel()
+    graph = model.invisibleRootItem()
+    with redirect_stdout(io.StringIO()):
+        model.insertRows(0, 2, QModelIndex())
+    source, target = graph.operators()
+    inlet_index = model.index(0, 0, model.index(1, 0))
+    with redirect_stdout(io.StringIO()):
+        model.insertRows(0, 1, inlet_index)
+
+    assert model.setData(model.index(0, 0, inlet_index), source.outlets()[0].uid, GraphDataRole.SourceRole)
+    assert [link.source for link in graph.inLinks(target.inlets()[0])] == [source.outlets()[0]]
+
+    graph.removeOperator(source)
+    assert graph.itemByUid(source.uid()) is None
+    assert graph.itemByUid(source.outlets()[0].uid) is None
+
+def test_item_types_do_not_read_ids(controller, monkeypatch):
+    with redirect_stdout(io.StringIO()):
+        node = controller.addNode()
+    model = controller.sourceModel()
+    roles = []
+    monkeypatch.setattr(model, "data", lambda index, role=0, data=model.data: roles.append(role) or data(index, role))
+
+    for _ in range(3):
+        controller.itemType(node)
+        controller.itemType(controller.inlets(node)[0])
+    assert GraphDataRole.IdRole not in roles
+
+def test_toggling_rebuilds_registry(qapp):
+    model = FlowGraphModel()
+    controller = GraphController_for_QTreeModel()
+    controller.setSourceModel(model)
+    with redirect_stdout(io.StringIO()):
+        node1, node2 = controller.addNode(), controller.addNode()
+        link = controller.addLink(controller.outlets(node1)[0], controller.inlets(node2)[0])
+
+    controller.setStableIdsEnabled(True)
+    assert controller.links() == [QPersistentModelIndex(link)]
+    assert _keys_are_ids(controller)
+
+    controller.setStableIdsEnabled(False)
+    assert controller.links() == [QPersistentModelIndex(link)]
+    assert controller.linkSource(link) == QPersistentModelIndex(controller.outlets(node1)[0])
+
+
+def test_view_keeps_widgets_by_id(qtbot):
+    view = QItemModel_GraphView()
+    view.setModel(FlowGraphModel())
+    qtbot.addWidget(view)
+    view.setSynchronousLinkUpdates(True)
+    controller = view._controller
+    with redirect_stdout(io.StringIO()):
+        first = controller.addNode()
+    view.setStableIdsEnabled(True)
+    assert view.hasStableIds() and controller.hasStableIds()
+    assert isinstance(view._widget_manager, IdWidgetIndexManager)
+    assert view._widget_manager.getIndex(view._widget_manager.getWidget(first)) == QModelIndex(first), "existing rows are rebuilt"
+
+    with redirect_stdout(io.StringIO()):
+        source, target = controller.addNode(), controller.addNode()
+        link = controller.addLink(controller.outlets(source)[0], controller.inlets(target)[0])
+    managers = [view._widget_manager, view._cell_manager]
+    assert not any(isinstance(key, QPersistentModelIndex) for manager in managers for key in manager._widgets)
+    inlet_widget = view._widget_manager.getWidget(controller.inlets(target)[0])
+    assert inlet_widget.property("modelIndex") == controller.itemId(controller.inlets(target)[0])
+
+    # ports report their ID, and the links follow
+    line = view.linkLine(link)
+    view._widget_manager.getWidget(source).moveBy(0, 50)
+    assert view.linkLine(link) != line
+
+    # indexes are resolved after rows shifted
+    controller.removeNode(first)
+    source_widget = view._widget_manager.getWidget(source)
+    assert view._widget_manager.getIndex(source_widget).row() == 0
+    assert view.itemAt(source_widget.sceneBoundingRect().center()) == QModelIndex(source)
+
+    view.setStableIdsEnabled(False)
+    assert not controller.hasStableIds()
+    assert view._widget_manager.getIndex(view._widget_manager.getWidget(target)) == QModelIndex(target)
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
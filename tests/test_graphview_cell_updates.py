@@ -0,0 +1,62 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import Qt, QPointF, QModelIndex
+from qtpy.QtGui import QStandardItemModel
+
+from qdagview.views import QItemModel_GraphView
+
+
+@pytest.fixture
+def view(qtbot):
+    model = QStandardItemModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    view.resize(400, 400)
+    qtbot.addWidget(view)
+    return view
+
+def test_throttled_updates_are_coalesced(qtbot, view):
+    node = view._controller.addNode()
+    view.centerOn(view._widget_manager.getWidget(node))
+    cell_widget = view._cell_manager.getWidget(node)
+    view.setThrottledCellUpdates(True)
+
+    texts = []
+    cell_widget.setText = lambda text, setText=cell_widget.setText: (texts.append(text), setText(text))
+    for value in range(100):
+        view.model().setData(QModelIndex(node), f"value {value}")
+    assert texts == [], "cells should wait for the next frame"
+
+    qtbot.waitUntil(lambda: texts == ["value 99"])
+    assert cell_widget.text() == "value 99"
+
+def test_unchanged_text_is_skipped(view):
+    node = view._controller.addNode()
+    view.model().setData(QModelIndex(node), "same")
+    cell_widget = view._cell_manager.getWidget(node)
+
+    texts = []
+    cell_widget.setText = lambda text: texts.append(text)
+    view.model().dataChanged.emit(QModelIndex(node), QModelIndex(node), [Qt.ItemDataRole.DisplayRole])
+    assert texts == []
+
+def test_offscreen_cells_wait_until_visible(view):
+    node = view._controller.addNode()
+    view._widget_manager.getWidget(node).setPos(QPointF(5000, 5000))
+    view.centerOn(QPointF(-5000, -5000))
+    view.setThrottledCellUpdates(True)
+
+    view.model().setData(QModelIndex(node), "offscreen")
+    view.flushCellUpdates()
+    assert view._cell_manager.getWidget(node).text() != "offscreen"
+
+    view.flushCellUpdates(offscreen=True)
+    assert view._cell_manager.getWidget(node).text() == "offscreen"
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
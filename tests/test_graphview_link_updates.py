@@ -0,0 +1,64 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QPointF
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.views import graphview_with_QItemModel
+
+
+@pytest.fixture
+def linked_view(qtbot):
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    qtbot.addWidget(view)
+
+    controller = view._controller
+    source, target = controller.addNode(), controller.addNode()
+    link = controller.addLink(controller.outlets(source)[0], controller.inlets(target)[0])
+    assert link is not None
+    view.flushLinkUpdates()
+    return view, source, target, link
+
+def test_link_updates_are_deferred_to_the_next_frame(qtbot, linked_view):
+    view, source, target, link = linked_view
+    link_widget = view._widget_manager.getWidget(link)
+    line_before = link_widget.mapToScene(link_widget.line().p1())
+
+    view._widget_manager.getWidget(source).moveBy(100, 0)
+    assert link_widget.mapToScene(link_widget.line().p1()) == line_before, "links should wait for the next frame"
+
+    qtbot.waitUntil(lambda: link_widget.mapToScene(link_widget.line().p1()) != line_before)
+
+def test_each_link_is_updated_once_per_flush(linked_view, monkeypatch):
+    view, source, target, link = linked_view
+    calls = []
+    original = graphview_with_QItemModel.batchLinesBetweenShapes
+    def countingBatchLines(sources, targets, *args, **kwargs):
+        calls.extend(zip(sources, targets))
+        return original(sources, targets, *args, **kwargs)
+    monkeypatch.setattr(graphview_with_QItemModel, "batchLinesBetweenShapes", countingBatchLines)
+
+    # moving both ends marks the link dirty twice
+    view._widget_manager.getWidget(source).moveBy(10, 0)
+    view._widget_manager.getWidget(target).moveBy(0, 10)
+    view.flushLinkUpdates()
+    assert len(calls) == 1
+
+def test_synchronous_link_updates(linked_view):
+    view, source, target, link = linked_view
+    view.setSynchronousLinkUpdates(True)
+    link_widget = view._widget_manager.getWidget(link)
+    line_before = link_widget.mapToScene(link_widget.line().p1())
+
+    view._widget_manager.getWidget(source).moveBy(100, 0)
+    assert link_widget.mapToScene(link_widget.line().p1()) != line_before
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QPointF, QPersistentModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.core import GraphItemType
+
+
+@pytest.fixture
+def virtualized_view(qtbot) -> QItemModel_GraphView:
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    view.resize(400, 300)
+    qtbot.addWidget(view)
+    view.show()
+    qtbot.waitExposed(view)
+    view.setVirtualized(True, margin=0)
+    return view
+
+def _addGrid(view:QItemModel_GraphView, count:int, spacing:float=1000) -> list[QPersistentModelIndex]:
+    controller = view._controller
+    nodes = [controller.addNode() for _ in range(count)]
+    for i, node in enumerate(nodes):
+        view.setNodePosition(node, QPointF(i * spacing, 0))
+    view.centerOn(0, 0)
+    view.updateMaterializedWidgets()
+    return nodes
+
+def test_only_visible_nodes_have_widgets(virtualized_view):
+    view = virtualized_view
+    nodes = _addGrid(view, 10)
+
+    assert view._widget_manager.getWidget(nodes[0]) is not None
+    assert all(view._widget_manager.getWidget(node) is None for node in nodes[1:])
+    assert view.nodePosition(nodes[5]) == QPointF(5000, 0)
+
+def test_widgets_follow_the_viewport(virtualized_view):
+    view = virtualized_view
+    nodes = _addGrid(view, 10)
+
+    view.centerOn(5000, 0)
+    view.updateMaterializedWidgets()
+    assert view._widget_manager.getWidget(nodes[0]) is None
+    assert view._widget_manager.getWidget(nodes[5]) is not None
+    assert view.rowAt(view.mapFromScene(QPointF(5010, 10))) == nodes[5]
+
+def test_moved_position_is_kept_when_widget_is_released(virtualized_view):
+    view = virtualized_view
+    nodes = _addGrid(view, 2)
+
+    view._widget_manager.getWidget(nodes[0]).setPos(QPointF(15, 25))
+    view.centerOn(1000, 0)
+    view.updateMaterializedWidgets()
+    assert view._widget_manager.getWidget(nodes[0]) is None
+    assert view.nodePosition(nodes[0]) == QPointF(15, 25)
+
+    view.centerOn(0, 0)
+    view.updateMaterializedWidgets()
+    assert view._widget_manager.getWidget(nodes[0]).pos() == QPointF(15, 25)
+
+def test_links_bring_their_other_node(virtualized_view):
+    view = virtualized_view
+    controller = view._controller
+    nodes = _addGrid(view, 10)
+
+    link = controller.addLink(controller.outlets(nodes[0])[0], controller.inlets(nodes[9])[0])
+    assert link is not None
+    view.updateMaterializedWidgets()
+    assert view._widget_manager.getWidget(nodes[9]) is not None, "the far end of a visible link needs a widget"
+    assert view._widget_manager.getWidget(link) is not None
+
+    view.centerOn(5000, 0)
+    view.updateMaterializedWidgets()
+    assert view._widget_manager.getWidget(link) is None
+    assert all(controller.itemType(view._widget_manager.getIndex(widget)) != GraphItemType.LINK for widget in view._widget_manager.widgets())
+
+def test_disable_virtualization_creates_all_widgets(virtualized_view):
+    view = virtualized_view
+    nodes = _addGrid(view, 10)
+
+    view.setVirtualized(False)
+    assert all(view._widget_manager.getWidget(node) is not None for node in nodes)
+    assert view._widget_manager.getWidget(nodes[5]).pos() == QPointF(5000, 0)
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
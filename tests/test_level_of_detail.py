@@ -0,0 +1,87 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtGui import QPainter
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.delegates.graphview_delegate import GraphDelegate, DetailLevel
+
+
+class RecordingDelegate(GraphDelegate):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def paintNode(self, painter, option, index):
+        self.calls.append("node")
+        super().paintNode(painter, option, index)
+
+    def paintNodeSimplified(self, painter, option, index):
+        self.calls.append("simplified node")
+        super().paintNodeSimplified(painter, option, index)
+
+    def paintInlet(self, painter, option, index):
+        self.calls.append("port")
+        super().paintInlet(painter, option, index)
+
+    def paintCell(self, painter, option, controller, index):
+        self.calls.append("cell")
+        super().paintCell(painter, option, controller, index)
+
+
+@pytest.fixture
+def view(qtbot) -> QItemModel_GraphView:
+    model = FlowGraphModel()
+    view = QItemModel_GraphView(delegate=RecordingDelegate())
+    view.setModel(model)
+    view.resize(400, 300)
+    qtbot.addWidget(view)
+    with redirect_stdout(io.StringIO()):
+        view._controller.addNode()
+    return view
+
+def test_detail_levels_from_thresholds():
+    delegate = GraphDelegate()
+    assert delegate.detailLevel(1.0) == DetailLevel.Full
+    assert delegate.detailLevel(0.4) == DetailLevel.NoCells
+    assert delegate.detailLevel(0.3) == DetailLevel.NoPorts
+    assert delegate.detailLevel(0.1) == DetailLevel.Shapes
+
+    delegate.setDetailThreshold(DetailLevel.Shapes, 0)
+    assert delegate.detailLevel(0.1) == DetailLevel.NoPorts, "a zero threshold disables the level"
+    assert delegate.detailThreshold(DetailLevel.Shapes) == 0
+
+def test_full_detail(view):
+    view.grab()
+    assert view.detailLevel() == DetailLevel.Full
+    assert {"node", "port", "cell"} <= set(view._delegate.calls)
+
+def test_zoomed_out_skips_cells_and_ports(view):
+    view.scale(0.3, 0.3)
+    view._delegate.calls.clear()
+    view.grab()
+    assert view.detailLevel() == DetailLevel.NoPorts
+    assert set(view._delegate.calls) == {"node"}
+
+def test_far_zoom_draws_shapes_without_antialiasing(view):
+    view.scale(0.1, 0.1)
+    view._delegate.calls.clear()
+    view.grab()
+    assert view.detailLevel() == DetailLevel.Shapes
+    assert set(view._delegate.calls) == {"simplified node"}
+    assert not view.renderHints() & QPainter.RenderHint.Antialiasing
+
+    view.resetTransform()
+    view.grab()
+    assert view.detailLevel() == DetailLevel.Full
+    assert view.renderHints() & QPainter.RenderHint.Antialiasing, "antialiasing is restored when zooming back in"
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
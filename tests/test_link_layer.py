@@ -0,0 +1,163 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import Qt, QPoint, QPointF, QLineF, QRectF, QItemSelectionModel, QModelIndex, QPersistentModelIndex
+from qtpy.QtWidgets import QStyle
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.managers import SegmentIndex
+from qdagview.widgets import LinkWidget
+
+
+def test_segment_index_query_nearest():
+    index = SegmentIndex[str](cell_size=10, padding=2)
+    index.insert("horizontal", QLineF(0, 0, 100, 0))
+    index.insert("vertical", QLineF(50, -50, 50, 50))
+
+    assert index.query(QPointF(20, 1), tolerance=2) == ["horizontal"]
+    assert index.query(QPointF(50.5, 1.5), tolerance=2) == ["vertical", "horizontal"], "nearest first"
+    assert index.query(QPointF(20, 5), tolerance=2) == []
+    assert index.query(QPointF(20, 5), tolerance=6) == ["horizontal"], "tolerance may exceed the padding"
+
+def test_segment_index_buckets_only_crossed_cells():
+    index = SegmentIndex[str](cell_size=10)
+    index.insert("diagonal", QLineF(0, 0, 1000, 1000))
+    assert len(index.cells("diagonal")) < 400, "a diagonal should not cover the cells of its bounding rect"
+    assert index.query(QPointF(500, 500)) == ["diagonal"]
+    assert index.query(QPointF(900, 100), tolerance=0) == []
+
+def test_segment_index_rect_update_and_remove():
+    index = SegmentIndex[str](cell_size=10)
+    index.insert("a", QLineF(0, 0, 30, 30))
+    assert index.queryRect(QRectF(10, 10, 5, 5)) == ["a"]
+    assert index.queryRect(QRectF(20, 0, 5, 5)) == []
+
+    index.update("a", QLineF(100, 100, 110, 100))
+    assert index.queryRect(QRectF(10, 10, 5, 5)) == []
+    assert index.query(QPointF(105, 100)) == ["a"]
+
+    index.remove("a")
+    assert len(index) == 0
+    assert index.query(QPointF(105, 100)) == []
+
+
+@pytest.fixture
+def layered_view(qtbot):
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    view.resize(600, 400)
+    qtbot.addWidget(view)
+    view.setSelectionModel(QItemSelectionModel(model))
+
+    controller = view._controller
+    with redirect_stdout(io.StringIO()):
+        source, target = controller.addNode(), controller.addNode()
+        view._widget_manager.getWidget(target).setPos(300, 200)
+        link = controller.addLink(controller.outlets(source)[0], controller.inlets(target)[0])
+    view.flushLinkUpdates()
+    view.setLinkLayerEnabled(True)
+    return view, source, target, QPersistentModelIndex(link)
+
+def test_links_move_into_the_layer(layered_view):
+    view, source, target, link = layered_view
+    layer = view.linkLayer()
+    assert view._widget_manager.getWidget(link) is None
+    assert not any(isinstance(item, LinkWidget) for item in view.scene().items())
+    assert link in layer
+    assert len(layer.tiles()) >= 1
+
+    view.setLinkLayerEnabled(False)
+    assert isinstance(view._widget_manager.getWidget(link), LinkWidget)
+    assert view.linkLayer() is None
+
+def test_layer_links_follow_their_ports(layered_view):
+    view, source, target, link = layered_view
+    view.setSynchronousLinkUpdates(True)
+    before = view.linkLine(link)
+    view._widget_manager.getWidget(source).moveBy(0, 50)
+    assert view.linkLine(link) != before
+
+def test_layer_links_are_hit_tested(layered_view):
+    view, source, target, link = layered_view
+    midpoint = view.linkLine(link).pointAt(0.5)
+    assert view.itemAt(midpoint) == link
+    assert view.itemAt(midpoint + QPointF(0, 50)) is None
+
+    point = view.mapFromScene(midpoint)
+    assert view.rowAt(point) == link
+
+def test_layer_link_selection_and_hover(layered_view, qtbot):
+    view, source, target, link = layered_view
+    layer = view.linkLayer()
+
+    # model to view
+    view.selectionModel().select(QModelIndex(view._controller.nodes()[0]), QItemSelectionModel.SelectionFlag.ClearAndSelect | QItemSelectionModel.SelectionFlag.Rows)
+    view.selectionModel().select(QModelIndex(link), QItemSelectionModel.SelectionFlag.ClearAndSelect | QItemSelectionModel.SelectionFlag.Rows)
+    assert layer.isSelected(link)
+    assert layer.linkState(link) & QStyle.StateFlag.State_Selected
+
+    # view to model
+    layer.clearSelection()
+    view._syncSelectionModel()
+    layer.setSelected(link, True)
+    view._syncSelectionModel()
+    assert [index.row() for index in view.selectionModel().selectedRows()] == [link.row()]
+
+    layer.setHoveredLink(link)
+    assert layer.linkState(link) & QStyle.StateFlag.State_MouseOver
+    view.grab()
+
+def test_clicking_elsewhere_clears_the_link_selection(layered_view, qtbot):
+    view, source, target, link = layered_view
+    layer = view.linkLayer()
+    layer.setSelected(link, True)
+    view._syncSelectionModel()
+    assert [index.row() for index in view.selectionModel().selectedRows()] == [link.row()]
+
+    point = view.mapFromScene(view.linkLine(link).pointAt(0.5)) + QPoint(0, 80)
+    qtbot.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=point)
+    assert layer.selectedLinks() == []
+    assert view.selectionModel().selectedRows() == []
+
+def test_clicking_a_layer_link_selects_it(layered_view, qtbot):
+    view, source, target, link = layered_view
+    layer = view.linkLayer()
+    point = view.mapFromScene(view.linkLine(link).pointAt(0.5))
+
+    qtbot.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, pos=point)
+    assert not view._linking_tool.isActive()
+    assert link.isValid() and link in layer, "a click must not drag the link away"
+    assert layer.selectedLinks() == [link]
+    assert [index.row() for index in view.selectionModel().selectedRows()] == [link.row()]
+
+    qtbot.mouseClick(view.viewport(), Qt.MouseButton.LeftButton, Qt.KeyboardModifier.ControlModifier, pos=point)
+    assert layer.selectedLinks() == []
+
+def test_dragging_a_layer_link_starts_linking(layered_view, qtbot):
+    view, source, target, link = layered_view
+    point = view.mapFromScene(view.linkLine(link).pointAt(0.5))
+
+    qtbot.mousePress(view.viewport(), Qt.MouseButton.LeftButton, pos=point)
+    assert not view._linking_tool.isActive()
+    qtbot.mouseMove(view.viewport(), point + QPoint(30, 30))
+    assert view._linking_tool.isActive()
+    view._linking_tool.cancelLinking()
+
+def test_removed_links_leave_the_layer(layered_view):
+    view, source, target, link = layered_view
+    layer = view.linkLayer()
+    with redirect_stdout(io.StringIO()):
+        view._controller.removeLink(link)
+    assert len(layer) == 0
+    assert layer.tiles() == [], "empty tiles are removed from the scene"
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
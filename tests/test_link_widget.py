@@ -0,0 +1,61 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QLineF, QPointF
+
+from qdagview.widgets import LinkWidget
+
+
+@pytest.fixture
+def link(qapp) -> LinkWidget:
+    link = LinkWidget()
+    link.setLine(QLineF(0, 0, 100, 0))
+    LinkWidget.setCacheStatsEnabled(True)
+    yield link
+    LinkWidget.setCacheStatsEnabled(False)
+
+def test_geometry_is_computed_once_per_line(link):
+    for _ in range(3):
+        link.shape()
+        link.boundingRect()
+        link.arrowShape()
+
+    stats = LinkWidget.cacheStats()
+    assert stats["shape_misses"] == 1 and stats["shape_hits"] == 2
+    assert stats["bounding_rect_misses"] == 1 and stats["bounding_rect_hits"] == 2
+    assert stats["arrow_misses"] == 1 and stats["arrow_hits"] == 2
+
+def test_cache_stats_are_off_by_default(link):
+    LinkWidget.setCacheStatsEnabled(False)
+    link.shape()
+    link.shape()
+    assert LinkWidget.cacheStats() == {}
+
+def test_set_line_invalidates_geometry(link):
+    assert link.shape().contains(QPointF(50, 0))
+
+    link.setLine(QLineF(0, 50, 100, 50))
+    assert not link.shape().contains(QPointF(50, 0))
+    assert link.shape().contains(QPointF(50, 50))
+    assert link.boundingRect().contains(QPointF(50, 50))
+    assert LinkWidget.cacheStats()["shape_misses"] == 2
+
+def test_style_change_invalidates_geometry(link):
+    assert not link.shape().contains(QPointF(50, 4))
+    link.setStrokeWidth(10)
+    assert link.shape().contains(QPointF(50, 4))
+
+    narrow_arrow = link.arrowShape().boundingRect()
+    link.setArrowWidth(4)
+    assert link.arrowShape().boundingRect().height() > narrow_arrow.height()
+
+def test_cached_paths_are_copies(link):
+    link.shape().addEllipse(QPointF(500, 500), 10, 10)
+    assert not link.shape().contains(QPointF(500, 500))
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
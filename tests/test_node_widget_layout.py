@@ -0,0 +1,97 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtGui import QImage, QPainter
+from qtpy.QtWidgets import QGraphicsScene
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.widgets import NodeWidget, PortWidget
+
+
+@pytest.fixture
+def arrange_calls(monkeypatch):
+    calls = []
+    original = NodeWidget._arrangeInlets
+    def countingArrangeInlets(self, *args, **kwargs):
+        calls.append(self)
+        return original(self, *args, **kwargs)
+    monkeypatch.setattr(NodeWidget, "_arrangeInlets", countingArrangeInlets)
+    return calls
+
+def test_insertions_are_arranged_in_a_single_pass(qapp, arrange_calls):
+    scene = QGraphicsScene()
+    node = NodeWidget()
+    scene.addItem(node)
+
+    notifications = []
+    ports = [PortWidget() for _ in range(64)]
+    for port in ports:
+        port.scenePositionChanged.connect(lambda pos, port=port: notifications.append(port))
+    for row, port in enumerate(ports):
+        node.insertInlet(row, port)
+
+    assert node.isLayoutDirty()
+    assert arrange_calls == [] and notifications == []
+
+    node.ensureLayout()
+    assert len(arrange_calls) == 1
+    assert not node.isLayoutDirty()
+    assert sorted(port.x() for port in ports) == [port.x() for port in ports], "ports should be distributed in order"
+    assert len(notifications) == 64, "each port should notify its final position once"
+
+    node.ensureLayout()
+    assert len(arrange_calls) == 1, "a clean node should not be arranged again"
+
+def test_painting_does_not_arrange(qapp, arrange_calls):
+    scene = QGraphicsScene()
+    node = NodeWidget()
+    scene.addItem(node)
+    node.insertInlet(0, PortWidget())
+
+    image = QImage(200, 200, QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    scene.render(painter)
+    painter.end()
+    assert arrange_calls == [] and node.isLayoutDirty()
+
+def test_standalone_widgets_are_arranged_when_added_to_a_scene(qapp, arrange_calls):
+    node = NodeWidget()
+    node.insertInlet(0, PortWidget())
+    assert node.isLayoutDirty()
+
+    scene = QGraphicsScene()
+    scene.addItem(node)
+    assert arrange_calls == [node]
+    assert not node.isLayoutDirty()
+
+def test_view_arranges_bulk_insertions_once(qtbot, arrange_calls):
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    qtbot.addWidget(view)
+    controller = view._controller
+    with redirect_stdout(io.StringIO()):
+        node = controller.addNode()
+        node_widget = view._widget_manager.getWidget(node)
+        arrange_calls.clear()
+
+        # the inlets of this model follow the variables of the expression
+        model.setData(model.index(node.row(), 1), "+".join(f"v{i}" for i in range(16)))
+
+    assert arrange_calls == [node_widget]
+    inlet_widgets = node_widget.inlets()
+    assert len(inlet_widgets) > 2
+    assert len({widget.x() for widget in inlet_widgets}) == len(inlet_widgets)
+    hit = view.rowAt(view.mapFromScene(inlet_widgets[-1].sceneBoundingRect().center()))
+    assert view._widget_manager.getWidget(hit) is inlet_widgets[-1], "hit-testing should see the final positions"
+    assert not node_widget.isLayoutDirty(), "the view arranges the nodes before they are painted"
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
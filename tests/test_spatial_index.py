@@ -0,0 +1,77 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QRectF, QPointF
+
+from qdagview.managers import SpatialIndex
+from qdagview.core import GraphItemType
+
+
+def test_query_point():
+    index = SpatialIndex[str](cell_size=10)
+    index.insert("a", QRectF(0, 0, 5, 5), GraphItemType.NODE)
+    index.insert("b", QRectF(3, 3, 20, 20), GraphItemType.INLET)
+
+    assert sorted(index.query(QPointF(4, 4))) == ["a", "b"]
+    assert index.query(QPointF(15, 15)) == ["b"]
+    assert index.query(QPointF(100, 100)) == []
+
+def test_query_filters_kinds():
+    index = SpatialIndex[str](cell_size=10)
+    index.insert("node", QRectF(0, 0, 10, 10), GraphItemType.NODE)
+    index.insert("inlet", QRectF(0, 0, 2, 2), GraphItemType.INLET)
+    index.insert("outlet", QRectF(0, 0, 2, 2), GraphItemType.OUTLET)
+
+    assert sorted(index.query(QPointF(1, 1), kinds={GraphItemType.INLET, GraphItemType.OUTLET})) == ["inlet", "outlet"]
+    assert index.query(QPointF(1, 1), kinds={GraphItemType.LINK}) == []
+
+def test_update_moves_key():
+    index = SpatialIndex[str](cell_size=10)
+    index.insert("a", QRectF(0, 0, 5, 5), GraphItemType.NODE)
+    order = index.order("a")
+
+    index.update("a", QRectF(100, 100, 5, 5))
+    assert index.query(QPointF(1, 1)) == []
+    assert index.query(QPointF(101, 101)) == ["a"]
+    assert index.kind("a") == GraphItemType.NODE
+    assert index.order("a") == order, "moving a key should keep its insertion order"
+
+def test_remove_and_clear():
+    index = SpatialIndex[str](cell_size=10)
+    index.insert("a", QRectF(0, 0, 5, 5))
+    index.insert("b", QRectF(0, 0, 5, 5))
+
+    index.remove("a")
+    assert "a" not in index
+    assert index.query(QPointF(1, 1)) == ["b"]
+
+    index.clear()
+    assert len(index) == 0
+    assert index.query(QPointF(1, 1)) == []
+
+def test_large_items_are_found_everywhere_they_cover():
+    index = SpatialIndex[str](cell_size=10, max_cells=4)
+    index.insert("long_link", QRectF(0, 0, 1000, 1000), GraphItemType.LINK)
+    index.insert("port", QRectF(500, 500, 5, 5), GraphItemType.INLET)
+
+    assert index.query(QPointF(999, 999)) == ["long_link"]
+    assert sorted(index.query(QPointF(501, 501))) == ["long_link", "port"]
+    assert index.query(QPointF(1001, 1001)) == []
+
+    index.remove("long_link")
+    assert index.query(QPointF(999, 999)) == []
+
+def test_query_rect():
+    index = SpatialIndex[str](cell_size=10)
+    index.insert("a", QRectF(0, 0, 5, 5))
+    index.insert("b", QRectF(50, 50, 5, 5))
+
+    assert index.queryRect(QRectF(-1, -1, 10, 10)) == ["a"]
+    assert sorted(index.queryRect(QRectF(-1, -1, 100, 100))) == ["a", "b"]
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,70 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import Qt, QModelIndex
+from qtpy.QtGui import QFont
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.widgets import StaticTextCellWidget
+
+
+def test_set_text_updates_bounds(qtbot):
+    cell = StaticTextCellWidget()
+    assert cell.text() == ""
+
+    cell.setText("value")
+    short_width = cell.boundingRect().width()
+    assert short_width > 0
+    assert cell.staticText().text() == "value"
+
+    cell.setText("a much longer value")
+    assert cell.boundingRect().width() > short_width
+
+    cell.setText(42)
+    assert cell.text() == "42"
+
+def test_text_width_elides(qtbot):
+    cell = StaticTextCellWidget()
+    cell.setText("a much longer value than fits")
+    cell.setTextWidth(30)
+    assert cell.boundingRect().width() == 30
+    assert cell.staticText().text() != cell.text()
+    assert cell.staticText().text().endswith("…")
+
+    cell.setTextWidth(-1)
+    assert cell.staticText().text() == cell.text()
+
+def test_font_metrics_are_shared(qtbot):
+    a = StaticTextCellWidget()
+    b = StaticTextCellWidget()
+    assert a.fontMetrics(a.font()) is b.fontMetrics(b.font())
+
+    font = QFont(a.font())
+    font.setPointSize(20)
+    assert a.fontMetrics(font) is not a.fontMetrics(a.font())
+
+def test_view_cells_follow_the_model(qtbot):
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    qtbot.addWidget(view)
+    with redirect_stdout(io.StringIO()):
+        node = view._controller.addNode()
+
+    cell_index = QModelIndex(node).siblingAtColumn(1)
+    cell = view._cell_manager.getWidget(cell_index)
+    assert isinstance(cell, StaticTextCellWidget)
+
+    model.setData(cell_index, "1+2", Qt.ItemDataRole.EditRole)
+    assert cell.text() == cell_index.data(Qt.ItemDataRole.DisplayRole)
+    view.grab()
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QPalette, QColor
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+from qdagview.factories import widgetfactory_using_delegate
+
+
+@pytest.fixture
+def view(qtbot) -> QItemModel_GraphView:
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    view.resize(400, 300)
+    qtbot.addWidget(view)
+    with redirect_stdout(io.StringIO()):
+        view._controller.addNode()
+    return view
+
+@pytest.fixture
+def option_calls(monkeypatch):
+    calls = []
+    original = widgetfactory_using_delegate.makeViewOption
+    def countingMakeViewOption(option_graphics, index, widget=None):
+        calls.append(index)
+        return original(option_graphics, index, widget)
+    monkeypatch.setattr(widgetfactory_using_delegate, "makeViewOption", countingMakeViewOption)
+    return calls
+
+def test_repaint_reuses_view_options(view, option_calls):
+    view.grab()
+    assert len(option_calls) > 0
+    option_calls.clear()
+
+    view.grab()
+    assert option_calls == [], "painting again should not rebuild the view options"
+
+def test_data_change_invalidates_the_owner(view, option_calls):
+    view.grab()
+    option_calls.clear()
+
+    node = view._controller.nodes()[0]
+    view._controller.sourceModel().setData(node, "renamed", Qt.ItemDataRole.EditRole)
+    view.grab()
+    assert [index.data() for index in option_calls] == ["renamed"], "only the node should be rebuilt, cells draw their static text"
+
+def test_palette_change_invalidates_all(view, option_calls):
+    view.grab()
+    painted = len(option_calls)
+    option_calls.clear()
+
+    palette = view.palette()
+    palette.setColor(QPalette.ColorRole.Base, QColor("red"))
+    view.setPalette(palette)
+    view.grab()
+    assert len(option_calls) == painted
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+import pytest
+
+import logging
+
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex
+from qtpy.QtGui import QStandardItemModel, QStandardItem
+from qtpy.QtWidgets import QGraphicsRectItem
+
+from qdagview.managers import ItemDataWidgetIndexManager
+from qdagview.views import QItemModel_GraphView
+from qdagview.core import GraphDataRole, GraphItemType
+
+
+@pytest.fixture
+def model(qapp) -> QStandardItemModel:
+    model = QStandardItemModel()
+    for name in ["node1", "node2"]:
+        node = QStandardItem(name)
+        node.setData(GraphItemType.NODE, GraphDataRole.TypeRole)
+        inlet = QStandardItem("in")
+        inlet.setData(GraphItemType.INLET, GraphDataRole.TypeRole)
+        node.appendRow(inlet)
+        model.appendRow(node)
+    return model
+
+def test_lookup_both_ways(model):
+    manager = ItemDataWidgetIndexManager()
+    node_widget, inlet_widget = QGraphicsRectItem(), QGraphicsRectItem()
+    node_index = model.index(0, 0)
+    inlet_index = model.index(0, 0, node_index)
+    manager.insertWidget(node_index, node_widget)
+    manager.insertWidget(inlet_index, inlet_widget)
+
+    assert manager.getWidget(node_index) is node_widget
+    assert manager.getWidget(QPersistentModelIndex(inlet_index)) is inlet_widget
+    assert manager.getIndex(node_widget) == node_index
+    assert manager.getIndex(QGraphicsRectItem()) is None
+
+def test_widgets_by_kind(model):
+    manager = ItemDataWidgetIndexManager()
+    node_widgets = [QGraphicsRectItem(), QGraphicsRectItem()]
+    inlet_widget = QGraphicsRectItem()
+    for row, widget in enumerate(node_widgets):
+        manager.insertWidget(model.index(row, 0), widget)
+    manager.insertWidget(model.index(0, 0, model.index(0, 0)), inlet_widget)
+
+    assert manager.widgets(GraphItemType.NODE) == node_widgets
+    assert manager.widgets(GraphItemType.INLET) == [inlet_widget]
+    assert manager.widgets(GraphItemType.LINK) == []
+    assert manager.widgetCount() == 3
+    assert manager.kind(inlet_widget) == GraphItemType.INLET
+
+def test_index_follows_row_moves(model):
+    manager = ItemDataWidgetIndexManager()
+    widget = QGraphicsRectItem()
+    manager.insertWidget(model.index(1, 0), widget)
+    assert manager.getIndex(widget).row() == 1
+
+    model.insertRow(0, QStandardItem("new"))
+    assert manager.getIndex(widget).row() == 2
+    assert manager.getIndex(widget) is manager.getIndex(widget), "the index should be cached between moves"
+
+def test_removed_widget_has_no_index(model):
+    manager = ItemDataWidgetIndexManager()
+    widget = QGraphicsRectItem()
+    manager.insertWidget(model.index(0, 0), widget)
+    manager.removeWidget(model.index(0, 0))
+
+    assert manager.getIndex(widget) is None
+    assert manager.getWidget(model.index(0, 0)) is None
+    assert manager.widgets(GraphItemType.NODE) == []
+
+    manager.insertWidget(model.index(1, 0), widget)
+    model.removeRow(1)
+    assert manager.getIndex(widget) is None
+
+def test_view_buckets_items_without_type_role(qtbot):
+    model = QStandardItemModel()
+    source, target = QStandardItem("source"), QStandardItem("target")
+    outlet, inlet = QStandardItem("out"), QStandardItem("in")
+    outlet.setData(GraphItemType.OUTLET, GraphDataRole.TypeRole)
+    source.appendRow(outlet)
+    target.appendRow(inlet) # nodes, inlets and links are typed by their depth only
+    model.appendRow(source)
+    model.appendRow(target)
+    link_item = QStandardItem("link")
+    link_item.setData(QPersistentModelIndex(outlet.index()), GraphDataRole.SourceRole)
+    inlet.appendRow(link_item)
+    link = QPersistentModelIndex(link_item.index())
+
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    qtbot.addWidget(view)
+
+    manager = view._widget_manager
+    assert manager.widgetCount(GraphItemType.NODE) == 2
+    assert manager.widgetCount(GraphItemType.INLET) == 1
+    assert manager.widgetCount(GraphItemType.OUTLET) == 1
+    assert manager.widgets(GraphItemType.LINK) == [manager.getWidget(link)]
+
+    view.setLinkLayerEnabled(True)
+    assert manager.widgetCount(GraphItemType.LINK) == 0
+    assert link in view.linkLayer()
+    view.setLinkLayerEnabled(False)
+    assert manager.widgets(GraphItemType.LINK) == [manager.getWidget(link)]
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+import pytest
+
+import logging
+import io
+from contextlib import redirect_stdout
+
+from qtpy.QtCore import QPersistentModelIndex
+
+from qdagview.examples.flowgraphmodel import FlowGraphModel
+from qdagview.views import QItemModel_GraphView
+
+
+@pytest.fixture
+def view(qtbot) -> QItemModel_GraphView:
+    model = FlowGraphModel()
+    view = QItemModel_GraphView()
+    view.setModel(model)
+    view.setSynchronousLinkUpdates(True)
+    qtbot.addWidget(view)
+    return view
+
+def test_removed_widgets_are_reused(view):
+    controller = view._controller
+    factory = view._factory
+    with redirect_stdout(io.StringIO()):
+        node = controller.addNode()
+        node_widget = view._widget_manager.getWidget(node)
+        inlet_widgets = [view._widget_manager.getWidget(inlet) for inlet in controller.inlets(node)]
+
+        controller.removeNode(node)
+        assert factory.pooledCount('node') == 1
+        assert factory.pooledCount('inlet') == len(inlet_widgets)
+        assert node_widget.scene() is None
+
+        factory.resetPoolStats()
+        new_node = controller.addNode()
+
+    assert view._widget_manager.getWidget(new_node) is node_widget
+    assert view._widget_manager.getIndex(node_widget) == new_node
+    assert all(view._widget_manager.getWidget(inlet) in inlet_widgets for inlet in controller.inlets(new_node))
+    stats = factory.poolStats()
+    assert stats["node_hits"] == 1 and "node_misses" not in stats
+
+def test_reused_ports_report_their_new_index(view):
+    controller = view._controller
+    with redirect_stdout(io.StringIO()):
+        controller.removeNode(controller.addNode())
+        node = controller.addNode()
+
+    moved = []
+    view._factory.portPositionChanged.connect(moved.append)
+    view._widget_manager.getWidget(node).moveBy(10, 0)
+    assert set(moved) == {QPersistentModelIndex(port) for port in controller.inlets(node) + controller.outlets(node)}
+
+def test_pool_capacity(view):
+    controller = view._controller
+    factory = view._factory
+    factory.setPoolCapacity(1, 'node')
+    with redirect_stdout(io.StringIO()):
+        nodes = [controller.addNode() for _ in range(3)]
+        for node in reversed(nodes):
+            controller.removeNode(node)
+
+    assert factory.pooledCount('node') == 1
+    assert factory.poolStats()["node_discarded"] == 2
+
+    factory.setPoolCapacity(0)
+    assert factory.pooledCount('node') == 0
+    assert factory.pooledCount('inlet') == 0
+
+
+if __name__ == "__main__":
+    # runs pytest on this file
+    logging.disable(logging.CRITICAL)
+    pytest.main([__file__, "-v"])